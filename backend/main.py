@@ -9,13 +9,17 @@ PRIVACY NOTICE:
 - All analysis is ephemeral
 """
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from contextlib import asynccontextmanager
+import asyncio
 import logging
+import time
 
-from routers import sentiment, chat, sia, translate
+from routers import sentiment, chat, sia, translate, admin
 from config import settings
+from services import metrics, timing
 
 # Disable request logging for privacy
 logging.getLogger("uvicorn.access").disabled = True
@@ -23,7 +27,17 @@ logging.getLogger("uvicorn.access").disabled = True
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Application lifespan - check Ollama model availability"""
+    """Application lifespan - load the knowledge base and check Ollama model availability"""
+    # Startup: Persona prompt files must cover every ChatMode (file names only, nothing loaded)
+    from persona_registry import personas
+    for problem in personas.verify():
+        print(f"⚠ {problem}")
+    
+    # Startup: Knowledge base corpora are read and indexed on a worker thread,
+    # overlapping the Ollama check instead of blocking the event loop
+    from services.knowledge_base import knowledge_bases, shutdown_search_executor, watch_knowledge_bases
+    kb_loading = asyncio.create_task(asyncio.to_thread(knowledge_bases.ensure_loaded))
+    
     # Startup: Check Ollama connection
     from services.ollama_client import OllamaClient
     try:
@@ -35,8 +49,17 @@ async def lifespan(app: FastAPI):
             print(f"⚠ Ollama not available. Please start Ollama with 'ollama run {client.model}'")
     except Exception as e:
         print(f"❌ Failed to connect to Ollama: {str(e)}")
+    await kb_loading
+    
+    # Optional: hot-reload corpora edited on disk (each uvicorn worker watches for itself)
+    kb_watcher = None
+    if settings.RAG_WATCH_SECONDS > 0:
+        kb_watcher = asyncio.create_task(watch_knowledge_bases(settings.RAG_WATCH_SECONDS))
     yield
     # Shutdown: Cleanup
+    if kb_watcher:
+        kb_watcher.cancel()
+    shutdown_search_executor()
     print("ZenGuard AI shutting down...")
 
 
@@ -59,12 +82,50 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Route latency - labelled by route template so no path parameter (e.g. session id) is recorded
+if settings.ENABLE_METRICS:
+    @app.middleware("http")
+    async def record_request_metrics(request: Request, call_next):
+        metrics.HTTP_IN_FLIGHT.inc()
+        started = time.perf_counter()
+        status = 500
+        try:
+            response = await call_next(request)
+            status = response.status_code
+            return response
+        finally:
+            metrics.HTTP_IN_FLIGHT.dec()
+            route = request.scope.get("route")
+            metrics.HTTP_REQUEST_SECONDS.labels(
+                request.method,
+                getattr(route, "path", "unmatched"),
+                str(status)
+            ).observe(time.perf_counter() - started)
+
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics_endpoint():
+        """Prometheus text exposition - durations and counts only, never content"""
+        return PlainTextResponse(metrics.registry.render(), media_type="text/plain; version=0.0.4")
+
+# Per-request phase breakdown - durations only, never content
+if settings.ENABLE_SERVER_TIMING:
+    @app.middleware("http")
+    async def add_server_timing(request: Request, call_next):
+        timings = timing.start()
+        response = await call_next(request)
+        response.headers["Server-Timing"] = timings.header()
+        return response
+
 # Include routers
 app.include_router(sentiment.router, prefix="/api", tags=["Sentiment Analysis"])
 app.include_router(chat.router, prefix="/api", tags=["AI Chat"])
 app.include_router(sia.router, prefix="/api", tags=["Sia Navigator"])
 app.include_router(translate.router, prefix="/api", tags=["Multilingual Support"])
 
+# Admin diagnostics - disabled by default, like the docs
+if settings.ADMIN_TOKEN and (settings.ENABLE_PROFILER or settings.ENABLE_KB_RELOAD):
+    app.include_router(admin.router, prefix="/api", tags=["Admin"], include_in_schema=False)
+
 
 @app.get("/health")
 async def health_check():
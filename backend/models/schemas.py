@@ -4,7 +4,7 @@ All models are designed for stateless, privacy-first processing
 """
 
 from pydantic import BaseModel, Field
-from typing import List, Optional, Dict
+from typing import Annotated, List, Optional, Dict
 from enum import Enum
 
 
@@ -68,6 +68,22 @@ class AnalysisRequest(BaseModel):
     )
 
 
+class BatchAnalysisRequest(BaseModel):
+    """
+    Several journal entries analysed in one call
+    Note: Texts should be pre-obfuscated on client side
+    """
+    entries: List[Annotated[str, Field(min_length=1, max_length=10000)]] = Field(
+        min_length=1,
+        max_length=50,
+        description="Journal entry texts (should be obfuscated)"
+    )
+    session_id: Optional[str] = Field(
+        default=None,
+        description="Anonymous session ID for trend tracking within session only"
+    )
+
+
 class AnalysisResponse(BaseModel):
     """Full sentiment analysis response"""
     # Wellness Score (inverted risk - higher is better)
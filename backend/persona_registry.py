@@ -0,0 +1,83 @@
+"""
+Persona Registry - Lazy, cached access to per-persona system prompts
+Prompt text lives in data/personas/<mode>.txt, one file per ChatMode
+
+Only the personas actually used are read, so importing prompts.py no
+longer materialises 57 prompts in every worker. Loaded text is interned
+and kept in a small LRU cache; evicted prompts are simply re-read.
+
+MODE_INFO (names, emoji, colours) stays eager in prompts.py - it is small
+and served as a whole by GET /api/modes.
+"""
+
+import os
+import sys
+from functools import lru_cache
+from collections.abc import Mapping
+from typing import Iterator, List, Union
+
+from models.schemas import ChatMode
+
+PERSONA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "personas")
+
+
+class PersonaRegistry(Mapping):
+    """
+    Read-only ChatMode -> prompt mapping backed by one text file per persona
+
+    Behaves like the old MODE_PROMPTS dict (get, [], in, iteration) so
+    existing callers keep working.
+    """
+
+    def __init__(self, directory: str = PERSONA_DIR, cache_size: int = 16):
+        self.directory = directory
+        self._load = lru_cache(maxsize=cache_size)(self._read)
+
+    def _path(self, mode: ChatMode) -> str:
+        return os.path.join(self.directory, f"{mode.value}.txt")
+
+    def _read(self, mode: ChatMode) -> str:
+        with open(self._path(mode), "r", encoding="utf-8", newline="") as f:
+            return sys.intern(f.read())
+
+    def _available(self) -> List[ChatMode]:
+        """Modes with a prompt file - a directory listing, no file contents"""
+        values = {name[:-4] for name in os.listdir(self.directory) if name.endswith(".txt")}
+        return [mode for mode in ChatMode if mode.value in values]
+
+    def __getitem__(self, mode: Union[ChatMode, str]) -> str:
+        try:
+            mode = ChatMode(mode)
+            return self._load(mode)
+        except (ValueError, FileNotFoundError):
+            raise KeyError(mode) from None
+
+    def __contains__(self, mode) -> bool:
+        try:
+            return os.path.exists(self._path(ChatMode(mode)))
+        except ValueError:
+            return False
+
+    def __iter__(self) -> Iterator[ChatMode]:
+        return iter(self._available())
+
+    def __len__(self) -> int:
+        return len(self._available())
+
+    def verify(self) -> List[str]:
+        """Coverage problems between ChatMode and the prompt files (empty = consistent)"""
+        errors = []
+        values = {mode.value for mode in ChatMode}
+        for mode in ChatMode:
+            if mode not in self:
+                errors.append(f"MISSING PROMPT: ChatMode.{mode.name} has no {mode.value}.txt in {self.directory}")
+        for name in sorted(os.listdir(self.directory)):
+            if name.endswith(".txt") and name[:-4] not in values:
+                errors.append(f"ORPHAN PROMPT: {name} does not match any ChatMode")
+        return errors
+
+    def cache_info(self):
+        return self._load.cache_info()
+
+
+personas = PersonaRegistry()
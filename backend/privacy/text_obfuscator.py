@@ -7,7 +7,20 @@ This is an additional layer of protection.
 """
 
 import re
-from typing import List, Tuple
+from typing import AsyncIterable, AsyncIterator, Iterable, Iterator, List, Tuple
+
+
+_DIGIT_RUN = re.compile(r'\d+')
+
+# Streaming cut rules - see TextObfuscator.is_safe_cut
+_DIGIT_OR_CLOSE_PAREN = re.compile(r'[\d)]')
+_WORD_OR_OPEN_PAREN = re.compile(r'[\w(]')
+_LOWERCASE = re.compile(r'[a-z]')
+# Words that can follow a space inside an institution match ("Medical Center" has two)
+_INSTITUTION_WORD = re.compile(
+    r'University|College|School|Academy|Institute|Hospital|Clinic|Medical|Center|High|Middle|Elementary'
+)
+_CUT_LOOKAHEAD = 32  # Longest text is_safe_cut may need to see after a cut
 
 
 class TextObfuscator:
@@ -47,6 +60,51 @@ class TextObfuscator:
             (r'\b[A-Z][a-z]+ (?:Hospital|Clinic|Medical Center)\b', '[HOSPITAL]'),
             (r'\b[A-Z][a-z]+ (?:High|Middle|Elementary)\b', '[SCHOOL]'),
         ]
+        
+        # Addresses, room numbers and other specific numbers
+        self.number_pattern = (r'\b\d{3,5}\b', '[NUM]')
+        
+        # Compiled once - obfuscation runs on every chat, sia and analyze request.
+        # Each pass also records what any match must contain: a digit run of
+        # some length and/or one of a few literals. Replacement tokens never add
+        # digits, '@', '://' or institution words, so a pass whose anchor is
+        # missing from the input is a no-op even after earlier passes - skipping
+        # it gives output identical to running every pass.
+        pii_anchors = [
+            (0, ('@',)),                 # Email
+            (3, ()),                     # Phone
+            (3, ()),                     # SSN
+            (1, ('-', '/')),             # Dates
+            (4, ()),                     # Credit cards
+            (0, ('://',)),               # URLs
+            (6, ()),                     # Student IDs
+        ]
+        institution_anchors = [
+            (0, ('University', 'College', 'School', 'Academy', 'Institute')),
+            (0, ('Hospital', 'Clinic', 'Medical Center')),
+            (0, ('High', 'Middle', 'Elementary')),
+        ]
+        
+        self._pii_passes = [
+            (re.compile(pattern, re.IGNORECASE), replacement, min_digits, literals)
+            for (pattern, replacement), (min_digits, literals) in zip(self.patterns, pii_anchors)
+        ]
+        self._passes = self._pii_passes + [
+            (re.compile(pattern), replacement, min_digits, literals)
+            for (pattern, replacement), (min_digits, literals) in zip(self.institution_patterns, institution_anchors)
+        ] + [
+            (re.compile(self.number_pattern[0]), self.number_pattern[1], 3, ())
+        ]
+    
+    @staticmethod
+    def _longest_digit_run(text: str) -> int:
+        return max(map(len, _DIGIT_RUN.findall(text)), default=0)
+    
+    @staticmethod
+    def _can_match(text: str, digit_run: int, min_digits: int, literals: Tuple[str, ...]) -> bool:
+        if digit_run < min_digits:
+            return False
+        return not literals or any(literal in text for literal in literals)
     
     def obfuscate(self, text: str) -> str:
         """
@@ -59,19 +117,74 @@ class TextObfuscator:
             Text with remaining PII replaced by tokens
         """
         result = text
+        digit_run = self._longest_digit_run(text)
         
-        # Apply PII patterns
-        for pattern, replacement in self.patterns:
-            result = re.sub(pattern, replacement, result, flags=re.IGNORECASE)
+        # PII patterns, then institutions, then specific numbers - same order
+        # as always, skipping passes that cannot match
+        for regex, replacement, min_digits, literals in self._passes:
+            if self._can_match(text, digit_run, min_digits, literals):
+                result = regex.sub(replacement, result)
         
-        # Apply institution patterns
-        for pattern, replacement in self.institution_patterns:
-            result = re.sub(pattern, replacement, result)
+        return result
+    
+    def is_safe_cut(self, text: str, index: int) -> bool:
+        """
+        True if obfuscating text[:index] and text[index:] separately gives
+        exactly obfuscate(text).
         
-        # Generalize specific numbers (addresses, room numbers)
-        result = re.sub(r'\b\d{3,5}\b', '[NUM]', result)
+        Cuts are only made right after a whitespace character that no pattern
+        could span. Only phone/SSN/card (digit groups), institutions
+        ("Name University") and a card's trailing separator contain whitespace:
+        - after a digit or ')': unsafe if a word character or '(' follows
+        - after a lowercase letter: unsafe if an institution word follows
+          (including "Center" of "Medical Center")
+        Needs up to _CUT_LOOKAHEAD characters after `index`.
+        MUST be revisited whenever the patterns above change.
+        """
+        if index <= 0 or index >= len(text) or not text[index - 1].isspace():
+            return False
+        if index == 1:
+            return True
         
-        return result
+        before = text[index - 2]
+        if _DIGIT_OR_CLOSE_PAREN.match(before):
+            return not _WORD_OR_OPEN_PAREN.match(text, index)
+        if _LOWERCASE.match(before):
+            return not _INSTITUTION_WORD.match(text, index)
+        return True
+    
+    def stream(self, window: int = 4096) -> "ObfuscationStream":
+        """Incremental obfuscator for text that arrives in chunks"""
+        return ObfuscationStream(self, window)
+    
+    def obfuscate_chunks(self, chunks: Iterable[str], window: int = 4096) -> Iterator[str]:
+        """
+        Obfuscate a stream of text chunks, yielding output as soon as it is
+        safe to do so. The joined output equals obfuscate("".join(chunks)).
+        """
+        stream = self.stream(window)
+        for chunk in chunks:
+            output = stream.feed(chunk)
+            if output:
+                yield output
+        output = stream.close()
+        if output:
+            yield output
+    
+    async def obfuscate_chunks_async(
+        self,
+        chunks: AsyncIterable[str],
+        window: int = 4096
+    ) -> AsyncIterator[str]:
+        """Async variant of obfuscate_chunks for streaming request bodies"""
+        stream = self.stream(window)
+        async for chunk in chunks:
+            output = stream.feed(chunk)
+            if output:
+                yield output
+        output = stream.close()
+        if output:
+            yield output
     
     def detect_pii(self, text: str) -> List[Tuple[str, str]]:
         """
@@ -81,10 +194,12 @@ class TextObfuscator:
             List of (pattern_type, matched_text) tuples
         """
         findings = []
+        digit_run = self._longest_digit_run(text)
         
-        for pattern, pattern_name in self.patterns:
-            matches = re.findall(pattern, text, flags=re.IGNORECASE)
-            for match in matches:
+        for regex, pattern_name, min_digits, literals in self._pii_passes:
+            if not self._can_match(text, digit_run, min_digits, literals):
+                continue
+            for match in regex.findall(text):
                 findings.append((pattern_name, match))
         
         return findings
@@ -106,3 +221,41 @@ class TextObfuscator:
         # Risk increases with PII density
         pii_density = len(findings) / word_count
         return min(1.0, pii_density * 10)
+
+
+
+class ObfuscationStream:
+    """
+    Windowed obfuscation state for one stream
+    
+    Buffers at most about `window` characters, then emits everything up to
+    the last safe cut (leaving lookahead for the cut rules) so matches that
+    cross chunk boundaries are still replaced exactly as in one pass.
+    """
+    
+    def __init__(self, obfuscator: TextObfuscator, window: int = 4096):
+        self.obfuscator = obfuscator
+        self.window = max(1, window)
+        self._buffer = ""
+    
+    def feed(self, chunk: str) -> str:
+        """Add a chunk; returns obfuscated text that is final (may be empty)"""
+        self._buffer += chunk
+        if len(self._buffer) < self.window + _CUT_LOOKAHEAD:
+            return ""
+        
+        # Latest safe cut, searching back at most one window
+        latest = len(self._buffer) - _CUT_LOOKAHEAD
+        earliest = max(1, latest - self.window)
+        for index in range(latest, earliest - 1, -1):
+            if self.obfuscator.is_safe_cut(self._buffer, index):
+                head, self._buffer = self._buffer[:index], self._buffer[index:]
+                return self.obfuscator.obfuscate(head)
+        
+        # No safe cut yet (e.g. one long token) - keep buffering
+        return ""
+    
+    def close(self) -> str:
+        """Flush the remaining buffer at end of stream"""
+        head, self._buffer = self._buffer, ""
+        return self.obfuscator.obfuscate(head) if head else ""
@@ -0,0 +1,79 @@
+"""
+Admin Router - Operator-only diagnostics
+Only mounted when ADMIN_TOKEN is set and an admin feature is enabled;
+every call must present the token in the X-Admin-Token header.
+"""
+
+import asyncio
+import secrets
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+
+from config import settings
+from services.knowledge_base import knowledge_bases, reload_knowledge_bases
+from services.profiler import profiler, render_collapsed
+
+router = APIRouter()
+
+
+def require_admin(x_admin_token: str = Header(default="")):
+    """Constant-time token check; 404 rather than 401 so the route isn't advertised"""
+    if not settings.ADMIN_TOKEN or not secrets.compare_digest(x_admin_token, settings.ADMIN_TOKEN):
+        raise HTTPException(status_code=404, detail="Not Found")
+
+
+@router.post("/admin/profile", dependencies=[Depends(require_admin)], response_class=PlainTextResponse)
+async def profile(
+    seconds: float = Query(default=10.0, gt=0),
+    mode: str = Query(default="wall", pattern="^(wall|cpu)$"),
+    interval_ms: float = Query(default=10.0, ge=1.0, le=1000.0)
+):
+    """
+    Sample the running process and return collapsed stacks
+    (pipe into flamegraph.pl or load in speedscope)
+
+    Privacy: Stacks contain code locations only - no request data.
+    """
+    if not settings.ENABLE_PROFILER:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not profiler.try_acquire():
+        raise HTTPException(status_code=409, detail="A profile is already running")
+
+    seconds = min(seconds, settings.PROFILER_MAX_SECONDS)
+    interval = interval_ms / 1000
+    try:
+        if mode == "wall":
+            # Sampler runs off the event loop so the loop itself shows up in the samples
+            samples = await asyncio.to_thread(profiler.sample_wall, seconds, interval)
+        else:
+            samples = profiler.start_cpu(interval)
+            if samples is None:
+                raise HTTPException(status_code=501, detail="CPU profiling needs SIGPROF on the main thread")
+            try:
+                await asyncio.sleep(seconds)
+            finally:
+                profiler.stop_cpu()
+    finally:
+        profiler.release()
+
+    return PlainTextResponse(
+        render_collapsed(samples),
+        headers={"X-Profile-Mode": mode, "X-Profile-Samples": str(sum(samples.values()))}
+    )
+
+
+@router.post("/admin/kb/reload", dependencies=[Depends(require_admin)])
+async def reload_kb(force: bool = Query(default=False)):
+    """
+    Rebuild changed knowledge base corpora off the event loop and swap them
+    in atomically - in-flight searches finish on the old index. Only this
+    worker reloads; use RAG_WATCH_SECONDS to update every worker.
+
+    Privacy: Returns corpus names and timings only.
+    """
+    if not settings.ENABLE_KB_RELOAD:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if knowledge_bases.reloading:
+        raise HTTPException(status_code=409, detail="A reload is already running")
+    return await asyncio.to_thread(reload_knowledge_bases, force)
@@ -4,15 +4,17 @@ Handles multi-turn conversations with different AI personas
 """
 
 from fastapi import APIRouter, HTTPException
-from typing import Optional
+from typing import List, Optional
 
 from models.schemas import ChatRequest, ChatResponse, ChatMode, ChatMessage
+from services import metrics, timing
 from services.ollama_client import OllamaClient
+from services.token_policy import estimate_tokens, token_policy
 from privacy.text_obfuscator import TextObfuscator
 
-from services.knowledge_base import kb  # Import Knowledge Base
+from services.knowledge_base import is_relevant, knowledge_bases  # Import Knowledge Base corpora
+from persona_registry import personas  # Persona prompts, loaded on first use
 from prompts import (
-    MODE_PROMPTS,
     MODE_INFO,
     HUMAN_REALITY_FILTER,
     COUNSELING_PRINCIPLES
@@ -23,10 +25,9 @@ router = APIRouter()
 # Initialize services
 ollama_client = OllamaClient()
 
-# Initialize KB on startup (lazy load)
-@router.on_event("startup")
-async def startup_event():
-    kb.load_data()
+CHAT_TEMPERATURE = 0.8  # Increased for more natural variation
+RAG_MIN_WORDS = 5  # Only search for substantive queries
+
 text_obfuscator = TextObfuscator()
 
 
@@ -49,6 +50,87 @@ async def get_chat_modes():
     }
 
 
+def persona_corpora(mode: ChatMode) -> Optional[List[str]]:
+    """Corpora this persona's RAG searches (MODE_INFO "corpora"; None = the handbook)"""
+    return MODE_INFO.get(mode, {}).get("corpora")
+
+
+def persona_uses_rag(mode: ChatMode) -> bool:
+    """MODE_INFO "rag": False keeps knowledge base references out of a persona's prompts"""
+    return MODE_INFO.get(mode, {}).get("rag", True)
+
+
+def build_system_prompt(
+    mode: ChatMode,
+    message: str,
+    history_turns: int = 0,
+    query_vectors=None,
+    rag_results: Optional[List[dict]] = None
+) -> str:
+    """
+    Assemble the chat system prompt for one turn
+    Shared with benchmark_personalities.py so benchmarks measure the real prompt
+    
+    Args:
+        mode: Selected persona
+        message: The (already obfuscated) user message
+        history_turns: Number of prior messages in the conversation
+        query_vectors: Message embeddings from knowledge_bases.embed_query (semantic/hybrid RAG)
+        rag_results: Search results already fetched with knowledge_bases.search_async;
+            when None the search runs here, synchronously
+    """
+    # RAG Context Injection - only when the best passage clears the relevance gate
+    rag_context = ""
+    if not persona_uses_rag(mode):
+        rag_outcome = "disabled"
+    elif len(message.split()) <= RAG_MIN_WORDS:
+        rag_outcome = "short_message"
+    else:
+        results = rag_results
+        if results is None:
+            results = knowledge_bases.search(message, persona_corpora(mode), limit=1, query_vectors=query_vectors)
+        if not results:
+            rag_outcome = "no_match"
+        elif not is_relevant(results[0]):
+            rag_outcome = "below_threshold"
+        else:
+            rag_outcome = "injected"
+            rag_context = f"\n[{results[0]['title']} REFERENCE (Page {results[0]['page']})]:\n{results[0]['content']}\n"
+            print(f"📚 RAG Hit: Found reference in '{results[0]['corpus']}' on Page {results[0]['page']}")
+    metrics.RAG_INJECTIONS.labels(rag_outcome).inc()
+
+    # Construct System Prompt - Personality FIRST
+    personality_prompt = personas.get(mode) or personas[ChatMode.COMPASSIONATE_FRIEND]
+    
+    # Build system prompt: Reality Filter (Constraints) + Personality (Behavior)
+    system_prompt = f"{HUMAN_REALITY_FILTER}\n\n[YOUR PRIMARY PERSONALITY]:\n{personality_prompt}"
+    
+    # Add RAG context ONLY if it passed the gate above
+    if rag_context:
+        rag_block = f"\n\n[SITUATIONAL KNOWLEDGE]:\n{rag_context}\n(Use this only if relevant to the user's specific problem.)"
+        metrics.RAG_CONTEXT_TOKENS.observe(estimate_tokens(rag_block))
+        system_prompt += rag_block
+    
+    # Solution/Perspective Transition Logic
+    if history_turns >= 4:
+        system_prompt += "\n\n[DIRECTIVE]: You have enough context. DO NOT ask more questions. Transition to offering a solid perspective, a relevant story, or a character-specific solution that matches the user's current mood/energy."
+    
+    print(f"🎭 Appending Reality Filter to {mode}...")
+    return system_prompt
+
+
+def build_conversation(history: List[ChatMessage], message: str) -> str:
+    """Flatten the client-held history plus the new message into the prompt"""
+    conversation = ""
+    for msg in history:  # Use full session history (client manages wipe on refresh)
+        role = "User" if msg.role == "user" else "Assistant"
+        conversation += f"{role}: {msg.content}\n\n"
+    
+    # Add current message
+    conversation += f"User: {message}\n\nAssistant:"
+    return conversation
+
+
 @router.post("/chat", response_model=ChatResponse)
 async def chat(request: ChatRequest):
     """
@@ -58,47 +140,31 @@ async def chat(request: ChatRequest):
     """
     try:
         # Obfuscate user message for privacy
-        obfuscated_message = text_obfuscator.obfuscate(request.message)
-        
-        # 4. RAG Context Injection (If relevant)
-        rag_context = ""
-        if len(obfuscated_message.split()) > 5: # Only search for substantive queries
-            results = kb.search(obfuscated_message, limit=1)
-            if results:
-                rag_context = f"\n[COUNSELING MANUAL REFERENCE (Page {results[0]['page']})]:\n{results[0]['content']}\n"
-                print(f"📚 RAG Hit: Found reference on Page {results[0]['page']}")
-
-        # 5. Construct System Prompt - Personality FIRST
-        personality_prompt = MODE_PROMPTS.get(request.mode, MODE_PROMPTS[ChatMode.COMPASSIONATE_FRIEND])
-        
-        # Build system prompt: Reality Filter (Constraints) + Personality (Behavior)
-        system_prompt = f"{HUMAN_REALITY_FILTER}\n\n[YOUR PRIMARY PERSONALITY]:\n{personality_prompt}"
-        
-        # Add RAG context ONLY if it's not a short greeting
-        if rag_context and len(obfuscated_message.split()) > 3:
-            system_prompt += f"\n\n[SITUATIONAL KNOWLEDGE]:\n{rag_context}\n(Use this only if relevant to the user's specific problem.)"
-        
-        # 6. Solution/Perspective Transition Logic
-        if len(request.history) >= 4:
-            system_prompt += "\n\n[DIRECTIVE]: You have enough context. DO NOT ask more questions. Transition to offering a solid perspective, a relevant story, or a character-specific solution that matches the user's current mood/energy."
-        
-        print(f"🎭 Appending Reality Filter to {request.mode}...")
-        
-        # Build conversation context from history
-        conversation = ""
-        for msg in request.history:  # Use full session history (client manages wipe on refresh)
-            role = "User" if msg.role == "user" else "Assistant"
-            conversation += f"{role}: {msg.content}\n\n"
+        with metrics.OBFUSCATION_SECONDS.time(), timing.phase("obfuscation"):
+            obfuscated_message = text_obfuscator.obfuscate(request.message)
         
-        # Add current message
-        conversation += f"User: {obfuscated_message}\n\nAssistant:"
+        with timing.phase("prompt"):
+            # Retrieval runs off the event loop when the scan is large
+            rag_results = None
+            if persona_uses_rag(request.mode) and len(obfuscated_message.split()) > RAG_MIN_WORDS:
+                corpora = persona_corpora(request.mode)
+                # None unless RAG_MODE is semantic/hybrid and embeddings are loaded
+                query_vectors = await knowledge_bases.embed_query(obfuscated_message, corpora)
+                rag_results = await knowledge_bases.search_async(
+                    obfuscated_message, corpora, limit=1, query_vectors=query_vectors
+                )
+            system_prompt = build_system_prompt(
+                request.mode, obfuscated_message, len(request.history), rag_results=rag_results
+            )
+            conversation = build_conversation(request.history, obfuscated_message)
         
         # Generate response
         response = await ollama_client.generate(
             prompt=conversation,
             system_prompt=system_prompt,
-            temperature=0.8,  # Increased for more natural variation
-            max_tokens=256
+            temperature=CHAT_TEMPERATURE,
+            hedge=True,  # Interactive turn - tail latency matters most here
+            **token_policy("chat")
         )
         
         return ChatResponse(
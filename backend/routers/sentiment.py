@@ -3,20 +3,28 @@ Sentiment Analysis API Router
 Handles all emotion analysis endpoints
 """
 
-from fastapi import APIRouter, HTTPException, UploadFile, File
-from typing import Optional
+from fastapi import APIRouter, HTTPException, UploadFile, File, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from typing import Dict, List, Optional
+import asyncio
 import base64
+import json
+import time
 
+from config import settings
 from models.schemas import (
     AnalysisRequest,
     AnalysisResponse,
+    BatchAnalysisRequest,
     QuickCheckRequest,
     QuickCheckResponse,
     MaskingIndicator
 )
+from services import metrics, timing
 from services.nlp_engine import NLPEngine
 from services.risk_scorer import RiskScorer
 from services.intervention_engine import InterventionEngine
+from services.tone_tracker import IncrementalToneTracker, count_words, tone_from_counts
 from privacy.text_obfuscator import TextObfuscator
 
 router = APIRouter()
@@ -38,7 +46,8 @@ async def analyze_sentiment(request: AnalysisRequest):
     """
     try:
         # Additional server-side obfuscation (defense in depth)
-        obfuscated_text = text_obfuscator.obfuscate(request.text)
+        with metrics.OBFUSCATION_SECONDS.time(), timing.phase("obfuscation"):
+            obfuscated_text = text_obfuscator.obfuscate(request.text)
         
         # Run SINGLE optimized NLP analysis (no separate masking call)
         sentiment_result = await nlp_engine.analyze_sentiment(
@@ -46,60 +55,145 @@ async def analyze_sentiment(request: AnalysisRequest):
             session_id=request.session_id
         )
         
-        # Analyze patterns locally (fast, no AI needed)
-        repetition_detected, repeated_words = nlp_engine.analyze_repetition(obfuscated_text)
-        emotional_shift = nlp_engine.detect_emotional_shift(obfuscated_text)
-        
-        # Create default masking indicator (skip slow AI analysis)
-        masking = MaskingIndicator(detected=False)
-        
-        # Calculate wellness score
-        wellness_result = risk_scorer.calculate_wellness_score(
-            primary_emotion=sentiment_result["primary_emotion"],
-            secondary_emotions=sentiment_result["secondary_emotions"],
-            emotional_tone=sentiment_result["emotional_tone"],
-            masking=masking,
-            repetition_detected=repetition_detected,
-            emotional_shift=emotional_shift,
-            urgency_level=sentiment_result["urgency_level"],
-            risk_score_from_ai=sentiment_result.get("risk_score")
-        )
-        
-        # Get interventions
-        interventions = intervention_engine.get_interventions(
-            primary_emotion=sentiment_result["primary_emotion"],
-            wellness_score=wellness_result["wellness_score"],
-            masking_detected=masking.detected,
-            high_intensity=sentiment_result["primary_emotion"].intensity > 0.7
-        )
-        
-        # Get supportive message
-        supportive_message = intervention_engine.get_supportive_message(
-            primary_emotion=sentiment_result["primary_emotion"],
-            masking_detected=masking.detected,
-            ai_message=sentiment_result.get("support_message")
-        )
-        
-        return AnalysisResponse(
-            wellness_score=wellness_result["wellness_score"],
-            confidence=wellness_result["confidence"],
-            primary_emotion=sentiment_result["primary_emotion"],
-            secondary_emotions=sentiment_result["secondary_emotions"],
-            emotional_intensity=sentiment_result["primary_emotion"].intensity,
-            masking=masking,
-            repetition_detected=repetition_detected,
-            emotional_shift=emotional_shift,
-            mood_seed_stage=wellness_result["mood_seed_stage"],
-            mood_color=wellness_result["mood_color"],
-            recommended_interventions=interventions,
-            supportive_message=supportive_message,
-            data_stored=False  # Privacy guarantee
-        )
+        with timing.phase("postprocess"):
+            # Analyze patterns locally (fast, no AI needed)
+            repetition_detected, repeated_words = nlp_engine.analyze_repetition(obfuscated_text)
+            emotional_shift = nlp_engine.detect_emotional_shift(obfuscated_text)
+            return build_analysis_response(sentiment_result, repetition_detected, emotional_shift)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
 
 
+def build_analysis_response(
+    sentiment_result: Dict,
+    repetition_detected: bool,
+    emotional_shift: Optional[str]
+) -> AnalysisResponse:
+    """Score the AI sentiment plus local pattern signals and pick interventions (no AI calls)"""
+    # Create default masking indicator (skip slow AI analysis)
+    masking = MaskingIndicator(detected=False)
+    
+    # Calculate wellness score
+    wellness_result = risk_scorer.calculate_wellness_score(
+        primary_emotion=sentiment_result["primary_emotion"],
+        secondary_emotions=sentiment_result["secondary_emotions"],
+        emotional_tone=sentiment_result["emotional_tone"],
+        masking=masking,
+        repetition_detected=repetition_detected,
+        emotional_shift=emotional_shift,
+        urgency_level=sentiment_result["urgency_level"],
+        risk_score_from_ai=sentiment_result.get("risk_score")
+    )
+    
+    # Get interventions
+    interventions = intervention_engine.get_interventions(
+        primary_emotion=sentiment_result["primary_emotion"],
+        wellness_score=wellness_result["wellness_score"],
+        masking_detected=masking.detected,
+        high_intensity=sentiment_result["primary_emotion"].intensity > 0.7
+    )
+    
+    # Get supportive message
+    supportive_message = intervention_engine.get_supportive_message(
+        primary_emotion=sentiment_result["primary_emotion"],
+        masking_detected=masking.detected,
+        ai_message=sentiment_result.get("support_message")
+    )
+    
+    return AnalysisResponse(
+        wellness_score=wellness_result["wellness_score"],
+        confidence=wellness_result["confidence"],
+        primary_emotion=sentiment_result["primary_emotion"],
+        secondary_emotions=sentiment_result["secondary_emotions"],
+        emotional_intensity=sentiment_result["primary_emotion"].intensity,
+        masking=masking,
+        repetition_detected=repetition_detected,
+        emotional_shift=emotional_shift,
+        mood_seed_stage=wellness_result["mood_seed_stage"],
+        mood_color=wellness_result["mood_color"],
+        recommended_interventions=interventions,
+        supportive_message=supportive_message,
+        data_stored=False  # Privacy guarantee
+    )
+
+
+def _local_stages(texts: List[str]):
+    """Obfuscation and pattern checks for a whole batch: [(text, repetition, shift)]"""
+    obfuscated = []
+    for text in texts:
+        with metrics.OBFUSCATION_SECONDS.time():
+            obfuscated.append(text_obfuscator.obfuscate(text))
+    return [
+        (text, nlp_engine.analyze_repetition(text)[0], nlp_engine.detect_emotional_shift(text))
+        for text in obfuscated
+    ]
+
+
+@router.post("/analyze/batch")
+async def analyze_sentiment_batch(request: BatchAnalysisRequest):
+    """
+    Analyze several journal entries (e.g. a week imported at once) in one call
+    
+    Local stages run for the whole batch in one pass off the event loop; the
+    AI sentiment calls then run with at most BATCH_ANALYSIS_CONCURRENCY in
+    flight, one per distinct entry. Results stream back
+    as NDJSON in completion order, one line per entry:
+        {"index": 0, "result": {...AnalysisResponse}}
+        {"index": 3, "error": "Analysis failed"}
+    
+    The Server-Timing header goes out before any entry is analyzed, so with
+    ENABLE_SERVER_TIMING the full breakdown follows as a last line instead
+    (milliseconds; per-entry phases are summed, so they can exceed total):
+        {"timing": {"obfuscation": 2.1, "queue": ..., "total": 5120.4}}
+    
+    Privacy: No data is stored. Processing is ephemeral.
+    """
+    started = time.perf_counter()
+    timings = timing.current()
+    with timing.phase("obfuscation"):
+        prepared = await asyncio.to_thread(_local_stages, request.entries)
+    semaphore = asyncio.Semaphore(max(1, settings.BATCH_ANALYSIS_CONCURRENCY))
+    
+    async def sentiment(text: str) -> Dict:
+        async with semaphore:
+            return await nlp_engine.analyze_sentiment(text=text, session_id=request.session_id)
+    
+    async def analyze_entry(index: int, call: asyncio.Task, repetition_detected: bool, emotional_shift: Optional[str]):
+        try:
+            sentiment_result = await call
+            with timing.phase("postprocess"):
+                response = build_analysis_response(sentiment_result, repetition_detected, emotional_shift)
+            return {"index": index, "result": response.model_dump(mode="json")}
+        except Exception:
+            metrics.DEGRADED_RESPONSES.labels("analyze_batch", "error").inc()
+            return {"index": index, "error": "Analysis failed"}
+    
+    async def stream():
+        # One AI call per distinct entry - repeated entries share its result
+        calls = {}
+        for text, _, _ in prepared:
+            if text not in calls:
+                calls[text] = asyncio.create_task(sentiment(text))
+        tasks = [
+            asyncio.create_task(analyze_entry(index, calls[text], repetition_detected, emotional_shift))
+            for index, (text, repetition_detected, emotional_shift) in enumerate(prepared)
+        ]
+        outcome = "disconnected"
+        try:
+            for finished in asyncio.as_completed(tasks):
+                yield json.dumps(await finished) + "\n"
+            outcome = "complete"
+            if timings is not None:
+                yield json.dumps({"timing": timings.summary()}) + "\n"
+        finally:
+            for task in [*calls.values(), *tasks]:
+                task.cancel()  # Client went away - stop queued and in-flight calls
+            metrics.BATCH_ANALYSIS_SECONDS.labels(outcome).observe(time.perf_counter() - started)
+    
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
 @router.post("/quick-check", response_model=QuickCheckResponse)
 async def quick_check(request: QuickCheckRequest):
     """
@@ -107,47 +201,11 @@ async def quick_check(request: QuickCheckRequest):
     Uses simpler analysis for faster response
     """
     try:
-        text = request.text
-        
-        # Quick sentiment indicators
-        positive_words = {
-            'happy', 'good', 'great', 'better', 'love', 'wonderful',
-            'amazing', 'excited', 'hopeful', 'grateful', 'thankful',
-            'peaceful', 'calm', 'relaxed', 'confident'
-        }
-        negative_words = {
-            'sad', 'bad', 'worse', 'hate', 'terrible', 'awful',
-            'anxious', 'worried', 'scared', 'angry', 'frustrated',
-            'lonely', 'tired', 'exhausted', 'stressed', 'overwhelmed'
-        }
-        
-        words = text.lower().split()
-        pos_count = sum(1 for w in words if w in positive_words)
-        neg_count = sum(1 for w in words if w in negative_words)
-        
-        total = pos_count + neg_count
-        if total == 0:
-            tone = "neutral"
-            intensity = 0.3
-        elif pos_count > neg_count:
-            tone = "positive"
-            intensity = min(1.0, pos_count / max(1, len(words)) * 5)
-        else:
-            tone = "concerning"
-            intensity = min(1.0, neg_count / max(1, len(words)) * 5)
-        
-        # Generate suggestion for concerning tone
-        suggestion = None
-        if tone == "concerning" and intensity > 0.5:
-            suggestion = "Take a deep breath. It's okay to feel this way."
-        
-        return QuickCheckResponse(
-            emotional_tone=tone,
-            intensity=intensity,
-            suggestion=suggestion
-        )
+        pos_count, neg_count, word_count = count_words(request.text)
+        return QuickCheckResponse(**tone_from_counts(pos_count, neg_count, word_count))
         
     except Exception:
+        metrics.DEGRADED_RESPONSES.labels("quick_check", "error").inc()
         return QuickCheckResponse(
             emotional_tone="neutral",
             intensity=0.3,
@@ -155,6 +213,52 @@ async def quick_check(request: QuickCheckRequest):
         )
 
 
+@router.websocket("/quick-check/ws")
+async def quick_check_stream(websocket: WebSocket):
+    """
+    Incremental real-time feedback while typing
+    
+    Client sends JSON edits over one connection:
+        {"text": "..."}                            - replace the whole buffer
+        {"start": 10, "end": 12, "insert": "ok"}   - splice text[start:end]
+        {"insert": "more words"}                   - append
+    
+    The server keeps running word counts and pushes a QuickCheckResponse
+    only when the tone changes.
+    
+    The buffer is capped at the quick-check limit (2000 characters), and
+    frames too large to be a single edit of it are ignored unparsed.
+    
+    Privacy: The buffer exists only for the life of the connection.
+    """
+    await websocket.accept()
+    tracker = IncrementalToneTracker(max_length=2000)  # Same limit as QuickCheckRequest
+    # Worst case JSON for a full-buffer edit: every character \u-escaped, plus the keys
+    max_frame = tracker.max_length * 6 + 256
+    
+    try:
+        while True:
+            try:
+                frame = await websocket.receive_text()
+                if len(frame) > max_frame:
+                    continue
+                edit = json.loads(frame)
+                if "text" in edit:
+                    tracker.reset(str(edit["text"]))
+                else:
+                    start = int(edit.get("start", len(tracker.text)))
+                    end = int(edit.get("end", start))
+                    tracker.splice(start, end, str(edit.get("insert", "")))
+            except (ValueError, TypeError, AttributeError, KeyError, OverflowError):
+                continue  # Malformed edit (e.g. 1e999 offsets) or binary frame - keep the last good state
+            
+            update = tracker.changed_result()
+            if update is not None:
+                await websocket.send_json(QuickCheckResponse(**update).model_dump())
+    except WebSocketDisconnect:
+        pass
+
+
 @router.post("/analyze-visual")
 async def analyze_visual_mood(file: UploadFile = File(...)):
     """
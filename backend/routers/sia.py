@@ -8,7 +8,9 @@ from typing import Optional
 import re
 
 from models.schemas import SiaRequest, SiaResponse, ChatMessage
+from services import metrics, timing
 from services.ollama_client import OllamaClient
+from services.token_policy import token_policy
 from privacy.text_obfuscator import TextObfuscator
 from prompts import SIA_SYSTEM_PROMPT
 
@@ -27,36 +29,42 @@ async def sia_assistant(request: SiaRequest):
     """
     try:
         # Obfuscate for privacy
-        obfuscated_message = text_obfuscator.obfuscate(request.message)
+        with metrics.OBFUSCATION_SECONDS.time(), timing.phase("obfuscation"):
+            obfuscated_message = text_obfuscator.obfuscate(request.message)
         
         # Build conversation context
-        conversation = ""
-        for msg in request.history:
-            role = "User" if msg.role == "user" else "Assistant"
-            conversation += f"{role}: {msg.content}\n\n"
-        
-        conversation += f"User: {obfuscated_message}\n\nAssistant:"
+        with timing.phase("prompt"):
+            conversation = ""
+            for msg in request.history:
+                role = "User" if msg.role == "user" else "Assistant"
+                conversation += f"{role}: {msg.content}\n\n"
+            
+            conversation += f"User: {obfuscated_message}\n\nAssistant:"
         
         # Generate response using Sia's specific prompt
         response_text = await ollama_client.generate(
             prompt=conversation,
             system_prompt=SIA_SYSTEM_PROMPT,
             temperature=0.7,
-            max_tokens=300
+            hedge=True,  # Short interactive call - worth a duplicate on a slow backend
+            **token_policy("sia")
         )
         
-        # Parse potential actions from the response
-        # Using [ACTION: type:payload] format
-        action_match = re.search(r'\[ACTION:\s*([^:\]]+)(?::([^\]]+))?\]', response_text)
+        with timing.phase("postprocess"):
+            # Parse potential actions from the response
+            # Using [ACTION: type:payload] format
+            action_match = re.search(r'\[ACTION:\s*([^:\]]+)(?::([^\]]+))?\]', response_text)
         
-        suggested_action = None
-        action_payload = None
+            suggested_action = None
+            action_payload = None
         
-        if action_match:
-            suggested_action = action_match.group(1).strip()
-            action_payload = action_match.group(2).strip() if action_match.group(2) else None
-            # Clean the tag from the user-facing response
-            response_text = re.sub(r'\[ACTION:.*?\]', '', response_text).strip()
+            if action_match:
+                suggested_action = action_match.group(1).strip()
+                action_payload = action_match.group(2).strip() if action_match.group(2) else None
+                # Clean the tag from the user-facing response
+                response_text = re.sub(r'\[ACTION:.*?\]', '', response_text).strip()
+            else:
+                metrics.DEGRADED_RESPONSES.labels("sia", "no_action").inc()
             
         return SiaResponse(
             response=response_text,
@@ -6,6 +6,7 @@ Uses local LLM to translate content while preserving tone and formatting.
 from fastapi import APIRouter, HTTPException
 from models.schemas import TranslationRequest, TranslationResponse
 from services.ollama_client import OllamaClient
+from services.token_policy import token_policy
 
 router = APIRouter()
 ollama_client = OllamaClient()
@@ -39,7 +40,7 @@ async def translate_content(request: TranslationRequest):
             prompt=prompt,
             system_prompt=TRANSLATION_SYSTEM_PROMPT,
             temperature=0.3, # Low temperature for accurate reproduction
-            max_tokens=2000
+            **token_policy("translate", request.text)  # Budget scales with input length
         )
         
         return TranslationResponse(
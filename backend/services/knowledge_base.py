@@ -1,74 +1,683 @@
+import asyncio
+import hashlib
+import math
 import os
 import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from config import settings
+from services import metrics, timing, vector_index
+from services.ollama_client import OllamaClient
+from services.token_policy import estimate_tokens
+
+ELLIPSIS_TOKENS = 3  # "..." marking a cut at either end of a snippet
+RAG_MODES = ("keyword", "semantic", "hybrid")
+
+# BM25 saturation and length normalisation
+BM25_K1 = 1.2
+BM25_B = 0.75
+# Reciprocal rank fusion constant for hybrid ranking (standard value from the RRF paper)
+RRF_K = 60
+# Keyword ranking depth kept (and cached) per query; deeper ranks barely move RRF scores
+KEYWORD_RANKS = 200
+
+_WORD = re.compile(r"\S+")
+_QUERY_TERM = re.compile(r"[a-z]+")
+_PAGE_HEADER = re.compile(r"\d+ ---[ \t]*\n?")
+_SENTENCE_END = (".", "!", "?", '."', '?"', '!"')
+# Words longer than 3 letters that say nothing about the topic of a message
+_STOP_WORDS = frozenset("""
+    about after again also always because been before being both could does doing down during each even
+    every from have having here into just like more most much myself only other over really same should
+    some such than that their them then there these they this those through very what when where which
+    while will with would your yours
+""".split())
+
+SEARCH_EXECUTORS = ("thread", "process")
+
+DEFAULT_CORPUS = "handbook"
+CORPUS_DIR = "data/corpora"  # Extra corpora: data/corpora/<name>.txt, embeddings at data/embeddings/<name>
+
+
+def query_terms(query: str):
+    """
+    Distinct lowercase words longer than 3 letters, stop words removed, as a
+    sorted tuple - what keyword search matches on, and its cache key
+    """
+    return tuple(sorted({t for t in _QUERY_TERM.findall(query.lower()) if len(t) > 3 and t not in _STOP_WORDS}))
+
+
+class RankingCache:
+    """
+    Bounded LRU of keyword rankings ((score, passage) pairs). Keys are
+    SHA-256 digests of the query term set, so no readable message words
+    are held - only which passages matched and how well.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(terms) -> bytes:
+        return hashlib.sha256("\0".join(terms).encode("utf-8")).digest()
+
+    def __contains__(self, key: bytes) -> bool:
+        """Peek without counting a lookup or refreshing the entry"""
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: bytes):
+        with self._lock:
+            ranking = self._entries.get(key)
+            if ranking is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return ranking
+
+    def put(self, key: bytes, ranking):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = ranking
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
 
 class KnowledgeBase:
-    def __init__(self, data_path="data/counseling_handbook.txt"):
+    def __init__(self, data_path="data/counseling_handbook.txt",
+                 passage_words: int = None, overlap_words: int = None,
+                 embeddings_path: str = None, mode: str = None,
+                 name: str = DEFAULT_CORPUS, title: str = "COUNSELING MANUAL"):
+        self.name = name
+        self.title = title  # Label of the reference block injected into prompts
         self.data_path = os.path.join(os.getcwd(), data_path)
+        self.embeddings_path = os.path.join(os.getcwd(), embeddings_path or settings.RAG_EMBEDDINGS_PATH)
+        self.mode = mode or settings.RAG_MODE
+        if self.mode not in RAG_MODES:
+            print(f"⚠️ Unknown RAG_MODE '{self.mode}', using keyword search")
+            self.mode = "keyword"
+        self.passage_words = passage_words or settings.RAG_PASSAGE_WORDS
+        self.overlap_words = min(overlap_words if overlap_words is not None else settings.RAG_PASSAGE_OVERLAP,
+                                 self.passage_words - 1)
         self.documents = []
+        # Passages as (page, start, end) character offsets into self.documents[page],
+        # with their lowercased text alongside for scoring
+        self.passages = []
+        self._passage_text = []
+        self._passage_words = []
+        self._avg_passage_words = 0.0
+        self.source_sha256 = None
+        self.loaded_stamp = None  # source_stamp() when load_data last read the files
+        self.vector_index = None  # FlatIndex / IVFIndex over self.passages (semantic / hybrid modes)
         self.is_loaded = False
-        
+        self._load_lock = threading.Lock()
+        # Keyword rankings by term set digest: (score, passage) pairs only, never message words
+        self.ranking_cache = RankingCache(settings.RAG_CACHE_SIZE)
+
     def load_data(self):
-        """Loads the counseling handbook text map."""
+        """Loads the corpus text map (the counseling handbook by default)."""
         if not os.path.exists(self.data_path):
             print(f"⚠️ Knowledge Base not found at: {self.data_path}")
             return False
-            
+
+        # Stamped before reading, so a write that lands mid-load still counts as a change
+        self.loaded_stamp = self.source_stamp()
         try:
             with open(self.data_path, "r", encoding="utf-8") as f:
                 raw_text = f.read()
-                
+
             # Split by pages (since we added --- PAGE X --- markers)
             self.documents = raw_text.split("--- PAGE ")
+            self.source_sha256 = hashlib.sha256(raw_text.encode("utf-8")).hexdigest()
+            self._build_passages()
+            self.ranking_cache.clear()  # Passage ids changed
             self.is_loaded = True
-            print(f"✅ Knowledge Base Loaded: {len(self.documents)} pages indexed.")
+            print(f"✅ Knowledge Base '{self.name}' Loaded: {len(self.documents)} pages, {len(self.passages)} passages indexed.")
+            if self.mode != "keyword":
+                self._load_vectors()
             return True
         except Exception as e:
             print(f"❌ Error loading Knowledge Base: {e}")
             return False
 
-    def search(self, query: str, limit: int = 3):
+    def ensure_loaded(self) -> bool:
+        """Load once, even when the first searches arrive on several threads at the same time"""
+        if self.is_loaded:
+            return True
+        with self._load_lock:
+            return self.is_loaded or self.load_data()
+
+    def source_stamp(self):
+        """(mtime, size) of the corpus file and, outside keyword mode, the embeddings metadata"""
+        paths = [self.data_path] + ([f"{self.embeddings_path}.json"] if self.mode != "keyword" else [])
+        stamp = []
+        for path in paths:
+            try:
+                stat = os.stat(path)
+                stamp.append((stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                stamp.append(None)
+        return tuple(stamp)
+
+    def _build_passages(self):
+        """Overlapping fixed-size word windows per page (a passage never spans two pages)"""
+        passages, texts = [], []
+        step = self.passage_words - self.overlap_words
+        for page, doc in enumerate(self.documents):
+            header = _PAGE_HEADER.match(doc)
+            spans = [m.span() for m in _WORD.finditer(doc, header.end() if header else 0)]
+            if not spans:
+                continue
+            for first in range(0, max(len(spans) - self.overlap_words, 1), step):
+                window = spans[first:first + self.passage_words]
+                start, end = window[0][0], window[-1][1]
+                passages.append((page, start, end))
+                texts.append(doc[start:end].lower())
+        self.passages, self._passage_text = passages, texts
+        self._passage_words = [len(window) for window in (_WORD.findall(text) for text in texts)]
+        self._avg_passage_words = sum(self._passage_words) / max(len(texts), 1)
+
+    def passage_text(self, i: int) -> str:
+        """Original-case passage text with whitespace collapsed (what gets embedded)"""
+        page, start, end = self.passages[i]
+        return " ".join(self.documents[page][start:end].split())
+
+    def index_meta(self):
+        """What an embedding matrix must have been built from to line up with self.passages"""
+        return {
+            "source_sha256": self.source_sha256,
+            "passage_words": self.passage_words,
+            "passage_overlap": self.overlap_words,
+            "passages": len(self.passages),
+        }
+
+    def _load_vectors(self):
+        """Map the prebuilt passage embeddings; any mismatch falls back to keyword search"""
+        self.vector_index = None
+        if not vector_index.available():
+            print(f"⚠️ RAG_MODE={self.mode} needs numpy - using keyword search")
+            return False
+        if not os.path.exists(f"{self.embeddings_path}.json"):
+            print(f"⚠️ No embeddings at {self.embeddings_path} (run tools/build_embeddings.py) - using keyword search")
+            return False
+        try:
+            index = vector_index.load(self.embeddings_path)
+        except Exception as e:
+            print(f"❌ Error loading embeddings: {e}")
+            return False
+        stale = {key: value for key, value in self.index_meta().items() if index.meta.get(key) != value}
+        if stale or len(index) != len(self.passages):
+            print(f"⚠️ Embeddings are stale ({', '.join(stale) or 'count'} changed) - rebuild them; using keyword search")
+            return False
+        if isinstance(index, vector_index.IVFIndex) and settings.RAG_IVF_PROBES > 0:
+            index.n_probe = settings.RAG_IVF_PROBES
+        self.vector_index = index
+        print(f"✅ Embeddings mapped: {len(index)} x {index.dim} {index.meta.get('dtype')} "
+              f"{index.meta.get('index', 'flat')} index ({index.meta.get('model')})")
+        return True
+
+    @property
+    def semantic_ready(self) -> bool:
+        return self.vector_index is not None
+
+    @property
+    def embedding_model(self):
+        return self.vector_index.meta.get("model") if self.vector_index is not None else None
+
+    async def embed_query(self, query: str):
+        """
+        Query embedding for semantic/hybrid search, or None when not in use.
+        A failed embedding call degrades to keyword search rather than failing the turn.
         """
-        Simple keyword/relevance search.
-        Finds pages with the highest density of query terms.
+        if not self.semantic_ready:
+            return None
+        with timing.phase("rag"):
+            try:
+                vectors = await OllamaClient().embed([query], model=self.vector_index.meta.get("model"))
+                return vectors[0] if vectors else None
+            except Exception as e:
+                print(f"⚠️ Query embedding failed, using keyword search: {e}")
+                return None
+
+    def search(self, query: str, limit: int = 3, max_tokens: int = None, query_vector=None):
+        """Timed wrapper around _search (metrics and the Server-Timing `rag` phase)"""
+        with metrics.KB_SEARCH_SECONDS.time(), timing.phase("rag"):
+            return self._search(query, limit, max_tokens, query_vector)
+
+    def _search(self, query: str, limit: int = 3, max_tokens: int = None, query_vector=None):
         """
-        if not self.is_loaded:
-            if not self.load_data():
-                return []
+        Passage search: BM25 over query terms, cosine over embeddings
+        (semantic mode), or both fused by reciprocal rank (hybrid mode).
+        Returns the best window of each passage within the token budget,
+        with the signals is_relevant() gates on: normalised BM25 ("bm25"),
+        cosine ("similarity", None without vectors) and the number of
+        distinct query terms the passage contains ("matched").
+
+        Args:
+            query_vector: Embedding of the query from embed_query(); ignored
+                in keyword mode and when the embeddings are not loaded
+        """
+        if not self.ensure_loaded():
+            return []
 
-        query_terms = [t.lower() for t in query.split() if len(t) > 3]
-        if not query_terms:
+        terms = query_terms(query)
+        use_vectors = query_vector is not None and self.semantic_ready and self.mode != "keyword"
+        keyword = vector = ()
+
+        if use_vectors and self.mode == "semantic":
+            scored = vector = self._vector_scores(query_vector, max(limit * 4, 10))
+        elif use_vectors:
+            keyword, vector = self._ranked(terms), self._vector_scores(query_vector, max(limit * 20, 50))
+            scored = self._fuse(keyword, vector)
+        elif terms:
+            scored = keyword = self._ranked(terms)
+        else:
             return []
-            
-        scored_docs = []
-        
-        for i, doc in enumerate(self.documents):
-            score = 0
-            doc_lower = doc.lower()
-            
-            for term in query_terms:
-                count = doc_lower.count(term)
-                score += count
-                
-            if score > 0:
-                # Store (score, page_content, page_number)
-                # Note: i is roughly page number (off by 1 usually)
-                scored_docs.append((score, doc, i))
-        
-        # Sort by score descending
-        scored_docs.sort(key=lambda x: x[0], reverse=True)
-        
-        # Return top K
+        bm25 = {i: score for score, i in keyword}
+        similarity = {i: score for score, i in vector}
+
+        # Return top K, skipping passages that overlap one already chosen
+        budget = max_tokens or settings.RAG_SNIPPET_TOKENS
         results = []
-        for score, content, page_num in scored_docs[:limit]:
-            # Snippet: grab meaningful chunk around best match or just first 500 chars
-            snippet = content[:1000] + "..." 
+        chosen = []
+        for score, i in scored:
+            page, start, end = self.passages[i]
+            if any(p == page and start < e and s < end for p, s, e in chosen):
+                continue
+            chosen.append((page, start, end))
+            snippet, snippet_start, snippet_end = self._best_window(page, start, end, terms, budget)
             results.append({
-                "page": page_num,
+                "corpus": self.name,
+                "title": self.title,
+                "page": page,
                 "score": score,
-                "content": snippet.strip()
+                "bm25": bm25.get(i, 0.0),
+                "similarity": similarity.get(i) if use_vectors else None,
+                "matched": sum(1 for term in terms if term in self._passage_text[i]),
+                "content": snippet,
+                "start": snippet_start,
+                "end": snippet_end
             })
-            
+            if len(results) >= limit:
+                break
+
         return results
 
-# Singleton instance
-kb = KnowledgeBase()
+    def ranking_cached(self, terms) -> bool:
+        return RankingCache.key(terms) in self.ranking_cache
+
+    def _ranked(self, terms):
+        """_keyword_scores through the ranking cache"""
+        key = RankingCache.key(terms)
+        ranking = self.ranking_cache.get(key)
+        if ranking is None:
+            ranking = self._keyword_scores(terms)
+            self.ranking_cache.put(key, ranking)
+        return ranking
+
+    def _keyword_scores(self, terms):
+        """
+        ((normalised bm25, passage), ...) best first, the top KEYWORD_RANKS.
+        Called through self._ranked, which caches it. Terms match as substrings,
+        as before, so "feel" still counts "feelings"; rare terms outweigh
+        common ones.
+
+        Scores are divided by the best score the query could reach here
+        (every term present, fully saturated), so they fall in 0..1 and stay
+        comparable across corpora of different sizes. A term the corpus
+        lacks entirely still counts in that maximum.
+        """
+        total = len(self._passage_text)
+        scores = {}
+        attainable = 0.0
+        for term in terms:
+            counts = [(i, text.count(term)) for i, text in enumerate(self._passage_text)]
+            counts = [(i, tf) for i, tf in counts if tf]
+            idf = math.log(1 + (total - len(counts) + 0.5) / (len(counts) + 0.5))
+            attainable += idf * (BM25_K1 + 1)
+            for i, tf in counts:
+                length = self._passage_words[i] / self._avg_passage_words
+                scores[i] = scores.get(i, 0.0) + idf * tf * (BM25_K1 + 1) / (tf + BM25_K1 * (1 - BM25_B + BM25_B * length))
+        # Sort by score descending (earlier passage wins ties)
+        ranked = sorted(((score / attainable, i) for i, score in scores.items()), key=lambda x: (-x[0], x[1]))
+        return tuple(ranked[:KEYWORD_RANKS])
+
+    def _vector_scores(self, query_vector, k: int):
+        return [(score, i) for i, score in self.vector_index.search(query_vector, k)]
+
+    @staticmethod
+    def _fuse(*rankings):
+        """Reciprocal rank fusion - needs no calibration between BM25 and cosine scales"""
+        fused = {}
+        for ranking in rankings:
+            for rank, (_, i) in enumerate(ranking):
+                fused[i] = fused.get(i, 0.0) + 1 / (RRF_K + rank + 1)
+        return sorted(((score, i) for i, score in fused.items()), key=lambda x: (-x[0], x[1]))
+
+    def _best_window(self, page: int, start: int, end: int, terms, max_tokens: int):
+        """
+        Densest run of words within the token budget: a two-pointer window
+        over the passage maximising query-term hits, then widened to
+        sentence boundaries with whatever budget is left.
+        Returns (snippet, start, end) with offsets into the page text.
+        """
+        doc = self.documents[page]
+        words = [(m.start() + start, m.end() + start, m.group()) for m in _WORD.finditer(doc[start:end])]
+        costs = [estimate_tokens(word) for _, _, word in words]
+        hits = [1 if any(term in word.lower() for term in terms) else 0 for _, _, word in words]
+        budget = max(max_tokens - 2 * ELLIPSIS_TOKENS, 1)
+
+        best, last, best_hits = 0, 1, -1
+        first = cost = window_hits = 0
+        for i in range(len(words)):
+            cost += costs[i]
+            window_hits += hits[i]
+            while cost > budget and first < i:
+                cost -= costs[first]
+                window_hits -= hits[first]
+                first += 1
+            if window_hits > best_hits:
+                best, last, best_hits = first, i + 1, window_hits
+
+        # Grow the hit span back to its sentence start, then forward to whole sentences
+        cost = sum(costs[best:last])
+        while best > 0 and not words[best - 1][2].endswith(_SENTENCE_END) and cost + costs[best - 1] <= budget:
+            best -= 1
+            cost += costs[best]
+        sentence_last = None
+        while last < len(words) and cost + costs[last] <= budget:
+            cost += costs[last]
+            last += 1
+            if words[last - 1][2].endswith(_SENTENCE_END):
+                sentence_last = last
+        if sentence_last:
+            last = sentence_last
+
+        snippet = " ".join(word for _, _, word in words[best:last])
+        snippet_start, snippet_end = words[best][0], words[last - 1][1]
+        preceding = doc[:snippet_start].rstrip()
+        if preceding and not preceding.endswith(_SENTENCE_END) and not _PAGE_HEADER.fullmatch(preceding):
+            snippet = "..." + snippet
+        if not snippet.endswith(_SENTENCE_END) and doc[snippet_end:].strip():
+            snippet += "..."
+        return snippet, snippet_start, snippet_end
+
+
+def is_relevant(result) -> bool:
+    """
+    Whether a search result is worth its prompt tokens: close enough in
+    embedding space (RAG_MIN_SIMILARITY), or a keyword match that is both
+    strong enough (RAG_MIN_SCORE, normalised BM25) and not a single
+    incidental word (RAG_MIN_TERMS distinct query terms).
+    Calibrate the thresholds with tools/calibrate_rag_threshold.py.
+    """
+    if result.get("similarity") is not None and result["similarity"] >= settings.RAG_MIN_SIMILARITY:
+        return True
+    return result.get("bm25", 0.0) >= settings.RAG_MIN_SCORE and result.get("matched", 0) >= settings.RAG_MIN_TERMS
+
+
+class KnowledgeBaseRegistry:
+    """
+    Named corpora, each with its own passage (and optional vector) index.
+    The handbook is always registered; every data/corpora/<name>.txt adds
+    one more. Personas pick corpora via MODE_INFO["corpora"], so a query
+    only scans the indexes its persona can use.
+    """
+
+    def __init__(self, corpus_dir: str = CORPUS_DIR):
+        self.corpus_dir = corpus_dir
+        # Replaced as a whole on reload, never mutated - read it once per operation
+        self.corpora = {name: self._new_corpus(name, path) for name, path in self._corpus_files().items()}
+        self.generation = 0
+        self._reload_lock = threading.Lock()
+
+    def _corpus_files(self):
+        """{name: data path} - the handbook plus every data/corpora/<name>.txt"""
+        files = {DEFAULT_CORPUS: None}
+        directory = os.path.join(os.getcwd(), self.corpus_dir)
+        if os.path.isdir(directory):
+            for filename in sorted(os.listdir(directory)):
+                name, extension = os.path.splitext(filename)
+                if extension == ".txt" and name not in files:
+                    files[name] = os.path.join(self.corpus_dir, filename)
+        return files
+
+    @staticmethod
+    def _new_corpus(name: str, path: str = None) -> KnowledgeBase:
+        if path is None:
+            return KnowledgeBase()
+        return KnowledgeBase(path, embeddings_path=f"data/embeddings/{name}", name=name,
+                             title=name.replace("_", " ").upper())
+
+    @property
+    def default(self) -> KnowledgeBase:
+        return self.corpora[DEFAULT_CORPUS]
+
+    @property
+    def reloading(self) -> bool:
+        return self._reload_lock.locked()
+
+    def changed(self) -> bool:
+        """Whether a corpus file or its embeddings changed on disk, or a corpus was added or removed"""
+        corpora = self.corpora
+        if set(self._corpus_files()) != set(corpora):
+            return True
+        # A corpus never read (its file was missing) changes once the file appears
+        return any(corpus.source_stamp() != corpus.loaded_stamp if corpus.loaded_stamp
+                   else os.path.exists(corpus.data_path) for corpus in corpora.values())
+
+    def reload(self, force: bool = False):
+        """
+        Re-read changed corpora into new KnowledgeBase objects, then swap the
+        whole corpora dict in with one assignment. Searches already running
+        keep the objects they selected and finish on the old index; new ones
+        see the new set. Unchanged corpora are carried over as-is (force=True
+        rebuilds all), and a corpus that fails to load keeps its old index.
+
+        Returns a summary: generation (bumped only when something was
+        swapped), reloaded / unchanged / failed / removed corpus names and
+        the build time.
+        """
+        with self._reload_lock:
+            started = time.perf_counter()
+            current = self.corpora
+            corpora, summary = {}, {"reloaded": [], "unchanged": [], "failed": []}
+            for name, path in self._corpus_files().items():
+                old = current.get(name)
+                if old is not None and old.is_loaded and not force and old.source_stamp() == old.loaded_stamp:
+                    corpora[name] = old
+                    summary["unchanged"].append(name)
+                    continue
+                corpus = self._new_corpus(name, path)
+                if corpus.load_data() or old is None or not old.is_loaded:
+                    corpora[name] = corpus
+                    summary["reloaded" if corpus.is_loaded else "failed"].append(name)
+                else:
+                    corpora[name] = old
+                    summary["failed"].append(name)
+            summary["removed"] = [name for name in current if name not in corpora]
+            if summary["reloaded"] or summary["removed"]:
+                self.corpora = corpora
+                self.generation += 1
+            summary["generation"] = self.generation
+            summary["seconds"] = round(time.perf_counter() - started, 3)
+            return summary
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.corpora
+
+    def load_all(self):
+        for corpus in self.corpora.values():
+            corpus.load_data()
+
+    def ensure_loaded(self):
+        for corpus in self.corpora.values():
+            corpus.ensure_loaded()
+
+    def select(self, names=None):
+        """Registered corpora among `names` (default: the handbook); unknown names are skipped"""
+        corpora = self.corpora
+        return [corpora[name] for name in (names or (DEFAULT_CORPUS,)) if name in corpora]
+
+    async def embed_query(self, query: str, names=None):
+        """{embedding model: query vector} for the selected semantic corpora, or None"""
+        vectors = {}
+        for corpus in self.select(names):
+            model = corpus.embedding_model
+            if model and model not in vectors:
+                vector = await corpus.embed_query(query)
+                if vector is not None:
+                    vectors[model] = vector
+        return vectors or None
+
+    def search(self, query: str, names=None, limit: int = 3, max_tokens: int = None, query_vectors=None):
+        """Timed wrapper around _search (metrics and the Server-Timing `rag` phase)"""
+        with metrics.KB_SEARCH_SECONDS.time(), timing.phase("rag"):
+            metrics.KB_SEARCHES.labels("inline").inc()
+            return self._search(query, names, limit, max_tokens, query_vectors)
+
+    def _search(self, query: str, names=None, limit: int = 3, max_tokens: int = None, query_vectors=None):
+        """
+        Search each selected corpus and merge by score. Keyword scores are
+        normalised BM25 (0..1) and hybrid scores fused ranks, so both compare
+        across corpora.
+        """
+        results = []
+        for corpus in self.select(names):
+            vector = (query_vectors or {}).get(corpus.embedding_model)
+            results.extend(corpus._search(query, limit, max_tokens, vector))
+        results.sort(key=lambda result: -result["score"])
+        return results[:limit]
+
+    def search_cost(self, query: str, names=None) -> int:
+        """
+        Keyword scan work for a query: passages x terms (the part that holds
+        the GIL). Corpora that already have the term set's ranking cached
+        add nothing - a hit only windows the top passages.
+        """
+        terms = query_terms(query)
+        return sum(len(corpus.passages) * max(len(terms), 1) for corpus in self.select(names)
+                   if not corpus.ranking_cached(terms))
+
+    async def search_async(self, query: str, names=None, limit: int = 3, max_tokens: int = None,
+                           query_vectors=None):
+        """
+        search() for async handlers. Cheap queries and cache hits (search_cost
+        up to RAG_INLINE_MAX_WORK) run inline - a hop to another thread costs
+        more than they do. Larger ones run on the search pool so the event
+        loop keeps serving other requests meanwhile.
+        """
+        if self.search_cost(query, names) <= settings.RAG_INLINE_MAX_WORK:
+            return self.search(query, names, limit, max_tokens, query_vectors)
+
+        executor, kind = _search_executor()
+        with metrics.KB_SEARCH_SECONDS.time(), timing.phase("rag"):
+            metrics.KB_SEARCHES.labels(kind).inc()
+            return await asyncio.get_running_loop().run_in_executor(
+                executor, _search_in_worker, query, names, limit, max_tokens, query_vectors
+            )
+
+
+# Singleton instance - use knowledge_bases.default for the handbook (reloads swap it)
+knowledge_bases = KnowledgeBaseRegistry()
+
+
+def _collect_cache_stats():
+    """
+    Expose keyword ranking cache counters on /metrics (hit rate = hits / lookups).
+    With RAG_SEARCH_EXECUTOR=process the offloaded searches use the workers'
+    own caches, which are not counted here.
+    """
+    caches = {name: corpus.ranking_cache for name, corpus in knowledge_bases.corpora.items()}
+    return [
+        ("zenguard_kb_cache_hits_total", "counter", "Keyword rankings served from the query term cache",
+         [({"corpus": name}, cache.hits) for name, cache in caches.items()]),
+        ("zenguard_kb_cache_lookups_total", "counter", "Keyword ranking cache lookups",
+         [({"corpus": name}, cache.hits + cache.misses) for name, cache in caches.items()]),
+        ("zenguard_kb_cache_entries", "gauge", "Term sets currently cached",
+         [({"corpus": name}, len(cache)) for name, cache in caches.items()]),
+    ]
+
+
+metrics.registry.register_collector(_collect_cache_stats)
+
+_executor = None
+
+
+def _search_in_worker(query, names, limit, max_tokens, query_vectors):
+    """Pool entry point - a process worker uses its own copy of the registry"""
+    return knowledge_bases._search(query, names, limit, max_tokens, query_vectors)
+
+
+def _init_worker():
+    knowledge_bases.ensure_loaded()
+
+
+def _search_executor():
+    """
+    (pool, kind) - created on first use. Threads share the loaded indexes
+    but pure-Python BM25 still holds the GIL, so they mainly keep the loop
+    responsive; processes (RAG_SEARCH_EXECUTOR=process) search in parallel
+    with their own copy of the corpora, loaded once per worker.
+    """
+    global _executor
+    kind = settings.RAG_SEARCH_EXECUTOR if settings.RAG_SEARCH_EXECUTOR in SEARCH_EXECUTORS else "thread"
+    if _executor is None:
+        workers = max(1, settings.RAG_SEARCH_WORKERS)
+        if kind == "process":
+            _executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker)
+        else:
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="kb-search")
+    return _executor, kind
+
+
+def shutdown_search_executor():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+def reload_knowledge_bases(force: bool = False):
+    """
+    knowledge_bases.reload(), then retire a process search pool: its workers
+    hold copies of the old corpora. Queued searches still finish there; the
+    next offloaded search starts a fresh pool that loads the new ones.
+    """
+    global _executor
+    summary = knowledge_bases.reload(force)
+    if summary["reloaded"] or summary["removed"]:
+        print(f"🔄 Knowledge base generation {summary['generation']}: reloaded "
+              f"{', '.join(summary['reloaded']) or 'none'}, removed {', '.join(summary['removed']) or 'none'} "
+              f"in {summary['seconds']}s")
+        if isinstance(_executor, ProcessPoolExecutor):
+            retired, _executor = _executor, None
+            retired.shutdown(wait=False)
+    return summary
+
+
+async def watch_knowledge_bases(interval: float):
+    """Poll corpus files every `interval` seconds and reload in the background when they change"""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            if await asyncio.to_thread(knowledge_bases.changed):
+                await asyncio.to_thread(reload_knowledge_bases)
+        except Exception as e:
+            print(f"❌ Knowledge base reload failed: {e}")
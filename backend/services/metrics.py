@@ -0,0 +1,311 @@
+"""
+Metrics - Content-free runtime telemetry in Prometheus text format
+Served at GET /metrics when ENABLE_METRICS is on
+
+A minimal in-process registry (Counter, Gauge, Histogram) so no extra
+dependency is needed. Hot paths record with one dict lookup and a few
+additions.
+
+PRIVACY: Metrics carry durations, counts and route templates only. Label
+values are fixed identifiers (route templates, endpoint names, reasons) -
+never user text, session IDs or raw paths - so this stays compatible with
+ENABLE_LOGGING=False.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+# Seconds - sized for local LLM calls (sub-ms quick checks up to multi-minute generations)
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+FAST_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25)
+TOKEN_BUCKETS = (16, 32, 64, 128, 256, 512, 1024, 2048, 4096, 8192)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._children: Dict[Tuple[str, ...], Any] = {}
+
+    def labels(self, *values: str):
+        key = tuple(str(v) for v in values)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def _default(self):
+        return self.labels()
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for key, child in sorted(self._children.items()):
+            lines.extend(self._render_child(key, child))
+        return lines
+
+    def _render_child(self, key, child) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(child.value)}"]
+
+
+class _Value:
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0):
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value: float):
+        self.value = value
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self):
+        return _Value()
+
+    def inc(self, amount: float = 1.0):
+        self._default().inc(amount)
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def _new_child(self):
+        return _Value()
+
+    def inc(self, amount: float = 1.0):
+        self._default().inc(amount)
+
+    def dec(self, amount: float = 1.0):
+        self._default().dec(amount)
+
+    def set(self, value: float):
+        self._default().set(value)
+
+
+class _HistogramValue:
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        with self._lock:
+            self.sum += value
+            self.count += 1
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    self.counts[i] += 1
+                    break
+
+    @contextmanager
+    def time(self):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self):
+        return _HistogramValue(self.buckets)
+
+    def observe(self, value: float):
+        self._default().observe(value)
+
+    def time(self):
+        return self._default().time()
+
+    def _render_child(self, key, child) -> List[str]:
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, child.counts):
+            cumulative += count
+            labels = _format_labels(self.labelnames, key, f'le="{_format_value(bound)}"')
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+        labels = _format_labels(self.labelnames, key, 'le="+Inf"')
+        lines.append(f"{self.name}_bucket{labels} {child.count}")
+        plain = _format_labels(self.labelnames, key)
+        lines.append(f"{self.name}_sum{plain} {_format_value(child.sum)}")
+        lines.append(f"{self.name}_count{plain} {child.count}")
+        return lines
+
+
+# A collector returns (name, kind, help, [(labels dict, value)]) families at scrape time
+Collector = Callable[[], List[Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]]]
+
+
+class MetricsRegistry:
+    """Holds metrics and scrape-time collectors, renders the text exposition format"""
+
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+        self._collectors: List[Collector] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def register_collector(self, collector: Collector):
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for collector in self._collectors:
+            for name, kind, documentation, samples in collector():
+                lines.append(f"# HELP {name} {documentation}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in samples:
+                    lines.append(f"{name}{_format_labels(list(labels), list(labels.values()))} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+# ===== HTTP =====
+HTTP_REQUEST_SECONDS = registry.register(Histogram(
+    "zenguard_http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"]
+))
+HTTP_IN_FLIGHT = registry.register(Gauge(
+    "zenguard_http_requests_in_flight",
+    "HTTP requests currently being served"
+))
+
+# ===== OLLAMA =====
+OLLAMA_REQUEST_SECONDS = registry.register(Histogram(
+    "zenguard_ollama_request_duration_seconds",
+    "Upstream Ollama call latency by call site",
+    ["endpoint", "outcome"]
+))
+OLLAMA_IN_FLIGHT = registry.register(Gauge(
+    "zenguard_ollama_requests_in_flight",
+    "Upstream Ollama calls currently waiting (queue depth towards the model)"
+))
+OLLAMA_PROMPT_TOKENS = registry.register(Histogram(
+    "zenguard_ollama_prompt_tokens",
+    "Prompt tokens evaluated per Ollama call",
+    ["endpoint"], TOKEN_BUCKETS
+))
+OLLAMA_GENERATED_TOKENS = registry.register(Histogram(
+    "zenguard_ollama_generated_tokens",
+    "Tokens generated per Ollama call",
+    ["endpoint"], TOKEN_BUCKETS
+))
+OLLAMA_PREFILL_SECONDS = registry.register(Histogram(
+    "zenguard_ollama_prefill_seconds",
+    "Ollama prompt evaluation time (prompt_eval_duration)",
+    ["endpoint"]
+))
+OLLAMA_GENERATION_SECONDS = registry.register(Histogram(
+    "zenguard_ollama_generation_seconds",
+    "Ollama token generation time (eval_duration)",
+    ["endpoint"]
+))
+
+# ===== LOCAL STAGES =====
+KB_SEARCH_SECONDS = registry.register(Histogram(
+    "zenguard_kb_search_duration_seconds",
+    "Knowledge base search time",
+    buckets=FAST_BUCKETS
+))
+KB_SEARCHES = registry.register(Counter(
+    "zenguard_kb_searches_total",
+    "Knowledge base searches by where they ran (inline on the event loop, thread or process pool)",
+    ["executor"]
+))
+RAG_INJECTIONS = registry.register(Counter(
+    "zenguard_rag_injections_total",
+    "Chat turns by knowledge base outcome (injected, below_threshold, no_match, short_message, disabled)",
+    ["outcome"]
+))
+RAG_CONTEXT_TOKENS = registry.register(Histogram(
+    "zenguard_rag_context_tokens",
+    "Estimated prompt tokens added by an injected knowledge base reference",
+    buckets=TOKEN_BUCKETS
+))
+BATCH_ANALYSIS_SECONDS = registry.register(Histogram(
+    "zenguard_batch_analysis_duration_seconds",
+    "Full /api/analyze/batch time to the last streamed line (the HTTP histogram stops at the headers)",
+    ["outcome"]
+))
+OBFUSCATION_SECONDS = registry.register(Histogram(
+    "zenguard_obfuscation_duration_seconds",
+    "Server-side PII obfuscation time",
+    buckets=FAST_BUCKETS
+))
+
+# ===== QUALITY =====
+JSON_PARSE_FAILURES = registry.register(Counter(
+    "zenguard_json_parse_failures_total",
+    "Model outputs that were not valid JSON (recovered = salvaged by extraction)",
+    ["source", "outcome"]
+))
+DEGRADED_RESPONSES = registry.register(Counter(
+    "zenguard_degraded_responses_total",
+    "Responses served from defaults or fallbacks instead of model output",
+    ["endpoint", "reason"]
+))
+
+
+def record_ollama_call(endpoint: Optional[str], seconds: float, response: Optional[Dict[str, Any]] = None):
+    """One upstream call - latency always, token/phase split when Ollama reported it"""
+    endpoint = endpoint or "other"
+    OLLAMA_REQUEST_SECONDS.labels(endpoint, "ok" if response is not None else "error").observe(seconds)
+    if response is None:
+        return
+    if response.get("prompt_eval_count") is not None:
+        OLLAMA_PROMPT_TOKENS.labels(endpoint).observe(response["prompt_eval_count"])
+    if response.get("eval_count") is not None:
+        OLLAMA_GENERATED_TOKENS.labels(endpoint).observe(response["eval_count"])
+    if response.get("prompt_eval_duration"):
+        OLLAMA_PREFILL_SECONDS.labels(endpoint).observe(response["prompt_eval_duration"] / 1e9)
+    if response.get("eval_duration"):
+        OLLAMA_GENERATION_SECONDS.labels(endpoint).observe(response["eval_duration"] / 1e9)
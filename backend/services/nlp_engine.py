@@ -13,7 +13,14 @@ ENHANCED FEATURES:
 from typing import Dict, List, Tuple, Optional
 import re
 import base64
+from services import metrics, timing
 from services.ollama_client import OllamaClient
+from services.token_policy import (
+    token_policy,
+    reasoning_enabled,
+    without_reasoning,
+    NO_REASONING_DIRECTIVE
+)
 from models.schemas import Emotion, EmotionType, MaskingIndicator
 
 
@@ -116,6 +123,30 @@ Then output JSON:
 }"""
 
 
+# Word lists for the local (no AI) pattern checks - built once, not per call
+REPETITION_STOP_WORDS = frozenset({
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
+    'of', 'with', 'by', 'is', 'are', 'was', 'were', 'be', 'been', 'being',
+    'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could',
+    'should', 'may', 'might', 'must', 'it', 'its', 'this', 'that', 'these',
+    'those', 'i', 'me', 'my', 'myself', 'we', 'our', 'you', 'your', 'he',
+    'she', 'they', 'them', 'what', 'which', 'who', 'when', 'where', 'why',
+    'how', 'all', 'each', 'every', 'both', 'few', 'more', 'most', 'other',
+    'some', 'such', 'no', 'not', 'only', 'own', 'same', 'so', 'than', 'too',
+    'very', 'just', 'can', 'im', "i'm", 'dont', "don't", 'cant', "can't"
+})
+SHIFT_POSITIVE_WORDS = frozenset({
+    'happy', 'good', 'great', 'better', 'best', 'love', 'wonderful',
+    'amazing', 'excited', 'hopeful', 'grateful', 'thankful', 'joy',
+    'blessed', 'peaceful', 'calm', 'relaxed', 'confident', 'proud'
+})
+SHIFT_NEGATIVE_WORDS = frozenset({
+    'sad', 'bad', 'worse', 'worst', 'hate', 'terrible', 'awful',
+    'anxious', 'worried', 'scared', 'angry', 'frustrated', 'alone',
+    'lonely', 'tired', 'exhausted', 'stressed', 'overwhelmed', 'hopeless'
+})
+
+
 class NLPEngine:
     """Main NLP engine with Chain-of-Thought reasoning and multimodal support
     
@@ -155,7 +186,7 @@ CRITICAL: The 'support_message' MUST be unique to this specific situation.
             prompt=prompt,
             system_prompt=SENTIMENT_SYSTEM_PROMPT,
             temperature=0.7,  # Increased for variety
-            max_tokens=256
+            **token_policy("sentiment")  # Stops at the closing brace
         )
         
         # PRIVACY: Session context storage DISABLED
@@ -164,7 +195,10 @@ CRITICAL: The 'support_message' MUST be unique to this specific situation.
         #     ... storage removed for privacy ...
         
         # Parse response (extract JSON after <think> tags)
-        result = self._parse_reasoning_response(response)
+        with timing.phase("postprocess"):
+            result = self._parse_reasoning_response(response, source="sentiment")
+        if not result:
+            metrics.DEGRADED_RESPONSES.labels("sentiment", "unparsed").inc()
         
         try:
             primary_emotion = self._parse_emotion_type(
@@ -191,6 +225,7 @@ CRITICAL: The 'support_message' MUST be unique to this specific situation.
                 "support_message": result.get("support_message", "You're doing great by expressing yourself.")
             }
         except Exception:
+            metrics.DEGRADED_RESPONSES.labels("sentiment", "error").inc()
             return self._default_sentiment_result()
     
     async def analyze_session_trends(self, session_id: str) -> Dict:
@@ -214,15 +249,23 @@ CRITICAL: The 'support_message' MUST be unique to this specific situation.
 ---
 
 Use <think> tags to reason through any discrepancies you notice."""
+        system_prompt = MASKING_SYSTEM_PROMPT
+        
+        if not reasoning_enabled("masking"):
+            prompt = without_reasoning(prompt)
+            system_prompt = f"{without_reasoning(system_prompt)}\n\n{NO_REASONING_DIRECTIVE}"
 
         response = await self.client.generate(
             prompt=prompt,
-            system_prompt=MASKING_SYSTEM_PROMPT,
+            system_prompt=system_prompt,
             temperature=0.2,
-            max_tokens=1024
+            **token_policy("masking")
         )
         
-        result = self._parse_reasoning_response(response)
+        with timing.phase("postprocess"):
+            result = self._parse_reasoning_response(response, source="masking")
+        if not result:
+            metrics.DEGRADED_RESPONSES.labels("masking", "unparsed").inc()
         
         try:
             detected = result.get("masking_detected", False)
@@ -241,6 +284,7 @@ Use <think> tags to reason through any discrepancies you notice."""
             else:
                 return MaskingIndicator(detected=False)
         except Exception:
+            metrics.DEGRADED_RESPONSES.labels("masking", "error").inc()
             return MaskingIndicator(detected=False)
     
     async def analyze_visual_mood(self, image_base64: str) -> Dict:
@@ -255,15 +299,24 @@ Use <think> tags to reason through any discrepancies you notice."""
         prompt = """Analyze this mood doodle or visual expression for emotional content.
 
 Use <think> tags to reason about the visual cues you observe before providing your analysis."""
+        system_prompt = VISUAL_MOOD_PROMPT
+        
+        if not reasoning_enabled("visual"):
+            prompt = without_reasoning(prompt)
+            system_prompt = f"{without_reasoning(system_prompt)}\n\n{NO_REASONING_DIRECTIVE}"
 
         response = await self.client.generate_multimodal(
             prompt=prompt,
             image_base64=image_base64,
-            system_prompt=VISUAL_MOOD_PROMPT,
-            temperature=0.3
+            system_prompt=system_prompt,
+            temperature=0.3,
+            **token_policy("visual")
         )
         
-        result = self._parse_reasoning_response(response)
+        with timing.phase("postprocess"):
+            result = self._parse_reasoning_response(response, source="visual")
+        if not result:
+            metrics.DEGRADED_RESPONSES.labels("visual", "unparsed").inc()
         
         return {
             "visual_emotion": result.get("visual_emotion", "neutral"),
@@ -278,18 +331,7 @@ Use <think> tags to reason about the visual cues you observe before providing yo
     def analyze_repetition(self, text: str) -> Tuple[bool, List[str]]:
         """Detect repetitive words/phrases indicating rumination"""
         words = text.lower().split()
-        
-        stop_words = {
-            'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
-            'of', 'with', 'by', 'is', 'are', 'was', 'were', 'be', 'been', 'being',
-            'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could',
-            'should', 'may', 'might', 'must', 'it', 'its', 'this', 'that', 'these',
-            'those', 'i', 'me', 'my', 'myself', 'we', 'our', 'you', 'your', 'he',
-            'she', 'they', 'them', 'what', 'which', 'who', 'when', 'where', 'why',
-            'how', 'all', 'each', 'every', 'both', 'few', 'more', 'most', 'other',
-            'some', 'such', 'no', 'not', 'only', 'own', 'same', 'so', 'than', 'too',
-            'very', 'just', 'can', 'im', "i'm", 'dont', "don't", 'cant', "can't"
-        }
+        stop_words = REPETITION_STOP_WORDS
         
         word_counts = {}
         for word in words:
@@ -322,30 +364,16 @@ Use <think> tags to reason about the visual cues you observe before providing yo
             return None
         
         mid = len(words) // 2
-        first_half = ' '.join(words[:mid])
-        second_half = ' '.join(words[mid:])
         
-        positive_words = {
-            'happy', 'good', 'great', 'better', 'best', 'love', 'wonderful',
-            'amazing', 'excited', 'hopeful', 'grateful', 'thankful', 'joy',
-            'blessed', 'peaceful', 'calm', 'relaxed', 'confident', 'proud'
-        }
-        negative_words = {
-            'sad', 'bad', 'worse', 'worst', 'hate', 'terrible', 'awful',
-            'anxious', 'worried', 'scared', 'angry', 'frustrated', 'alone',
-            'lonely', 'tired', 'exhausted', 'stressed', 'overwhelmed', 'hopeless'
-        }
-        
-        def score_section(section: str) -> float:
-            section_words = section.lower().split()
-            pos = sum(1 for w in section_words if w in positive_words)
-            neg = sum(1 for w in section_words if w in negative_words)
+        def score_section(section_words: List[str]) -> float:
+            pos = sum(1 for w in section_words if w.lower() in SHIFT_POSITIVE_WORDS)
+            neg = sum(1 for w in section_words if w.lower() in SHIFT_NEGATIVE_WORDS)
             if pos + neg == 0:
                 return 0
             return (pos - neg) / (pos + neg)
         
-        first_score = score_section(first_half)
-        second_score = score_section(second_half)
+        first_score = score_section(words[:mid])
+        second_score = score_section(words[mid:])
         diff = second_score - first_score
         
         if diff > 0.3:
@@ -359,10 +387,13 @@ Use <think> tags to reason about the visual cues you observe before providing yo
         """DISABLED: No session data is stored, so nothing to clear"""
         pass  # No-op - we don't store anything
     
-    def _parse_reasoning_response(self, response: str) -> Dict:
+    def _parse_reasoning_response(self, response: str, source: str = "reasoning") -> Dict:
         """
         Parse response that may contain <think> tags followed by JSON
         Extracts the reasoning and the final JSON output
+        
+        Args:
+            source: Call site name for the JSON parse failure metric
         """
         import json
         
@@ -380,6 +411,10 @@ Use <think> tags to reason about the visual cues you observe before providing yo
             cleaned = cleaned[:-3]
         cleaned = cleaned.strip()
         
+        # A "}" stop sequence ends generation just before the closing brace
+        if cleaned.startswith("{") and not cleaned.endswith("}"):
+            cleaned += "}"
+        
         try:
             return json.loads(cleaned)
         except json.JSONDecodeError:
@@ -387,9 +422,12 @@ Use <think> tags to reason about the visual cues you observe before providing yo
             json_match = re.search(r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}', cleaned, re.DOTALL)
             if json_match:
                 try:
-                    return json.loads(json_match.group())
+                    result = json.loads(json_match.group())
+                    metrics.JSON_PARSE_FAILURES.labels(source, "recovered").inc()
+                    return result
                 except json.JSONDecodeError:
                     pass
+            metrics.JSON_PARSE_FAILURES.labels(source, "failed").inc()
             return {}
     
     def _default_sentiment_result(self) -> Dict:
@@ -3,10 +3,143 @@ Ollama Client - Interface to local Gemma 3:4B model
 Handles all communication with the Ollama API
 """
 
+import asyncio
+import hashlib
 import httpx
+import itertools
 import json
-from typing import Optional, Dict, Any
+import time
+from collections import deque
+from typing import Optional, Dict, Any, List, Tuple
 from config import settings
+from services import metrics, timing
+from services.token_policy import token_usage
+
+
+class HedgePolicy:
+    """
+    Decides when an interactive request should be hedged to a second backend.
+    
+    Keeps a rolling window of first-token latencies and hedges once the
+    primary backend is slower than the configured percentile.
+    Only durations are recorded - never prompts or responses.
+    """
+    
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self._first_token_samples = deque(maxlen=window)
+        self._min_samples = min_samples
+        self.requests = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+    
+    def record_first_token(self, seconds: float):
+        self._first_token_samples.append(seconds)
+    
+    def delay(self) -> float:
+        """Seconds to wait for a first token before issuing the hedge"""
+        if len(self._first_token_samples) < self._min_samples:
+            return settings.HEDGE_INITIAL_DELAY
+        samples = sorted(self._first_token_samples)
+        index = min(len(samples) - 1, int(len(samples) * settings.HEDGE_PERCENTILE))
+        return max(settings.HEDGE_MIN_DELAY, samples[index])
+    
+    @property
+    def hedge_rate(self) -> float:
+        return self.hedged / self.requests if self.requests else 0.0
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+            "hedge_rate": round(self.hedge_rate, 4),
+            "current_delay": round(self.delay(), 3)
+        }
+
+
+class SingleFlight:
+    """
+    Coalesces identical in-flight requests into one upstream call.
+    
+    Callers are keyed by a hash of the full request. This is NOT a cache:
+    the entry is dropped the moment the upstream call completes, so no
+    prompt or response outlives the requests that asked for it.
+    
+    The upstream call is cancelled when its last waiter leaves (client
+    disconnect, losing hedge), so nobody holds an Ollama slot for nothing.
+    """
+    
+    def __init__(self):
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._waiters: Dict[asyncio.Future, int] = {}
+        self.calls = 0
+        self.coalesced = 0
+    
+    @staticmethod
+    def key(*parts: Any) -> str:
+        return hashlib.sha256(
+            json.dumps(parts, sort_keys=True, ensure_ascii=False).encode("utf-8")
+        ).hexdigest()
+    
+    def _release(self, key: str, future: asyncio.Future):
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+        # Mark the error as retrieved even if every caller was cancelled
+        if not future.cancelled():
+            future.exception()
+    
+    async def do(self, key: str, factory) -> Any:
+        self.calls += 1
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(factory())
+            self._inflight[key] = future
+            future.add_done_callback(lambda f: self._release(key, f))
+        else:
+            self.coalesced += 1
+        self._waiters[future] = self._waiters.get(future, 0) + 1
+        try:
+            # Shield so one cancelled caller doesn't cancel the shared call for the rest
+            return await asyncio.shield(future)
+        finally:
+            self._waiters[future] -= 1
+            if not self._waiters[future]:
+                del self._waiters[future]
+                if not future.done():  # Last waiter gone - stop the generation
+                    if self._inflight.get(key) is future:  # New callers start afresh, not join it
+                        del self._inflight[key]
+                    future.cancel()
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._inflight)
+        }
+
+
+# Shared across all clients - each router creates its own OllamaClient
+hedge_policy = HedgePolicy()
+single_flight = SingleFlight()
+_hedge_url_cycle = itertools.cycle(settings.ollama_hedge_urls_list or [settings.OLLAMA_BASE_URL])
+
+
+def _collect_client_stats():
+    """Expose hedging and coalescing counters on /metrics"""
+    hedge = hedge_policy.stats()
+    flight = single_flight.stats()
+    return [
+        ("zenguard_hedge_requests_total", "counter", "Interactive requests eligible for hedging", [({}, hedge["requests"])]),
+        ("zenguard_hedged_requests_total", "counter", "Requests that issued a hedge", [({}, hedge["hedged"])]),
+        ("zenguard_hedge_wins_total", "counter", "Hedges that answered first", [({}, hedge["hedge_wins"])]),
+        ("zenguard_hedge_delay_seconds", "gauge", "Current first-token wait before hedging", [({}, hedge["current_delay"])]),
+        ("zenguard_singleflight_calls_total", "counter", "Ollama calls through request coalescing", [({}, flight["calls"])]),
+        ("zenguard_singleflight_coalesced_total", "counter", "Calls served by an identical in-flight request", [({}, flight["coalesced"])]),
+        ("zenguard_singleflight_in_flight", "gauge", "Distinct upstream generations in flight", [({}, flight["in_flight"])]),
+    ]
+
+
+metrics.registry.register_collector(_collect_client_stats)
 
 
 class OllamaClient:
@@ -14,6 +147,7 @@ class OllamaClient:
     
     def __init__(self):
         self.base_url = settings.OLLAMA_BASE_URL
+        self.hedge_urls = settings.ollama_hedge_urls_list
         self.model = settings.OLLAMA_MODEL
         self.timeout = httpx.Timeout(300.0, connect=10.0)  # 5 min for slow hardware/large tasks
         self.fast_timeout = httpx.Timeout(60.0, connect=5.0)  # 1 min for quick checks
@@ -32,27 +166,15 @@ class OllamaClient:
         except Exception:
             return False
     
-    async def generate(
+    def chat_payload(
         self,
         prompt: str,
         system_prompt: Optional[str] = None,
         temperature: float = 0.3,
-        max_tokens: int = 512,  # Reduced for faster responses
-        fast: bool = False
-    ) -> str:
-        """
-        Generate a response from Gemma 3:4B
-        
-        Args:
-            prompt: The user prompt
-            system_prompt: Optional system instructions
-            temperature: Lower = more focused, higher = more creative
-            max_tokens: Maximum response length
-            fast: Use faster timeout for quick responses
-            
-        Returns:
-            Generated text response
-        """
+        max_tokens: int = 512,
+        stop: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """Non-streaming /api/chat request body (also used by the benchmarks)"""
         messages = []
         
         if system_prompt:
@@ -72,18 +194,52 @@ class OllamaClient:
                 "top_k": 40              # Standard sampling
             }
         }
+        if stop:
+            payload["options"]["stop"] = stop
+        return payload
+    
+    async def generate(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.3,
+        max_tokens: int = 512,  # Reduced for faster responses
+        fast: bool = False,
+        hedge: bool = False,
+        stop: Optional[List[str]] = None,
+        endpoint: Optional[str] = None
+    ) -> str:
+        """
+        Generate a response from Gemma 3:4B
         
+        Args:
+            prompt: The user prompt
+            system_prompt: Optional system instructions
+            temperature: Lower = more focused, higher = more creative
+            max_tokens: Maximum response length
+            fast: Use faster timeout for quick responses
+            hedge: Allow a duplicate request to a second backend if the first
+                is slow to produce a token (short interactive calls only)
+            stop: Stop sequences that end generation early
+            endpoint: Call site name for per-endpoint token stats
+            
+        Returns:
+            Generated text response
+        """
+        payload = self.chat_payload(prompt, system_prompt, temperature, max_tokens, stop)
         timeout = self.fast_timeout if fast else self.timeout
         
+        async def fetch() -> Dict[str, Any]:
+            if hedge and settings.ENABLE_HEDGING and self.hedge_urls:
+                return await self._measured(endpoint, self._hedged_chat(payload, timeout))
+            return await self._measured(endpoint, self._post_chat(payload, timeout))
+        
         try:
-            async with httpx.AsyncClient(timeout=timeout) as client:
-                response = await client.post(
-                    f"{self.base_url}/api/chat",
-                    json=payload
-                )
-                response.raise_for_status()
-                data = response.json()
-                return data.get("message", {}).get("content", "")
+            started = time.perf_counter()
+            data = await self._coalesced(payload, fetch)
+            # Recorded per caller - coalesced callers share the upstream phases
+            timing.record_ollama(time.perf_counter() - started, data)
+            return data.get("message", {}).get("content", "")
         except httpx.TimeoutException:
             raise Exception("Ollama request timed out. Is the model loaded?")
         except httpx.HTTPStatusError as e:
@@ -91,6 +247,158 @@ class OllamaClient:
         except Exception as e:
             raise Exception(f"Failed to connect to Ollama: {str(e)}")
     
+    async def _post_chat(self, payload: Dict[str, Any], timeout: httpx.Timeout) -> Dict[str, Any]:
+        """Single non-streaming chat request against the primary backend"""
+        async with httpx.AsyncClient(timeout=timeout) as client:
+            response = await client.post(
+                f"{self.base_url}/api/chat",
+                json=payload
+            )
+            response.raise_for_status()
+            return response.json()
+    
+    async def _measured(self, endpoint: Optional[str], call) -> Dict[str, Any]:
+        """Await one upstream call, recording latency, queue depth and token usage"""
+        metrics.OLLAMA_IN_FLIGHT.inc()
+        started = time.perf_counter()
+        try:
+            data = await call
+        except BaseException:
+            metrics.record_ollama_call(endpoint, time.perf_counter() - started)
+            raise
+        finally:
+            metrics.OLLAMA_IN_FLIGHT.dec()
+        metrics.record_ollama_call(endpoint, time.perf_counter() - started, data)
+        token_usage.record(endpoint, data)
+        return data
+    
+    async def _coalesced(self, payload: Dict[str, Any], fetch) -> Dict[str, Any]:
+        """Share one upstream generation between concurrent identical requests"""
+        if not settings.ENABLE_COALESCING:
+            return await fetch()
+        key = single_flight.key(self.base_url, payload)
+        return await single_flight.do(key, fetch)
+    
+    async def _stream_chat(
+        self,
+        base_url: str,
+        payload: Dict[str, Any],
+        timeout: httpx.Timeout,
+        first_token: asyncio.Event
+    ) -> Dict[str, Any]:
+        """
+        Run a streaming chat request and reassemble it into the
+        non-streaming response shape. Sets `first_token` as soon as
+        the backend produces content.
+        """
+        started = time.perf_counter()
+        parts: List[str] = []
+        final: Dict[str, Any] = {}
+        
+        async with httpx.AsyncClient(timeout=timeout) as client:
+            async with client.stream(
+                "POST",
+                f"{base_url}/api/chat",
+                json={**payload, "stream": True}
+            ) as response:
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    if not line.strip():
+                        continue
+                    chunk = json.loads(line)
+                    content = chunk.get("message", {}).get("content", "")
+                    if content:
+                        if not first_token.is_set():
+                            hedge_policy.record_first_token(time.perf_counter() - started)
+                            first_token.set()
+                        parts.append(content)
+                    if chunk.get("done"):
+                        final = chunk
+                        break
+        
+        final["message"] = {"role": "assistant", "content": "".join(parts)}
+        return final
+    
+    async def _hedged_chat(self, payload: Dict[str, Any], timeout: httpx.Timeout) -> Dict[str, Any]:
+        """
+        Send the request to the primary backend and, if no token arrives
+        within the hedge delay, duplicate it to a second backend.
+        Whichever backend produces a token first wins; the other is cancelled
+        as soon as the winner is known, not when the winner finishes.
+        """
+        attempts: List[Tuple[asyncio.Task, asyncio.Event]] = []
+        
+        def launch(base_url: str):
+            first_token = asyncio.Event()
+            task = asyncio.create_task(self._stream_chat(base_url, payload, timeout, first_token))
+            attempts.append((task, first_token))
+        
+        hedge_policy.requests += 1
+        launch(self.base_url)
+        
+        try:
+            winner = await self._first_responder(attempts, timeout=hedge_policy.delay())
+            if winner is None:
+                hedge_policy.hedged += 1
+                launch(next(_hedge_url_cycle))
+                winner = await self._first_responder(attempts)
+                if winner == 1:
+                    hedge_policy.hedge_wins += 1
+            # Stop the loser now - it would otherwise keep generating (and
+            # report its late first token) for the whole of the winner's reply
+            for index, (task, _) in enumerate(attempts):
+                if index != winner and not task.done():
+                    task.cancel()
+            return await attempts[winner][0]
+        finally:
+            for task, _ in attempts:
+                if not task.done():
+                    task.cancel()
+    
+    @staticmethod
+    async def _first_responder(
+        attempts: List[Tuple[asyncio.Task, asyncio.Event]],
+        timeout: Optional[float] = None
+    ) -> Optional[int]:
+        """
+        Wait until one attempt produces a first token or finishes successfully.
+        
+        Returns the index of that attempt, or None if `timeout` elapsed first.
+        Raises the primary's error if every attempt failed.
+        """
+        signals: Dict[asyncio.Future, int] = {}
+        for index, (task, first_token) in enumerate(attempts):
+            if first_token.is_set() or (task.done() and not task.exception()):
+                return index
+            if not task.done():
+                signals[task] = index
+                signals[asyncio.ensure_future(first_token.wait())] = index
+        
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        pending = set(signals)
+        try:
+            while pending:
+                remaining = None if deadline is None else max(0.0, deadline - loop.time())
+                done, pending = await asyncio.wait(
+                    pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    return None
+                for future in done:
+                    index = signals[future]
+                    task = attempts[index][0]
+                    if future is task and task.exception() is not None:
+                        # Failed before producing a token - stop watching it
+                        pending = {f for f in pending if signals[f] != index}
+                        continue
+                    return index
+            raise attempts[0][0].exception()
+        finally:
+            for future, index in signals.items():
+                if future is not attempts[index][0]:
+                    future.cancel()
+    
     async def generate_json(
         self,
         prompt: str,
@@ -130,10 +438,13 @@ IMPORTANT: You MUST respond with valid JSON only. No markdown, no explanations,
             json_match = re.search(r'\{[^{}]*\}', cleaned, re.DOTALL)
             if json_match:
                 try:
-                    return json.loads(json_match.group())
+                    result = json.loads(json_match.group())
+                    metrics.JSON_PARSE_FAILURES.labels("generate_json", "recovered").inc()
+                    return result
                 except json.JSONDecodeError:
                     pass
             # Return empty dict if parsing fails
+            metrics.JSON_PARSE_FAILURES.labels("generate_json", "failed").inc()
             return {}
     
     async def generate_multimodal(
@@ -142,7 +453,9 @@ IMPORTANT: You MUST respond with valid JSON only. No markdown, no explanations,
         image_base64: str,
         system_prompt: Optional[str] = None,
         temperature: float = 0.3,
-        max_tokens: int = 1024
+        max_tokens: int = 1024,
+        stop: Optional[List[str]] = None,
+        endpoint: Optional[str] = None
     ) -> str:
         """
         Generate a response analyzing an image with Gemma 3:4B's vision capabilities
@@ -153,6 +466,8 @@ IMPORTANT: You MUST respond with valid JSON only. No markdown, no explanations,
             system_prompt: Optional system instructions
             temperature: Model temperature
             max_tokens: Maximum response length
+            stop: Stop sequences that end generation early
+            endpoint: Call site name for per-endpoint token stats
             
         Returns:
             Generated text response
@@ -178,19 +493,53 @@ IMPORTANT: You MUST respond with valid JSON only. No markdown, no explanations,
                 "num_predict": max_tokens
             }
         }
+        if stop:
+            payload["options"]["stop"] = stop
+        
+        async def fetch() -> Dict[str, Any]:
+            return await self._measured(endpoint, self._post_chat(payload, self.timeout))
         
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    f"{self.base_url}/api/chat",
-                    json=payload
-                )
-                response.raise_for_status()
-                data = response.json()
-                return data.get("message", {}).get("content", "")
+            started = time.perf_counter()
+            data = await self._coalesced(payload, fetch)
+            # Recorded per caller - coalesced callers share the upstream phases
+            timing.record_ollama(time.perf_counter() - started, data)
+            return data.get("message", {}).get("content", "")
         except httpx.TimeoutException:
             raise Exception("Ollama multimodal request timed out.")
         except httpx.HTTPStatusError as e:
             raise Exception(f"Ollama API error: {e.response.status_code}")
         except Exception as e:
             raise Exception(f"Failed multimodal request: {str(e)}")
+    
+    async def embed(
+        self,
+        texts: List[str],
+        model: Optional[str] = None,
+        endpoint: Optional[str] = "embed"
+    ) -> List[List[float]]:
+        """
+        Embed texts with Ollama's /api/embed (one vector per input, same order)
+        
+        Args:
+            texts: Inputs to embed in one batch
+            model: Embedding model (default: OLLAMA_EMBED_MODEL)
+            endpoint: Call site name for metrics
+        """
+        payload = {"model": model or settings.OLLAMA_EMBED_MODEL, "input": texts}
+        
+        async def post() -> Dict[str, Any]:
+            async with httpx.AsyncClient(timeout=self.fast_timeout) as client:
+                response = await client.post(f"{self.base_url}/api/embed", json=payload)
+                response.raise_for_status()
+                return response.json()
+        
+        try:
+            data = await self._measured(endpoint, post())
+            return data.get("embeddings", [])
+        except httpx.TimeoutException:
+            raise Exception("Ollama embedding request timed out.")
+        except httpx.HTTPStatusError as e:
+            raise Exception(f"Ollama API error: {e.response.status_code}")
+        except Exception as e:
+            raise Exception(f"Failed embedding request: {str(e)}")
@@ -0,0 +1,96 @@
+"""
+Sampling Profiler - Time-bounded stack sampling of the running API process
+Output is flamegraph-compatible collapsed stacks ("a;b;c 42" per line)
+
+Two modes:
+- wall: a background thread snapshots every thread's stack with
+  sys._current_frames() at a fixed interval (sees I/O waits and idle loops)
+- cpu:  SIGPROF fires per unit of process CPU time and records the main
+  thread's stack - where the event loop burns CPU (Unix, main thread only)
+
+PRIVACY: Only code locations (file, function) are recorded - never frame
+locals, arguments or request bodies.
+"""
+
+import os
+import signal
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Optional
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    # co_qualname (Class.method) is Python 3.11+; 3.10 only has the bare name
+    return f"{getattr(code, 'co_qualname', code.co_name)} ({os.path.basename(code.co_filename)})"
+
+
+def _collapse(frame, prefix: str = "") -> str:
+    """Root-first, semicolon-joined stack for one frame"""
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    labels.reverse()
+    stack = ";".join(labels)
+    return f"{prefix};{stack}" if prefix else stack
+
+
+def render_collapsed(samples: Counter) -> str:
+    return "".join(f"{stack} {count}\n" for stack, count in samples.most_common())
+
+
+class SamplingProfiler:
+    """One profile at a time; concurrent requests are refused, not queued"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+    @property
+    def busy(self) -> bool:
+        return self._lock.locked()
+
+    def try_acquire(self) -> bool:
+        return self._lock.acquire(blocking=False)
+
+    def release(self):
+        self._lock.release()
+
+    def sample_wall(self, seconds: float, interval: float) -> Counter:
+        """Blocking - run in a worker thread. Samples every thread except itself."""
+        samples: Counter = Counter()
+        me = threading.get_ident()
+        names = {t.ident: t.name for t in threading.enumerate()}
+        deadline = time.monotonic() + seconds
+        while time.monotonic() < deadline:
+            for ident, frame in sys._current_frames().items():
+                if ident != me:
+                    samples[_collapse(frame, names.get(ident, f"thread-{ident}"))] += 1
+            time.sleep(interval)
+        return samples
+
+    def start_cpu(self, interval: float) -> Optional[Counter]:
+        """
+        Install the SIGPROF sampler (must be called from the main thread).
+        Returns the live sample counter, or None if unsupported here.
+        """
+        if not hasattr(signal, "setitimer") or threading.current_thread() is not threading.main_thread():
+            return None
+        samples: Counter = Counter()
+
+        def on_sigprof(signum, frame):
+            if frame is not None:
+                samples[_collapse(frame, "MainThread")] += 1
+
+        self._previous_handler = signal.signal(signal.SIGPROF, on_sigprof)
+        signal.setitimer(signal.ITIMER_PROF, interval, interval)
+        return samples
+
+    def stop_cpu(self):
+        signal.setitimer(signal.ITIMER_PROF, 0, 0)
+        signal.signal(signal.SIGPROF, self._previous_handler or signal.SIG_DFL)
+
+
+profiler = SamplingProfiler()
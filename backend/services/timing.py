@@ -0,0 +1,102 @@
+"""
+Request Timing - Per-request phase breakdown for the Server-Timing header
+Enabled with ENABLE_SERVER_TIMING; a no-op otherwise
+
+Phases used by the routers:
+    obfuscation, rag, prompt, queue, prefill, generation, postprocess
+
+Nested phases are exclusive: time spent in `rag` inside `prompt` is
+reported under `rag` only, so the phases add up to the request.
+
+PRIVACY: Only phase names and durations are collected - never content.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+
+class RequestTimings:
+    """Accumulated exclusive durations for one request"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases: Dict[str, float] = {}
+        self._stack: List[List[float]] = []  # [started, child seconds] per open phase
+
+    def add(self, name: str, seconds: float):
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+        if self._stack:
+            self._stack[-1][1] += seconds
+
+    @contextmanager
+    def phase(self, name: str):
+        frame = [time.perf_counter(), 0.0]
+        self._stack.append(frame)
+        try:
+            yield
+        finally:
+            self._stack.pop()
+            elapsed = time.perf_counter() - frame[0]
+            self.add(name, max(0.0, elapsed - frame[1]))
+            if self._stack:
+                # Parent already counted our exclusive part via add(); count the nested rest too
+                self._stack[-1][1] += frame[1]
+
+    def summary(self) -> Dict[str, float]:
+        """Phase durations so far plus the running total, in milliseconds"""
+        durations = {name: round(seconds * 1000, 2) for name, seconds in self.phases.items()}
+        durations["total"] = round((time.perf_counter() - self.started) * 1000, 2)
+        return durations
+
+    def header(self) -> str:
+        """Server-Timing value, durations in milliseconds"""
+        return ", ".join(f"{name};dur={ms:.2f}" for name, ms in self.summary().items())
+
+
+_current: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+
+def start() -> RequestTimings:
+    """Begin collecting for the current request (called by the middleware)"""
+    timings = RequestTimings()
+    _current.set(timings)
+    return timings
+
+
+def current() -> Optional[RequestTimings]:
+    """The current request's breakdown, or None when not collecting"""
+    return _current.get()
+
+
+@contextmanager
+def phase(name: str):
+    """Time a block into the current request's breakdown (no-op when not collecting)"""
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    with timings.phase(name):
+        yield
+
+
+def record(name: str, seconds: float):
+    timings = _current.get()
+    if timings is not None:
+        timings.add(name, seconds)
+
+
+def record_ollama(waited: float, response: Dict[str, Any]):
+    """
+    Split one Ollama wait into queue / prefill / generation using the
+    durations Ollama reports. Queue is whatever the model did not account
+    for: waiting behind other requests, model load and network.
+    """
+    if _current.get() is None:
+        return
+    prefill = (response.get("prompt_eval_duration") or 0) / 1e9
+    generation = (response.get("eval_duration") or 0) / 1e9
+    record("queue", max(0.0, waited - prefill - generation))
+    record("prefill", prefill)
+    record("generation", generation)
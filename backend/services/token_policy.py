@@ -0,0 +1,140 @@
+"""
+Token Policies - Per-endpoint generation budgets
+Every Ollama call site takes its max_tokens and stop sequences from here
+
+Policies can:
+1. Scale max_tokens with the input (translation output tracks input length)
+2. Stop early on a stop sequence (e.g. the end of a flat JSON object)
+3. Drop <think> reasoning on latency-sensitive paths when FAST_REASONING is on
+
+PRIVACY: Usage stats are token counts only - never prompts or responses.
+"""
+
+import math
+import re
+from typing import Any, Dict, Optional
+from config import settings
+from services import metrics
+
+
+TOKEN_POLICIES: Dict[str, Dict[str, Any]] = {
+    # Conversational turn - stop if the model starts writing the user's next line
+    "chat": {"max_tokens": 256, "stop": ["\nUser:"]},
+    # One short tip (max 15 words) plus an [ACTION: ...] tag
+    "sia": {"max_tokens": 96, "stop": ["\nUser:"]},
+    # Output tracks input length; non-Latin scripts need ~3x the tokens of English
+    "translate": {"max_tokens": 2000, "min_tokens": 64, "tokens_per_char": 0.75},
+    # Flat JSON object - nothing useful comes after the closing brace
+    "sentiment": {"max_tokens": 128, "stop": ["}"]},
+    # <think> reasoning + JSON, or a flat JSON object when reasoning is skipped
+    "masking": {"max_tokens": 1024, "latency_sensitive": True, "fast_max_tokens": 192},
+    "visual": {"max_tokens": 1024, "latency_sensitive": True, "fast_max_tokens": 192},
+}
+
+NO_REASONING_DIRECTIVE = "Respond with the JSON object only. Do not write <think> tags or any reasoning."
+
+_THINK_INSTRUCTION = re.compile(r'^.*Use <think> tags.*(?:\n|$)', re.MULTILINE)
+_THINK_HEADING = re.compile(r'In your <think> reasoning, (\w)')
+_EXTRA_BLANK_LINES = re.compile(r'\n{3,}')
+_TOKEN_PIECES = re.compile(r"[A-Za-z]+|\d|[^\sA-Za-z\d]")
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    SentencePiece-style estimate: one token per ~4 letters of a word,
+    one per digit and one per punctuation/symbol character.
+    Additive over whitespace-separated words.
+    """
+    return sum(
+        math.ceil(len(piece) / 4) if piece[0].isalpha() else 1
+        for piece in _TOKEN_PIECES.findall(text)
+    )
+
+
+def reasoning_enabled(endpoint: str) -> bool:
+    """<think> reasoning is skipped only for latency-sensitive endpoints in FAST_REASONING mode"""
+    policy = TOKEN_POLICIES.get(endpoint, {})
+    return not (settings.FAST_REASONING and policy.get("latency_sensitive", False))
+
+
+def without_reasoning(prompt: str) -> str:
+    """Strip <think> instructions from a prompt written for Chain-of-Thought"""
+    prompt = _THINK_INSTRUCTION.sub("", prompt)
+    prompt = _THINK_HEADING.sub(lambda m: m.group(1).upper(), prompt)
+    return _EXTRA_BLANK_LINES.sub("\n\n", prompt).strip()
+
+
+def token_policy(endpoint: str, text: str = "") -> Dict[str, Any]:
+    """
+    Resolve generation options for one call site
+
+    Args:
+        endpoint: Key in TOKEN_POLICIES
+        text: The input being processed (for input-scaled budgets)
+
+    Returns:
+        Keyword arguments for OllamaClient.generate / generate_multimodal
+    """
+    policy = TOKEN_POLICIES[endpoint]
+    max_tokens = policy["max_tokens"]
+    stop = policy.get("stop")
+
+    if "tokens_per_char" in policy:
+        scaled = int(len(text) * policy["tokens_per_char"])
+        max_tokens = min(max_tokens, max(policy.get("min_tokens", 0), scaled))
+
+    if not reasoning_enabled(endpoint):
+        max_tokens = policy.get("fast_max_tokens", max_tokens)
+        # Without <think> blocks the answer is a flat JSON object
+        stop = ["}"]
+
+    return {"max_tokens": max_tokens, "stop": stop, "endpoint": endpoint}
+
+
+class TokenUsage:
+    """Running per-endpoint token counters from Ollama's response metadata"""
+
+    def __init__(self):
+        self._endpoints: Dict[str, Dict[str, int]] = {}
+
+    def record(self, endpoint: Optional[str], response: Dict[str, Any]):
+        entry = self._endpoints.setdefault(endpoint or "other", {
+            "calls": 0,
+            "prompt_tokens": 0,
+            "generated_tokens": 0,
+            "hit_max_tokens": 0
+        })
+        entry["calls"] += 1
+        entry["prompt_tokens"] += response.get("prompt_eval_count", 0) or 0
+        entry["generated_tokens"] += response.get("eval_count", 0) or 0
+        if response.get("done_reason") == "length":
+            entry["hit_max_tokens"] += 1
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            endpoint: {
+                **entry,
+                "avg_generated_tokens": round(entry["generated_tokens"] / entry["calls"], 1)
+            }
+            for endpoint, entry in self._endpoints.items()
+        }
+
+
+token_usage = TokenUsage()
+
+
+def _collect_token_usage():
+    """Expose per-endpoint token counters on /metrics"""
+    stats = token_usage.stats()
+    return [
+        (name, "counter", description,
+         [({"endpoint": endpoint}, entry[field]) for endpoint, entry in stats.items()])
+        for name, field, description in (
+            ("zenguard_prompt_tokens_total", "prompt_tokens", "Prompt tokens sent to Ollama"),
+            ("zenguard_generated_tokens_total", "generated_tokens", "Tokens generated by Ollama"),
+            ("zenguard_max_tokens_hits_total", "hit_max_tokens", "Generations cut off by max_tokens"),
+        )
+    ]
+
+
+metrics.registry.register_collector(_collect_token_usage)
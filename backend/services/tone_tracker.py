@@ -0,0 +1,118 @@
+"""
+Tone Tracker - Lightweight word-list tone scoring for live typing feedback
+Shared by POST /api/quick-check and the incremental WebSocket variant
+
+The incremental tracker keeps running positive/negative/word counts and
+only rescans the words touched by each edit, so a keystroke costs
+O(edit size) instead of O(text length).
+
+PRIVACY: Text lives only as long as the WebSocket connection.
+"""
+
+from typing import Dict, Optional, Tuple
+
+
+POSITIVE_WORDS = {
+    'happy', 'good', 'great', 'better', 'love', 'wonderful',
+    'amazing', 'excited', 'hopeful', 'grateful', 'thankful',
+    'peaceful', 'calm', 'relaxed', 'confident'
+}
+NEGATIVE_WORDS = {
+    'sad', 'bad', 'worse', 'hate', 'terrible', 'awful',
+    'anxious', 'worried', 'scared', 'angry', 'frustrated',
+    'lonely', 'tired', 'exhausted', 'stressed', 'overwhelmed'
+}
+
+
+def count_words(text: str) -> Tuple[int, int, int]:
+    """Returns (positive, negative, total) word counts"""
+    words = text.lower().split()
+    pos_count = sum(1 for w in words if w in POSITIVE_WORDS)
+    neg_count = sum(1 for w in words if w in NEGATIVE_WORDS)
+    return pos_count, neg_count, len(words)
+
+
+def tone_from_counts(pos_count: int, neg_count: int, word_count: int) -> Dict:
+    """Map word counts to the quick-check tone, intensity and suggestion"""
+    total = pos_count + neg_count
+    if total == 0:
+        tone = "neutral"
+        intensity = 0.3
+    elif pos_count > neg_count:
+        tone = "positive"
+        intensity = min(1.0, pos_count / max(1, word_count) * 5)
+    else:
+        tone = "concerning"
+        intensity = min(1.0, neg_count / max(1, word_count) * 5)
+
+    # Generate suggestion for concerning tone
+    suggestion = None
+    if tone == "concerning" and intensity > 0.5:
+        suggestion = "Take a deep breath. It's okay to feel this way."
+
+    return {
+        "emotional_tone": tone,
+        "intensity": intensity,
+        "suggestion": suggestion
+    }
+
+
+class IncrementalToneTracker:
+    """
+    Running quick-check state for one typing session
+
+    Edits are splices: replace text[start:end] with `insert`. Only the
+    whitespace-delimited words overlapping the splice are rescored.
+    """
+
+    def __init__(self, max_length: int = 2000):
+        self.max_length = max_length
+        self.text = ""
+        self.pos_count = 0
+        self.neg_count = 0
+        self.word_count = 0
+        self._last_key: Optional[Tuple] = None
+
+    def reset(self, text: str):
+        """Replace the whole buffer (initial sync or client resync)"""
+        self.text = text[:self.max_length]
+        self.pos_count, self.neg_count, self.word_count = count_words(self.text)
+
+    def splice(self, start: int, end: int, insert: str = ""):
+        """Replace text[start:end] with `insert`, rescoring only the affected words"""
+        start = max(0, min(start, len(self.text)))
+        end = max(start, min(end, len(self.text)))
+        insert = insert[:max(0, self.max_length - (len(self.text) - (end - start)))]
+
+        # Widen the edit to whole words - neighbours may merge or split
+        left = start
+        while left > 0 and not self.text[left - 1].isspace():
+            left -= 1
+        right = end
+        while right < len(self.text) and not self.text[right].isspace():
+            right += 1
+
+        pos, neg, words = count_words(self.text[left:right])
+        self.pos_count -= pos
+        self.neg_count -= neg
+        self.word_count -= words
+
+        self.text = self.text[:start] + insert + self.text[end:]
+
+        pos, neg, words = count_words(self.text[left:right + len(insert) - (end - start)])
+        self.pos_count += pos
+        self.neg_count += neg
+        self.word_count += words
+
+    def result(self) -> Dict:
+        return tone_from_counts(self.pos_count, self.neg_count, self.word_count)
+
+    def changed_result(self) -> Optional[Dict]:
+        """The current result, or None if it is unchanged since the last call"""
+        result = self.result()
+        # Ignore intensity jitter below what the UI can show
+        key = (result["emotional_tone"], round(result["intensity"], 2), result["suggestion"])
+        if key == self._last_key:
+            return None
+        self._last_key = key
+        return result
@@ -0,0 +1,234 @@
+"""
+Vector Index - Top-k cosine search over passage embeddings
+Used by the knowledge base when RAG_MODE is semantic or hybrid
+
+Two index types behind the same search(query, k) interface:
+- FlatIndex: exact, one matrix-vector product over every row
+- IVFIndex:  approximate (inverted file). Rows are clustered by spherical
+  k-means and stored grouped by cluster; a query scores the centroids and
+  then only the rows of the n_probe closest clusters. Use it once the
+  corpus is large enough (~50k+ passages) for the flat scan to dominate.
+
+Embeddings are L2-normalised at build time and stored quantised:
+- float16: half the size of float32, no measurable ranking change
+- int8:    a quarter of the size, one float32 scale per row; also ~3x
+           faster to score, since numpy's float16 -> float32 upcast is slow
+           (prefer it for large IVF indexes)
+
+An index is a set of files sharing a path prefix: <path>.npy (the matrix),
+<path>.scales.npy (int8 only), <path>.json (metadata) and, for IVF,
+<path>.centroids.npy / .offsets.npy / .ids.npy. The matrix is opened with
+mmap_mode="r", so every worker maps the same page-cache pages instead of
+holding its own copy.
+
+numpy is optional - without it `available()` is False and the knowledge
+base stays in keyword mode.
+"""
+
+import json
+import math
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+DTYPES = ("float16", "int8")
+
+
+def available() -> bool:
+    return np is not None
+
+
+def normalize(vectors):
+    """Row-wise L2 normalisation (zero rows stay zero)"""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def _quantize(unit, dtype: str):
+    """(matrix, per-row scales or None) for L2-normalised rows"""
+    if dtype not in DTYPES:
+        raise ValueError(f"dtype must be one of {DTYPES}")
+    if dtype == "int8":
+        # Symmetric per-row quantisation: row * scale ~= unit row
+        scales = np.maximum(np.abs(unit).max(axis=1), 1e-12) / 127.0
+        return np.round(unit / scales[:, None]).astype(np.int8), scales.astype(np.float32)
+    return unit.astype(np.float16), None
+
+
+def load(path: str, mmap: bool = True):
+    """Open a saved index of whichever type its metadata names"""
+    with open(f"{path}.json", "r", encoding="utf-8") as f:
+        kind = json.load(f).get("index", "flat")
+    return (IVFIndex if kind == "ivf" else FlatIndex).load(path, mmap)
+
+
+class FlatIndex:
+    """Exact search: one matrix-vector product per query"""
+
+    def __init__(self, vectors, scales=None, meta: Optional[Dict[str, Any]] = None):
+        self.vectors = vectors
+        self.scales = scales
+        self.meta = meta or {}
+
+    @classmethod
+    def build(cls, vectors, dtype: str = "float16", meta: Optional[Dict[str, Any]] = None) -> "FlatIndex":
+        unit = normalize(vectors)
+        matrix, scales = _quantize(unit, dtype)
+        return cls(matrix, scales, {**(meta or {}), "index": "flat", "dtype": dtype,
+                                    "count": len(matrix), "dim": int(unit.shape[1])})
+
+    def save(self, path: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        np.save(f"{path}.npy", self.vectors)
+        if self.scales is not None:
+            np.save(f"{path}.scales.npy", self.scales)
+        with open(f"{path}.json", "w", encoding="utf-8") as f:
+            json.dump(self.meta, f, indent=2)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "FlatIndex":
+        with open(f"{path}.json", "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        vectors = np.load(f"{path}.npy", mmap_mode="r" if mmap else None)
+        scales = np.load(f"{path}.scales.npy") if meta.get("dtype") == "int8" else None
+        return cls(vectors, scales, meta)
+
+    def __len__(self) -> int:
+        return len(self.vectors)
+
+    @property
+    def dim(self) -> int:
+        return int(self.vectors.shape[1])
+
+    def scores(self, query, start: int = 0, end: Optional[int] = None):
+        """Cosine similarity of a query to rows start:end (default all)"""
+        return _slice_scores(self.vectors, self.scales, normalize(query), start, len(self.vectors) if end is None else end)
+
+    def search(self, query, k: int = 10) -> List[Tuple[int, float]]:
+        """[(row id, cosine)] best first"""
+        scores = self.scores(query)
+        return [(int(i), float(scores[i])) for i in _top_k(scores, k)]
+
+
+def _slice_scores(vectors, scales, query, start: int, end: int, block: int = 4096):
+    """
+    Scores for rows start:end, upcast to float32 a block at a time: numpy has
+    no BLAS path for float16/int8, and converting the whole matrix per query
+    would allocate a float32 copy of it.
+    """
+    scores = np.empty(end - start, dtype=np.float32)
+    for i in range(start, end, block):
+        j = min(i + block, end)
+        scores[i - start:j - start] = vectors[i:j].astype(np.float32, copy=False) @ query
+    if scales is not None:
+        scores *= scales[start:end]
+    return scores
+
+
+def _top_k(scores, k: int):
+    """Positions of the k highest scores, best first"""
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    top = np.argpartition(-scores, k - 1)[:k]
+    return top[np.argsort(-scores[top], kind="stable")]
+
+
+def _nearest_centroid(unit, centroids, chunk: int = 8192):
+    """Cluster id per row (max cosine), in chunks to bound the temporary score matrix"""
+    return np.concatenate([
+        np.argmax(unit[i:i + chunk] @ centroids.T, axis=1) for i in range(0, len(unit), chunk)
+    ]) if len(unit) else np.empty(0, dtype=np.int64)
+
+
+def spherical_kmeans(unit, n_lists: int, iterations: int = 10, sample: int = 256, seed: int = 0):
+    """
+    Unit-norm centroids for L2-normalised rows. Trains on at most
+    `sample` rows per list; empty clusters are re-seeded from random rows.
+    """
+    rng = np.random.default_rng(seed)
+    train = unit
+    if len(unit) > n_lists * sample:
+        train = unit[rng.choice(len(unit), n_lists * sample, replace=False)]
+    centroids = train[rng.choice(len(train), n_lists, replace=False)].copy()
+    for _ in range(iterations):
+        assign = _nearest_centroid(train, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assign, train)
+        empty = np.bincount(assign, minlength=n_lists) == 0
+        sums[empty] = train[rng.choice(len(train), int(empty.sum()))]
+        centroids = normalize(sums)
+    return centroids
+
+
+class IVFIndex(FlatIndex):
+    """
+    Inverted-file ANN search. self.vectors holds the rows grouped by list
+    (list l is rows offsets[l]:offsets[l+1]); self.ids maps them back to the
+    caller's row ids.
+    """
+
+    def __init__(self, vectors, scales=None, meta: Optional[Dict[str, Any]] = None,
+                 centroids=None, offsets=None, ids=None):
+        super().__init__(vectors, scales, meta)
+        self.centroids = centroids
+        self.offsets = offsets
+        self.ids = ids
+        self.n_probe = int(self.meta.get("n_probe", 1))
+
+    @staticmethod
+    def default_lists(count: int) -> int:
+        """~4*sqrt(n) lists keeps both the centroid scan and the probed rows small"""
+        return max(1, min(count, int(round(4 * math.sqrt(count)))))
+
+    @classmethod
+    def build(cls, vectors, dtype: str = "float16", meta: Optional[Dict[str, Any]] = None,
+              n_lists: Optional[int] = None, n_probe: Optional[int] = None,
+              iterations: int = 10, seed: int = 0) -> "IVFIndex":
+        unit = normalize(vectors)
+        n_lists = min(n_lists or cls.default_lists(len(unit)), len(unit))
+        centroids = spherical_kmeans(unit, n_lists, iterations, seed=seed)
+        assign = _nearest_centroid(unit, centroids)
+        ids = np.argsort(assign, kind="stable")
+        offsets = np.concatenate([[0], np.cumsum(np.bincount(assign, minlength=n_lists))])
+        matrix, scales = _quantize(unit[ids], dtype)
+        return cls(matrix, scales, {
+            **(meta or {}), "index": "ivf", "dtype": dtype, "count": len(matrix), "dim": int(unit.shape[1]),
+            "n_lists": n_lists, "n_probe": n_probe or min(n_lists, max(8, n_lists // 128)),
+        }, centroids.astype(np.float32), offsets.astype(np.int64), ids.astype(np.int64))
+
+    def save(self, path: str):
+        super().save(path)
+        np.save(f"{path}.centroids.npy", self.centroids)
+        np.save(f"{path}.offsets.npy", self.offsets)
+        np.save(f"{path}.ids.npy", self.ids)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "IVFIndex":
+        flat = FlatIndex.load(path, mmap)
+        return cls(flat.vectors, flat.scales, flat.meta,
+                   np.load(f"{path}.centroids.npy"), np.load(f"{path}.offsets.npy"),
+                   np.load(f"{path}.ids.npy", mmap_mode="r" if mmap else None))
+
+    def search(self, query, k: int = 10, n_probe: Optional[int] = None) -> List[Tuple[int, float]]:
+        """[(row id, cosine)] best first, searching only the n_probe closest lists"""
+        query = normalize(query)
+        lists = _top_k(self.centroids @ query, n_probe or self.n_probe)
+        # Probed lists are contiguous slices - score them in place, no gather copy
+        spans = [(int(self.offsets[l]), int(self.offsets[l + 1])) for l in lists]
+        spans = [(start, end) for start, end in spans if end > start]
+        if not spans:
+            return []
+        scores = np.concatenate([_slice_scores(self.vectors, self.scales, query, start, end) for start, end in spans])
+        top = _top_k(scores, k)
+        # Map positions in the concatenated scores back to stored rows
+        lengths = np.array([end - start for start, end in spans])
+        firsts = np.cumsum(lengths) - lengths
+        part = np.searchsorted(firsts, top, side="right") - 1
+        rows = np.array([start for start, _ in spans])[part] + top - firsts[part]
+        return [(int(self.ids[row]), float(scores[i])) for row, i in zip(rows, top)]
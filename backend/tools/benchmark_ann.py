@@ -0,0 +1,157 @@
+"""
+Recall vs latency benchmark for the vector indexes.
+
+Builds a FlatIndex and an IVFIndex over the same vectors, takes exact
+float32 top-k as ground truth, and reports recall@k and per-query latency
+for the flat scan and for IVF at each n_probe. Use it to pick --lists /
+--probes for tools/build_embeddings.py --index ivf.
+
+Vectors are either a synthetic clustered corpus (default 100k x 384, the
+shape of a grown multi-source corpus) or a saved index from
+build_embeddings.py. Queries are perturbed corpus rows, so every query
+has real neighbours.
+
+Usage:
+    python tools/benchmark_ann.py
+    python tools/benchmark_ann.py --count 250000 --dim 768 --probes 4 8 16 32
+    python tools/benchmark_ann.py --embeddings data/embeddings/counseling_handbook --json ann.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+# Add backend directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services import vector_index
+
+
+def synthetic_corpus(count: int, dim: int, latent: int, topics: int, spread: float, seed: int):
+    """
+    Unit vectors with the structure real embeddings have: topic clusters in
+    a low-dimensional latent space, randomly projected up to `dim` plus a
+    little isotropic noise (uniform random vectors would defeat any ANN index)
+    """
+    np = vector_index.np
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((topics, latent), dtype=np.float32)
+    points = centers[rng.integers(0, topics, count)] + rng.standard_normal((count, latent), dtype=np.float32) * spread
+    projection = rng.standard_normal((latent, dim), dtype=np.float32)
+    return vector_index.normalize(points @ projection + rng.standard_normal((count, dim), dtype=np.float32) * 0.05)
+
+
+def saved_vectors(path: str):
+    """Dequantised float32 rows of a saved index, in the caller's row order"""
+    np = vector_index.np
+    index = vector_index.load(path, mmap=False)
+    rows = index.vectors.astype(np.float32)
+    if index.scales is not None:
+        rows *= index.scales[:, None]
+    if isinstance(index, vector_index.IVFIndex):
+        ordered = np.empty_like(rows)
+        ordered[index.ids] = rows
+        rows = ordered
+    return vector_index.normalize(rows)
+
+
+def timed_queries(search, queries):
+    """(results, per-query seconds)"""
+    results, seconds = [], []
+    for query in queries:
+        started = time.perf_counter()
+        results.append(search(query))
+        seconds.append(time.perf_counter() - started)
+    return results, seconds
+
+
+def percentile(values, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def recall(results, truth, k: int) -> float:
+    found = sum(len({i for i, _ in got} & expected) for got, expected in zip(results, truth))
+    return found / (k * len(truth))
+
+
+def benchmark_ann():
+    parser = argparse.ArgumentParser(description="Vector index recall vs latency")
+    parser.add_argument("--embeddings", help="Saved index path (without extension) instead of synthetic data")
+    parser.add_argument("--count", type=int, default=100_000, help="Synthetic corpus size")
+    parser.add_argument("--dim", type=int, default=384, help="Synthetic vector size")
+    parser.add_argument("--latent-dim", type=int, default=32, help="Synthetic intrinsic dimensionality")
+    parser.add_argument("--topics", type=int, default=1000, help="Synthetic cluster count")
+    parser.add_argument("--spread", type=float, default=0.5, help="Synthetic within-topic spread (latent space)")
+    parser.add_argument("--query-noise", type=float, default=0.02, help="Per-dimension noise added to query rows")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("-k", type=int, default=10)
+    parser.add_argument("--dtype", choices=vector_index.DTYPES, default="float16")
+    parser.add_argument("--lists", type=int, default=None, help="IVF lists (default ~4*sqrt(n))")
+    parser.add_argument("--probes", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", dest="json_path", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    if not vector_index.available():
+        print("❌ numpy is not installed (pip install numpy)")
+        sys.exit(1)
+    np = vector_index.np
+
+    if args.embeddings:
+        vectors = saved_vectors(os.path.join(os.getcwd(), args.embeddings))
+        source = args.embeddings
+    else:
+        vectors = synthetic_corpus(args.count, args.dim, args.latent_dim, args.topics, args.spread, args.seed)
+        source = f"synthetic {args.count} x {args.dim}"
+    print(f"📦 {source}: {len(vectors)} vectors, k={args.k}, {args.queries} queries, {args.dtype}")
+
+    rng = np.random.default_rng(args.seed + 1)
+    picks = rng.choice(len(vectors), min(args.queries, len(vectors)), replace=False)
+    noise = rng.standard_normal((len(picks), vectors.shape[1]), dtype=np.float32) * args.query_noise
+    queries = vector_index.normalize(vectors[picks] + noise)
+
+    # Ground truth: exact float32 scores
+    exact = vector_index.FlatIndex(vectors)
+    truth = [{i for i, _ in exact.search(query, args.k)} for query in queries]
+
+    started = time.perf_counter()
+    flat = vector_index.FlatIndex.build(vectors, args.dtype)
+    flat_build = time.perf_counter() - started
+    started = time.perf_counter()
+    ivf = vector_index.IVFIndex.build(vectors, args.dtype, n_lists=args.lists, seed=args.seed)
+    ivf_build = time.perf_counter() - started
+    sizes = np.diff(ivf.offsets)
+    print(f"🏗️  Built flat in {flat_build:.2f}s, IVF ({ivf.meta['n_lists']} lists, "
+          f"{sizes.min()}-{sizes.max()} rows each) in {ivf_build:.2f}s\n")
+
+    rows = []
+    results, seconds = timed_queries(lambda q: flat.search(q, args.k), queries)
+    rows.append({"index": "flat", "n_probe": None, "recall": recall(results, truth, args.k),
+                 "p50_ms": percentile(seconds, 0.5) * 1000, "p95_ms": percentile(seconds, 0.95) * 1000})
+    for n_probe in args.probes:
+        if n_probe > ivf.meta["n_lists"]:
+            continue
+        results, seconds = timed_queries(lambda q: ivf.search(q, args.k, n_probe), queries)
+        rows.append({"index": "ivf", "n_probe": n_probe, "recall": recall(results, truth, args.k),
+                     "p50_ms": percentile(seconds, 0.5) * 1000, "p95_ms": percentile(seconds, 0.95) * 1000,
+                     "scanned": float(n_probe / ivf.meta["n_lists"])})
+
+    print(f"{'index':<6} {'n_probe':>7} {'recall@' + str(args.k):>9} {'p50 ms':>8} {'p95 ms':>8} {'scanned':>8}")
+    for row in rows:
+        probe = row["n_probe"] if row["n_probe"] is not None else "-"
+        scanned = f"{row['scanned'] * 100:.1f}%" if "scanned" in row else "100%"
+        print(f"{row['index']:<6} {probe:>7} {row['recall']:>9.3f} {row['p50_ms']:>8.3f} {row['p95_ms']:>8.3f} {scanned:>8}")
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump({"source": source, "count": len(vectors), "k": args.k, "dtype": args.dtype,
+                       "n_lists": ivf.meta["n_lists"], "flat_build_s": flat_build, "ivf_build_s": ivf_build,
+                       "results": rows}, f, indent=2)
+        print(f"\n✅ Results written to: {args.json_path}")
+
+
+if __name__ == "__main__":
+    benchmark_ann()
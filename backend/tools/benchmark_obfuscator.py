@@ -0,0 +1,206 @@
+"""
+Privacy obfuscator benchmark with a golden-equivalence gate.
+
+1. Generates a seeded synthetic corpus across message sizes and PII densities
+   (emails, phones, SSNs, dates, cards, URLs, IDs, institutions, numbers).
+2. Checks the candidate obfuscator against the original multi-pass reference
+   (obfuscate, detect_pii and streamed obfuscate_chunks) on that corpus plus
+   data/obfuscator_golden.json. Any mismatch fails the run before timing.
+3. Reports throughput (messages/s, MB/s) and peak extra memory per call
+   (tracemalloc) for candidate vs reference.
+
+Usage:
+    python tools/benchmark_obfuscator.py
+    python tools/benchmark_obfuscator.py --sizes 500 5000 --densities 0 0.05 --json bench.json
+    python tools/benchmark_obfuscator.py --candidate mypkg.fast_obfuscator:FastObfuscator
+"""
+
+import argparse
+import importlib
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+# Add backend directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from privacy.reference_obfuscator import ReferenceTextObfuscator
+
+GOLDEN_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "data", "obfuscator_golden.json"
+)
+
+FILLER_WORDS = (
+    "I feel so anxious about my exams and I can't sleep at night because "
+    "everything is too much lately my friends don't get it and I keep "
+    "thinking about whether I'm good enough honestly today was better though"
+).split()
+
+PUNCTUATION = ["", "", "", ".", ",", "!", "?", ":"]
+SEPARATORS = [" ", " ", " ", " ", "\n", "  ", "-", "/"]
+
+
+def _digits(rng: random.Random, n: int) -> str:
+    return "".join(rng.choice("0123456789") for _ in range(n))
+
+
+PII_GENERATORS = {
+    "email": lambda r: f"{r.choice(['sam', 'priya', 'j.doe', 'alex99'])}@{r.choice(['uni.edu', 'mail.com', 'x.co.uk'])}",
+    "phone": lambda r: r.choice([
+        f"{_digits(r, 3)}-{_digits(r, 3)}-{_digits(r, 4)}",
+        f"({_digits(r, 3)}) {_digits(r, 3)}-{_digits(r, 4)}",
+        f"+{_digits(r, 1)} {_digits(r, 3)} {_digits(r, 3)} {_digits(r, 4)}",
+    ]),
+    "ssn": lambda r: f"{_digits(r, 3)}-{_digits(r, 2)}-{_digits(r, 4)}",
+    "date": lambda r: r.choice([f"{_digits(r, 2)}/{_digits(r, 2)}/{_digits(r, 4)}", f"{_digits(r, 4)}-{_digits(r, 2)}-{_digits(r, 2)}"]),
+    "card": lambda r: r.choice([" ", "-"]).join(_digits(r, 4) for _ in range(4)),
+    "url": lambda r: f"https://{r.choice(['example.com', 'forum.org', 'x.io'])}/{r.choice(['help', 'p?q=1', _digits(r, 3)])}",
+    "id": lambda r: f"{r.choice(['AB', 'XYZ', 'cs'])}{_digits(r, r.randint(6, 8))}",
+    "institution": lambda r: f"{r.choice(['Stanford', 'Mercy', 'Lincoln', 'Valley'])} {r.choice(['University', 'College', 'Hospital', 'Clinic', 'High', 'Medical Center'])}",
+    "number": lambda r: _digits(r, r.randint(1, 6)),
+}
+
+
+def generate_message(rng: random.Random, size: int, pii_density: float) -> str:
+    """One synthetic message of about `size` characters; pii_density = fraction of tokens that are PII"""
+    parts = []
+    length = 0
+    kinds = list(PII_GENERATORS)
+    while length < size:
+        if rng.random() < pii_density:
+            token = PII_GENERATORS[rng.choice(kinds)](rng)
+        else:
+            token = rng.choice(FILLER_WORDS) + rng.choice(PUNCTUATION)
+        token += rng.choice(SEPARATORS)
+        parts.append(token)
+        length += len(token)
+    return "".join(parts)[:size]
+
+
+def generate_corpus(sizes, densities, messages_per_cell: int, seed: int = 42):
+    """{(size, density): [messages]} - deterministic for a given seed"""
+    rng = random.Random(seed)
+    return {
+        (size, density): [generate_message(rng, size, density) for _ in range(messages_per_cell)]
+        for size in sizes
+        for density in densities
+    }
+
+
+def load_candidate(spec: str):
+    module_name, class_name = spec.split(":")
+    return getattr(importlib.import_module(module_name), class_name)()
+
+
+def check_equivalence(candidate, reference, texts, stream_windows=(1, 64)):
+    """
+    Returns a list of mismatch descriptions (empty = equivalent).
+    Streaming is only checked if the candidate supports obfuscate_chunks.
+    """
+    mismatches = []
+    for text in texts:
+        expected = reference.obfuscate(text)
+        if candidate.obfuscate(text) != expected:
+            mismatches.append(f"obfuscate() differs for {text[:80]!r}")
+        if candidate.detect_pii(text) != reference.detect_pii(text):
+            mismatches.append(f"detect_pii() differs for {text[:80]!r}")
+        if hasattr(candidate, "obfuscate_chunks"):
+            chunks = [text[i:i + 7] for i in range(0, len(text), 7)]
+            for window in stream_windows:
+                if "".join(candidate.obfuscate_chunks(chunks, window=window)) != expected:
+                    mismatches.append(f"obfuscate_chunks(window={window}) differs for {text[:80]!r}")
+    return mismatches
+
+
+def measure_throughput(obfuscate, texts, min_seconds: float):
+    """Repeat the texts until min_seconds elapse; returns (messages/s, MB/s)"""
+    total_chars = sum(len(t) for t in texts)
+    rounds = 0
+    started = time.perf_counter()
+    while True:
+        for text in texts:
+            obfuscate(text)
+        rounds += 1
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_seconds:
+            break
+    return rounds * len(texts) / elapsed, rounds * total_chars / elapsed / 1e6
+
+
+def measure_peak_memory(obfuscate, texts):
+    """Average peak of extra memory held during one call (intermediate copies), in bytes"""
+    peaks = []
+    tracemalloc.start()
+    try:
+        for text in texts:
+            tracemalloc.reset_peak()
+            baseline, _ = tracemalloc.get_traced_memory()
+            result = obfuscate(text)
+            _, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - baseline)
+            del result
+    finally:
+        tracemalloc.stop()
+    return sum(peaks) / len(peaks)
+
+
+def benchmark_obfuscator():
+    parser = argparse.ArgumentParser(description="Benchmark the privacy obfuscator")
+    parser.add_argument("--candidate", default="privacy.text_obfuscator:TextObfuscator",
+                        help="module:Class of the obfuscator under test")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[200, 1000, 5000, 20000])
+    parser.add_argument("--densities", type=float, nargs="+", default=[0.0, 0.01, 0.05, 0.2])
+    parser.add_argument("--messages", type=int, default=20, help="Messages per size/density cell")
+    parser.add_argument("--seconds", type=float, default=0.5, help="Minimum timing per measurement")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", dest="json_path", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    reference = ReferenceTextObfuscator()
+    candidate = load_candidate(args.candidate)
+    corpus = generate_corpus(args.sizes, args.densities, args.messages, args.seed)
+
+    # Gate: no timing numbers for an obfuscator that changes the output
+    with open(GOLDEN_PATH, "r", encoding="utf-8") as f:
+        golden_texts = [case["input"] for case in json.load(f)]
+    all_texts = golden_texts + [text for texts in corpus.values() for text in texts]
+    print(f"🔍 Checking equivalence on {len(all_texts)} messages...")
+    mismatches = check_equivalence(candidate, reference, all_texts)
+    if mismatches:
+        print(f"❌ EQUIVALENCE FAILED: {len(mismatches)} mismatches")
+        for m in mismatches[:20]:
+            print(f"  - {m}")
+        sys.exit(1)
+    print("✅ Candidate output identical to the reference.\n")
+
+    results = []
+    print(f"{'size':>6} {'pii':>5} | {'ref msg/s':>10} {'cand msg/s':>10} {'speedup':>7} | "
+          f"{'ref MB/s':>8} {'cand MB/s':>9} | {'ref peak B':>10} {'cand peak B':>11}")
+    for (size, density), texts in corpus.items():
+        ref_rate, ref_mbps = measure_throughput(reference.obfuscate, texts, args.seconds)
+        cand_rate, cand_mbps = measure_throughput(candidate.obfuscate, texts, args.seconds)
+        ref_peak = measure_peak_memory(reference.obfuscate, texts[:5])
+        cand_peak = measure_peak_memory(candidate.obfuscate, texts[:5])
+        row = {
+            "size": size,
+            "pii_density": density,
+            "reference": {"messages_per_sec": ref_rate, "mb_per_sec": ref_mbps, "peak_bytes": ref_peak},
+            "candidate": {"messages_per_sec": cand_rate, "mb_per_sec": cand_mbps, "peak_bytes": cand_peak},
+            "speedup": cand_rate / ref_rate,
+        }
+        results.append(row)
+        print(f"{size:>6} {density:>5.2f} | {ref_rate:>10.0f} {cand_rate:>10.0f} {row['speedup']:>6.2f}x | "
+              f"{ref_mbps:>8.2f} {cand_mbps:>9.2f} | {ref_peak:>10.0f} {cand_peak:>11.0f}")
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump({"candidate": args.candidate, "seed": args.seed, "results": results}, f, indent=2)
+        print(f"\n✅ Results written to: {args.json_path}")
+
+
+if __name__ == "__main__":
+    benchmark_obfuscator()
@@ -0,0 +1,119 @@
+"""
+Build the passage embedding matrix for semantic / hybrid RAG.
+
+Chunks a corpus (the handbook, or --corpus <name> for data/corpora/<name>.txt)
+exactly as the knowledge base does, embeds every passage with Ollama's
+/api/embed, and writes an L2-normalised float16 or int8 matrix plus
+metadata to the corpus's embeddings path. The metadata records the corpus
+hash and chunking settings; the API refuses (and falls back to keyword
+search) if they no longer match.
+
+--index ivf builds an approximate inverted-file index instead of the
+exact flat one - worth it from ~50k passages; pick --lists / --probes with
+tools/benchmark_ann.py.
+
+Needs numpy. Run from backend/, then start the API with RAG_MODE=hybrid.
+
+Usage:
+    python tools/build_embeddings.py
+    python tools/build_embeddings.py --model nomic-embed-text --dtype int8
+    python tools/build_embeddings.py --corpus study_skills
+    python tools/build_embeddings.py --index ivf --dtype int8 --probes 8
+    python tools/build_embeddings.py --ollama-url http://localhost:11435 --batch-size 64
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+# Add backend directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import settings
+from services import vector_index
+from services.knowledge_base import DEFAULT_CORPUS, KnowledgeBaseRegistry
+from services.ollama_client import OllamaClient
+
+
+async def embed_passages(client: OllamaClient, texts, model: str, batch_size: int, parallel: int):
+    """Embeddings in passage order; a few batches in flight at once"""
+    semaphore = asyncio.Semaphore(parallel)
+    batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+    done = 0
+
+    async def run(batch):
+        nonlocal done
+        async with semaphore:
+            vectors = await client.embed(batch, model=model)
+        if len(vectors) != len(batch):
+            raise RuntimeError(f"Expected {len(batch)} embeddings, got {len(vectors)}")
+        done += len(batch)
+        print(f"\r⏳ Embedded {done}/{len(texts)} passages", end="", flush=True)
+        return vectors
+
+    results = await asyncio.gather(*(run(batch) for batch in batches))
+    print()
+    return [vector for vectors in results for vector in vectors]
+
+
+def build_index(kb, model: str, ollama_url: str, dtype: str = "float16", index: str = "flat",
+                lists: int = None, probes: int = None, batch_size: int = 32, parallel: int = 2,
+                output: str = None):
+    """Embed a loaded corpus and save its index; returns (index, output path, passages/s)"""
+    texts = [kb.passage_text(i) for i in range(len(kb.passages))]
+    client = OllamaClient()
+    client.base_url = ollama_url
+    started = time.perf_counter()
+    vectors = asyncio.run(embed_passages(client, texts, model, batch_size, parallel))
+    elapsed = time.perf_counter() - started
+
+    meta = {"model": model, **kb.index_meta()}
+    if index == "ivf":
+        built = vector_index.IVFIndex.build(vectors, dtype, meta, n_lists=lists, n_probe=probes)
+    else:
+        built = vector_index.FlatIndex.build(vectors, dtype, meta)
+    output = output or kb.embeddings_path
+    built.save(output)
+    return built, output, len(texts) / elapsed
+
+
+def build_embeddings():
+    parser = argparse.ArgumentParser(description="Embed corpus passages for semantic RAG")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS, help="Corpus name (handbook or data/corpora/<name>)")
+    parser.add_argument("--model", default=settings.OLLAMA_EMBED_MODEL, help="Ollama embedding model")
+    parser.add_argument("--ollama-url", default=settings.OLLAMA_BASE_URL)
+    parser.add_argument("--dtype", choices=vector_index.DTYPES, default="float16")
+    parser.add_argument("--index", choices=("flat", "ivf"), default="flat")
+    parser.add_argument("--lists", type=int, default=None, help="IVF lists (default ~4*sqrt(passages))")
+    parser.add_argument("--probes", type=int, default=None, help="IVF lists searched per query")
+    parser.add_argument("--output", help="Output path without extension (default: the corpus's embeddings path)")
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--parallel", type=int, default=2, help="Batches in flight")
+    args = parser.parse_args()
+
+    if not vector_index.available():
+        print("❌ numpy is not installed (pip install numpy)")
+        sys.exit(1)
+
+    registry = KnowledgeBaseRegistry()
+    if args.corpus not in registry:
+        print(f"❌ Unknown corpus '{args.corpus}' (known: {', '.join(registry.corpora)})")
+        sys.exit(1)
+    kb = registry.corpora[args.corpus]
+    kb.mode = "keyword"  # Chunk only - don't try to map the embeddings being rebuilt
+    if not kb.load_data():
+        sys.exit(1)
+
+    index, output, rate = build_index(
+        kb, args.model, args.ollama_url, args.dtype, args.index, args.lists, args.probes,
+        args.batch_size, args.parallel, os.path.join(os.getcwd(), args.output) if args.output else None
+    )
+    size = index.vectors.nbytes + (index.scales.nbytes if index.scales is not None else 0)
+    print(f"✅ {len(index)} x {index.dim} {args.dtype} {args.index} embeddings written to {output}.npy "
+          f"({size / 1024:.0f} KB, {rate:.0f} passages/s)")
+
+
+if __name__ == "__main__":
+    build_embeddings()
@@ -0,0 +1,161 @@
+"""
+Calibrate the RAG relevance gate (RAG_MIN_SCORE / RAG_MIN_TERMS / RAG_MIN_SIMILARITY).
+
+Runs the chat router's knowledge base search over labelled messages - ones
+the handbook should help with and off-topic small talk - and sweeps the
+gate thresholds. For each setting it reports how many relevant messages
+still get a reference (kept), how many off-topic ones wrongly do (leaked)
+and the prompt tokens injected per turn, then suggests the setting with the
+best kept - leaked margin. The suggestion is cross-validated: picked on
+all but one fold of the messages and scored on the held-out fold, so a
+threshold that only fits the sample shows up as a lower held-out margin.
+
+data/rag_gate_messages.json (about 100 student concerns and 100 off-topic
+chats) is used by default; pass --messages with your own labelled set
+([{"text": "...", "relevant": true}, ...]) in the same format. Similarity
+is swept too when RAG_MODE is semantic/hybrid and the embeddings and
+Ollama are available.
+
+Usage:
+    python tools/calibrate_rag_threshold.py
+    python tools/calibrate_rag_threshold.py --messages labelled.json --corpora handbook study_skills
+    RAG_MODE=hybrid python tools/calibrate_rag_threshold.py --json gate.json
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import sys
+
+# Add backend directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import settings
+from services.knowledge_base import knowledge_bases
+from services.token_policy import estimate_tokens
+
+MESSAGES_PATH = "data/rag_gate_messages.json"
+
+SCORE_GRID = [round(0.02 * step, 2) for step in range(16)]  # 0.0 .. 0.3
+TERMS_GRID = [1, 2, 3]
+SIMILARITY_GRID = [0.3, 0.4, 0.45, 0.5, 0.55, 0.6, 0.65, 0.7]
+FOLDS = 5
+
+
+def load_messages(path: str = MESSAGES_PATH):
+    """[(text, relevant)] from a labelled JSON file"""
+    with open(path, "r", encoding="utf-8") as f:
+        return [(item["text"], bool(item["relevant"])) for item in json.load(f)]
+
+
+def top_results(messages, corpora):
+    """[(relevant, top result or None)] using the same search call as the chat router"""
+    async def embed_all():
+        return [await knowledge_bases.embed_query(text, corpora) for text, _ in messages]
+
+    vectors = asyncio.run(embed_all())
+    rows = []
+    for (text, relevant), query_vectors in zip(messages, vectors):
+        results = knowledge_bases.search(text, corpora, limit=1, query_vectors=query_vectors)
+        rows.append((relevant, results[0] if results else None))
+    return rows
+
+
+def sweep(rows, passes):
+    """(kept fraction, leaked fraction, tokens injected per turn) for one gate"""
+    relevant = [result for is_relevant, result in rows if is_relevant]
+    off_topic = [result for is_relevant, result in rows if not is_relevant]
+    injected = [result for _, result in rows if result and passes(result)]
+    kept = sum(1 for result in relevant if result and passes(result)) / max(len(relevant), 1)
+    leaked = sum(1 for result in off_topic if result and passes(result)) / max(len(off_topic), 1)
+    tokens = sum(estimate_tokens(result["content"]) for result in injected) / max(len(rows), 1)
+    return kept, leaked, tokens
+
+
+def gates(rows):
+    """[(table row, passes)] for every threshold setting worth sweeping"""
+    candidates = []
+    for min_terms in TERMS_GRID:
+        for min_score in SCORE_GRID:
+            candidates.append(({"gate": "keyword", "min_score": min_score, "min_terms": min_terms},
+                               lambda r, s=min_score, t=min_terms: r["bm25"] >= s and r["matched"] >= t))
+    if any(result and result.get("similarity") is not None for _, result in rows):
+        for min_similarity in SIMILARITY_GRID:
+            candidates.append(({"gate": "similarity", "min_similarity": min_similarity},
+                               lambda r, m=min_similarity: (r["similarity"] or 0.0) >= m))
+    return candidates
+
+
+def best_gate(rows, candidates):
+    """The candidate with the best kept - leaked margin on rows (fewer tokens breaks ties)"""
+    def margin(candidate):
+        kept, leaked, tokens = sweep(rows, candidate[1])
+        return kept - leaked, -tokens
+    return max(candidates, key=margin)
+
+
+def cross_validate(rows, candidates, folds: int = FOLDS):
+    """(mean held-out kept, mean held-out leaked) of the gate picked on the other folds"""
+    kept = leaked = 0.0
+    for fold in range(folds):
+        train = [row for i, row in enumerate(rows) if i % folds != fold]
+        held_out = [row for i, row in enumerate(rows) if i % folds == fold]
+        fold_kept, fold_leaked, _ = sweep(held_out, best_gate(train, candidates)[1])
+        kept += fold_kept / folds
+        leaked += fold_leaked / folds
+    return kept, leaked
+
+
+def calibrate_rag_threshold():
+    parser = argparse.ArgumentParser(description="Sweep the RAG relevance gate over labelled messages")
+    parser.add_argument("--messages", default=MESSAGES_PATH,
+                        help='JSON list of {"text": ..., "relevant": true|false}')
+    parser.add_argument("--corpora", nargs="+", default=None, help="Corpora to search (default: handbook)")
+    parser.add_argument("--json", dest="json_path", help="Write the sweep to this JSON file")
+    args = parser.parse_args()
+
+    messages = load_messages(args.messages)
+    with contextlib.redirect_stdout(io.StringIO()):  # loader logs every corpus
+        knowledge_bases.load_all()
+    rows = top_results(messages, args.corpora)
+    labelled = sum(1 for _, relevant in messages if relevant)
+    print(f"🎯 {len(messages)} messages ({labelled} relevant, {len(messages) - labelled} off-topic), "
+          f"RAG_MODE={settings.RAG_MODE}\n")
+
+    candidates = gates(rows)
+    table = []
+    for row, passes in candidates:
+        kept, leaked, tokens = sweep(rows, passes)
+        row.update(kept=kept, leaked=leaked, tokens_per_turn=tokens)
+        table.append(row)
+
+    print(f"{'gate':<10} {'threshold':>10} {'terms':>5} | {'kept':>6} {'leaked':>6} | {'tokens/turn':>11}")
+    for row in table:
+        threshold = row.get("min_score", row.get("min_similarity"))
+        current = (row.get("min_score") == settings.RAG_MIN_SCORE and row.get("min_terms") == settings.RAG_MIN_TERMS) \
+            or row.get("min_similarity") == settings.RAG_MIN_SIMILARITY
+        print(f"{row['gate']:<10} {threshold:>10.2f} {row.get('min_terms', '-'):>5} | "
+              f"{row['kept'] * 100:>5.0f}% {row['leaked'] * 100:>5.0f}% | {row['tokens_per_turn']:>11.1f}"
+              f"{'  <- current' if current else ''}")
+
+    best = best_gate(rows, candidates)[0]
+    setting = (f"RAG_MIN_SCORE={best['min_score']} RAG_MIN_TERMS={best['min_terms']}" if best["gate"] == "keyword"
+               else f"RAG_MIN_SIMILARITY={best['min_similarity']}")
+    print(f"\n💡 Best kept - leaked margin: {setting} "
+          f"(keeps {best['kept'] * 100:.0f}%, leaks {best['leaked'] * 100:.0f}%)")
+    held_kept, held_leaked = cross_validate(rows, candidates)
+    print(f"   {FOLDS}-fold held-out: keeps {held_kept * 100:.0f}%, leaks {held_leaked * 100:.0f}%"
+          f"{'  ⚠️ too few messages to trust' if len(rows) < FOLDS * 10 else ''}")
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump({"rag_mode": settings.RAG_MODE, "messages": len(messages), "sweep": table,
+                       "suggested": best, "held_out": {"kept": held_kept, "leaked": held_leaked}}, f, indent=2)
+        print(f"✅ Sweep written to: {args.json_path}")
+
+
+if __name__ == "__main__":
+    calibrate_rag_threshold()
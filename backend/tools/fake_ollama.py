@@ -0,0 +1,405 @@
+"""
+Deterministic fake Ollama server for tests and benchmarks.
+
+Implements enough of the Ollama API for the backend to run without a model:
+- GET  /api/tags  - lists the configured model
+- POST /api/chat  - streaming and non-streaming, `images` accepted,
+                    honours options.num_predict and options.stop
+- POST /api/embed - hashed bag-of-words vectors (lexical overlap only, so
+                    semantic plumbing is testable but paraphrases are not)
+- GET  /fake/stats, GET/POST /fake/config - request counters and live
+                    reconfiguration for test harnesses
+
+Responses are scripted per system prompt - valid sentiment JSON for
+SENTIMENT_SYSTEM_PROMPT, masking/visual JSON (with a <think> block when the
+prompt asks for one), a tip plus [ACTION: ...] tag for Sia, a tagged echo
+for translation, and a short reply for chat personas. Content depends only
+on the request, so the same input always gets the same answer. Latency and
+faults come from a seeded stream: reproducible for the same request order,
+and fully fixed with --latency-sigma 0.
+
+Fault modes (applied to --fault-rate of chat requests):
+    error            HTTP 500
+    model_missing    HTTP 404 "model not found"
+    timeout          never answers (until the client gives up)
+    malformed        200 with content that is not the expected format
+    truncate         stream/body cut off before the final done chunk
+    slow_first_token prefill delay multiplied by --slow-factor
+
+Usage:
+    python tools/fake_ollama.py --port 11434 --latency-ms 300 --tokens-per-sec 40
+    python tools/fake_ollama.py --fault-rate 0.1 --faults error truncate
+    python tools/fake_ollama.py --script my_responses.json
+
+A script file is a JSON list of {"match": "<system prompt substring>",
+"response": "<text>"} checked in order before the built-in responses.
+"{user}" in a response is replaced by the last user message.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import random
+import re
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel
+
+FAULT_MODES = ("error", "model_missing", "timeout", "malformed", "truncate", "slow_first_token")
+
+# Gemma 3 encodes every image as a fixed block of soft tokens
+IMAGE_TOKENS = 256
+
+
+class FakeOllamaConfig(BaseModel):
+    """Simulation knobs for the fake server"""
+    model: str = "gemma3:4b"
+    latency_ms: float = 300.0      # Median prefill latency
+    latency_sigma: float = 0.5     # Log-normal spread (0 = fixed latency)
+    tokens_per_sec: float = 40.0   # Generation pacing (0 = no pacing)
+    fault_rate: float = 0.0        # Fraction of chat requests that get a fault
+    faults: List[str] = ["error"]  # Fault modes drawn from when a fault fires
+    slow_factor: float = 10.0      # Prefill multiplier for slow_first_token
+    seed: int = 0
+    script: Optional[str] = None   # Path to a JSON list of {"match", "response"}
+    embed_dim: int = 256           # /api/embed vector size
+
+
+# ===== SCRIPTED RESPONSES =====
+
+EMOTION_KEYWORDS = [
+    ("anxiety", ("anxious", "exam", "worried", "panic", "overwhelmed", "can't sleep")),
+    ("sadness", ("sad", "lonely", "not good enough", "cry", "empty")),
+    ("anger", ("angry", "hate", "furious", "yell")),
+    ("joy", ("happy", "better", "calm", "great", "excited")),
+]
+
+SUPPORT_MESSAGES = [
+    "Carrying all of that at once is a lot - you noticed it, which is the first step.",
+    "It makes sense this feels heavy right now; it will not always feel this size.",
+    "You are paying attention to how you feel, and that matters more than it seems.",
+]
+
+CHAT_REPLIES = [
+    "That sounds really heavy, and it makes sense that you feel worn down.",
+    "When everything piles up at once it is hard to see which part to pick up first.",
+    "You have clearly been trying hard, even if it does not feel like enough right now.",
+    "What would make tonight feel even a little lighter for you?",
+    "Sometimes the smallest next step is the one that gets things moving again.",
+]
+
+SIA_TIPS = [
+    ("Writing it down can untangle a busy mind. Let's open your journal.", "open:journal"),
+    ("A quick doodle can say what words can't. Try the Mood Doodle.", "open:doodle"),
+    ("There's a short guide that might help here.", "navigate:knowledge"),
+]
+
+
+def _digest(text: str) -> int:
+    return int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "big")
+
+
+def _emotion_for(text: str) -> str:
+    lowered = text.lower()
+    for emotion, keywords in EMOTION_KEYWORDS:
+        if any(keyword in lowered for keyword in keywords):
+            return emotion
+    return "neutral"
+
+
+def _think(system: str, note: str) -> str:
+    """A short reasoning block when the prompt asks for <think> tags"""
+    return f"<think>\n{note}\n</think>\n" if "<think>" in system else ""
+
+
+def _sentiment(system: str, user: str, rng: random.Random) -> str:
+    emotion = _emotion_for(user)
+    negative = emotion in ("anxiety", "sadness", "anger")
+    return json.dumps({
+        "primary_emotion": emotion,
+        "primary_intensity": round(0.4 + rng.random() * 0.5, 2),
+        "emotional_tone": round((-0.6 if negative else 0.4) + rng.random() * 0.2, 2),
+        "urgency_level": round(rng.random() * (0.5 if negative else 0.2), 2),
+        "risk_score": rng.randint(3, 6) if negative else rng.randint(0, 2),
+        "support_message": rng.choice(SUPPORT_MESSAGES)
+    }, indent=4)
+
+
+def _masking(system: str, user: str, rng: random.Random) -> str:
+    lowered = user.lower()
+    detected = any(phrase in lowered for phrase in ("i'm fine", "just tired", "lol", "haha", "whatever"))
+    body = json.dumps({
+        "masking_detected": detected,
+        "confidence": round(0.6 + rng.random() * 0.3, 2) if detected else 0.2,
+        "surface_emotion": "joy" if detected else _emotion_for(user),
+        "underlying_emotion": "sadness" if detected else _emotion_for(user),
+        "masking_type": "minimizing" if detected else "none",
+        "indicators": ["dismissive language"] if detected else [],
+        "gentle_observation": "It's okay if things are not actually fine right now."
+    }, indent=4)
+    return _think(system, "Checking for minimizing or deflecting language.") + body
+
+
+def _visual(system: str, user: str, rng: random.Random) -> str:
+    body = json.dumps({
+        "visual_emotion": rng.choice(["calm", "anxiety", "sadness", "joy"]),
+        "emotional_intensity": round(0.3 + rng.random() * 0.5, 2),
+        "energy_level": rng.choice(["low", "medium", "high"]),
+        "tension_indicators": ["dense strokes"],
+        "expressive_quality": "loose, quick lines",
+        "visual_risk_score": rng.randint(1, 5),
+        "interpretation": "A busy page that suggests a lot on the mind."
+    }, indent=4)
+    return _think(system, "Looking at line quality, pressure and use of space.") + body
+
+
+def _sia(system: str, user: str, rng: random.Random) -> str:
+    tip, action = rng.choice(SIA_TIPS)
+    return f"{tip} [ACTION: {action}]"
+
+
+def _translation(system: str, user: str, rng: random.Random) -> str:
+    language = re.search(r"Target Language:\s*(.+)", user)
+    text = user.split("Text to Translate:\n", 1)[-1]
+    return f"[{language.group(1).strip() if language else 'translated'}] {text}"
+
+
+def _chat(system: str, user: str, rng: random.Random) -> str:
+    return " ".join(rng.sample(CHAT_REPLIES, rng.randint(2, 4)))
+
+
+# (system prompt marker, builder) - first match wins, _chat is the fallback
+BUILTIN_RESPONSES: List[Tuple[str, Callable[[str, str, random.Random], str]]] = [
+    ('"primary_emotion"', _sentiment),
+    ('"masking_detected"', _masking),
+    ('"visual_emotion"', _visual),
+    ("You are Sia", _sia),
+    ("multilingual translator", _translation),
+]
+
+MALFORMED_RESPONSE = "Sure! Here is my analysis: {\"primary_emotion\": \"anx"
+
+
+def load_script(path: Optional[str]) -> List[Dict[str, str]]:
+    if not path:
+        return []
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def response_text(messages: List[Dict[str, Any]], script: List[Dict[str, str]]) -> str:
+    """Deterministic reply for a chat request - depends only on the messages"""
+    system = next((m.get("content", "") for m in messages if m.get("role") == "system"), "")
+    user = next((m.get("content", "") for m in reversed(messages) if m.get("role") == "user"), "")
+
+    for entry in script:
+        if entry["match"] in system:
+            return entry["response"].replace("{user}", user)
+
+    rng = random.Random(_digest(system + "\x00" + user))
+    for marker, builder in BUILTIN_RESPONSES:
+        if marker in system:
+            return builder(system, user, rng)
+    return _chat(system, user, rng)
+
+
+def _tokenize(text: str) -> List[str]:
+    """Whitespace-preserving word pieces - one piece per simulated token"""
+    return re.findall(r"\S+\s*|\s+", text)
+
+
+def _apply_limits(tokens: List[str], options: Dict[str, Any]):
+    """Cut at num_predict tokens or the first stop sequence; returns (tokens, done_reason)"""
+    limit = options.get("num_predict")
+    done_reason = "stop"
+    if isinstance(limit, int) and 0 <= limit < len(tokens):
+        tokens = tokens[:limit]
+        done_reason = "length"
+
+    stops = options.get("stop") or []
+    text = "".join(tokens)
+    cut = min((text.find(s) for s in stops if s and s in text), default=-1)
+    if cut >= 0:
+        return _tokenize(text[:cut]), "stop"
+    return tokens, done_reason
+
+
+def _prompt_tokens(messages: List[Dict[str, Any]]) -> int:
+    """~4 characters per token, plus a fixed block per image"""
+    chars = sum(len(m.get("content", "")) for m in messages)
+    images = sum(len(m.get("images") or []) for m in messages)
+    return chars // 4 + images * IMAGE_TOKENS
+
+
+def _embedding(text: str, dim: int) -> List[float]:
+    """Signed feature hashing of 5-letter word stems, L2-normalised"""
+    vector = [0.0] * dim
+    for word in re.findall(r"[a-z]+", text.lower()):
+        digest = _digest(word[:5])
+        vector[digest % dim] += 1.0 if digest >> 63 else -1.0
+    norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+    return [v / norm for v in vector]
+
+
+def create_app(config: FakeOllamaConfig) -> FastAPI:
+    app = FastAPI(title="Fake Ollama", docs_url=None, redoc_url=None)
+    state = {
+        "config": config,
+        "rng": random.Random(config.seed),
+        "script": load_script(config.script),
+        "stats": {"requests": 0, "streamed": 0, "images": 0, "embedded": 0,
+                  "faults": {mode: 0 for mode in FAULT_MODES}},
+    }
+
+    def prefill_seconds() -> float:
+        cfg = state["config"]
+        if cfg.latency_sigma <= 0:
+            return cfg.latency_ms / 1000
+        return state["rng"].lognormvariate(math.log(max(cfg.latency_ms, 1e-3) / 1000), cfg.latency_sigma)
+
+    def pick_fault() -> Optional[str]:
+        cfg = state["config"]
+        if cfg.fault_rate <= 0 or state["rng"].random() >= cfg.fault_rate:
+            return None
+        fault = state["rng"].choice(cfg.faults)
+        state["stats"]["faults"][fault] += 1
+        return fault
+
+    @app.get("/api/tags")
+    async def tags():
+        model = state["config"].model
+        return {"models": [{"name": model, "model": model}]}
+
+    @app.get("/fake/stats")
+    async def stats():
+        return state["stats"]
+
+    @app.get("/fake/config")
+    async def get_config():
+        return state["config"].model_dump()
+
+    @app.post("/fake/config")
+    async def set_config(request: Request):
+        """Merge new settings and restart the seeded stream"""
+        updated = FakeOllamaConfig(**{**state["config"].model_dump(), **(await request.json())})
+        state.update(config=updated, rng=random.Random(updated.seed), script=load_script(updated.script))
+        return updated.model_dump()
+
+    @app.post("/api/embed")
+    async def embed(request: Request):
+        cfg = state["config"]
+        body = await request.json()
+        inputs = body.get("input", [])
+        inputs = [inputs] if isinstance(inputs, str) else inputs
+        state["stats"]["embedded"] += len(inputs)
+        started = time.perf_counter_ns()
+        embeddings = [_embedding(text, cfg.embed_dim) for text in inputs]
+        return {
+            "model": body.get("model", cfg.model),
+            "embeddings": embeddings,
+            "prompt_eval_count": sum(len(text) // 4 for text in inputs),
+            "total_duration": time.perf_counter_ns() - started,
+        }
+
+    @app.post("/api/chat")
+    async def chat(request: Request):
+        cfg = state["config"]
+        body = await request.json()
+        messages = body.get("messages", [])
+        streaming = body.get("stream", True)
+        state["stats"]["requests"] += 1
+        state["stats"]["streamed"] += int(bool(streaming))
+        state["stats"]["images"] += sum(len(m.get("images") or []) for m in messages)
+
+        fault = pick_fault()
+        prefill = prefill_seconds()
+        if fault == "error":
+            return JSONResponse({"error": "injected failure"}, status_code=500)
+        if fault == "model_missing":
+            return JSONResponse({"error": f"model '{body.get('model')}' not found"}, status_code=404)
+        if fault == "timeout":
+            await asyncio.sleep(3600)
+        if fault == "slow_first_token":
+            prefill *= cfg.slow_factor
+
+        text = MALFORMED_RESPONSE if fault == "malformed" else response_text(messages, state["script"])
+        tokens, done_reason = _apply_limits(_tokenize(text), body.get("options", {}))
+        if fault == "truncate":
+            tokens = tokens[:len(tokens) // 2]
+        token_delay = 1 / cfg.tokens_per_sec if cfg.tokens_per_sec > 0 else 0
+        started = time.perf_counter_ns()
+
+        def final_fields() -> Dict[str, Any]:
+            total = time.perf_counter_ns() - started
+            return {
+                "model": cfg.model,
+                "done": True,
+                "done_reason": done_reason,
+                "prompt_eval_count": _prompt_tokens(messages),
+                "eval_count": len(tokens),
+                "prompt_eval_duration": int(prefill * 1e9),
+                "eval_duration": max(0, total - int(prefill * 1e9)),
+                "total_duration": total,
+            }
+
+        if streaming:
+            async def stream():
+                await asyncio.sleep(prefill)
+                for token in tokens:
+                    yield json.dumps({
+                        "model": cfg.model,
+                        "message": {"role": "assistant", "content": token},
+                        "done": False
+                    }) + "\n"
+                    await asyncio.sleep(token_delay)
+                if fault == "truncate":
+                    return  # Connection ends without the done chunk
+                yield json.dumps({
+                    **final_fields(),
+                    "message": {"role": "assistant", "content": ""}
+                }) + "\n"
+            return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+        await asyncio.sleep(prefill + token_delay * len(tokens))
+        if fault == "truncate":
+            # Body cut mid-JSON, as seen when the server dies mid-response
+            partial = json.dumps({"model": cfg.model, "message": {"role": "assistant", "content": "".join(tokens)}})
+            return StreamingResponse(iter([partial[:len(partial) // 2]]), media_type="application/json")
+        return {
+            **final_fields(),
+            "message": {"role": "assistant", "content": "".join(tokens)}
+        }
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Deterministic fake Ollama server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11434)
+    parser.add_argument("--model", default=FakeOllamaConfig().model)
+    parser.add_argument("--latency-ms", type=float, default=FakeOllamaConfig().latency_ms)
+    parser.add_argument("--latency-sigma", type=float, default=FakeOllamaConfig().latency_sigma)
+    parser.add_argument("--tokens-per-sec", type=float, default=FakeOllamaConfig().tokens_per_sec)
+    parser.add_argument("--fault-rate", type=float, default=0.0)
+    parser.add_argument("--faults", nargs="+", choices=FAULT_MODES, default=["error"])
+    parser.add_argument("--slow-factor", type=float, default=FakeOllamaConfig().slow_factor)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--script", help="JSON list of {match, response} overrides")
+    parser.add_argument("--embed-dim", type=int, default=FakeOllamaConfig().embed_dim)
+    args = parser.parse_args()
+
+    import uvicorn
+    config = FakeOllamaConfig(**{
+        field: getattr(args, field) for field in FakeOllamaConfig.model_fields
+    })
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+"""
+PDF -> knowledge base corpus ingestion.
+
+Extracts every page of one or more PDFs (files or directories of PDFs) in a
+process pool, normalises the text (ligatures, soft hyphens, words hyphenated
+across line breaks, runs of whitespace) and streams it to the corpus file
+with the "--- PAGE N ---" markers the knowledge base splits on. Pages are
+written in order as their chunk completes, so memory stays flat however
+large the handbook; the file is swapped in atomically at the end, which
+also makes it safe under RAG_WATCH_SECONDS hot reload. A PDF that cannot
+be opened is reported and skipped; a failed run leaves no partial file.
+
+The written corpus is then indexed exactly as the API will index it
+(passage count reported), and with --embed its embeddings are built too.
+
+Needs pypdf (or PyPDF2); --embed also needs numpy and a running Ollama.
+Run from backend/.
+
+Usage:
+    python tools/ingest_pdf.py "assets/Counselling and Guidance By Rao.pdf"
+    python tools/ingest_pdf.py pdfs/ --corpus study_skills --workers 8
+    python tools/ingest_pdf.py handbook.pdf --embed --dtype int8
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+import unicodedata
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import pypdf
+except ImportError:
+    try:
+        import PyPDF2 as pypdf
+    except ImportError:
+        pypdf = None
+
+# Add backend directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import settings
+from services import vector_index
+from services.knowledge_base import CORPUS_DIR, DEFAULT_CORPUS, KnowledgeBaseRegistry
+
+HANDBOOK_PATH = "data/counseling_handbook.txt"
+
+# "coun-\nselling" -> "counselling" (only when the next line continues in lowercase)
+_HYPHEN_BREAK = re.compile(r"(\w)[-\u00ad][ \t]*\n[ \t]*(?=[a-z])")
+_SPACES = re.compile(r"[ \t\f\v]+")
+_BLANK_LINES = re.compile(r"\n{3,}")
+
+_readers = {}  # Per worker process: path -> PdfReader, opened once
+
+
+def normalize_text(text: str) -> str:
+    """Clean one page of extracted text"""
+    text = unicodedata.normalize("NFKC", text)  # Ligatures (fi, fl) and non-breaking spaces
+    text = text.replace("\r\n", "\n").replace("\r", "\n")
+    text = _HYPHEN_BREAK.sub(r"\1", text)
+    text = text.replace("\u00ad", "")
+    lines = (_SPACES.sub(" ", line).strip() for line in text.split("\n"))
+    return _BLANK_LINES.sub("\n\n", "\n".join(lines)).strip()
+
+
+def extract_pages(path: str, first: int, last: int):
+    """(normalised texts, failed page count) for pages first..last-1 - runs in a worker"""
+    reader = _readers.get(path)
+    if reader is None:
+        try:
+            reader = _readers[path] = pypdf.PdfReader(path)
+        except Exception:
+            return [""] * (last - first), last - first
+    texts, failed = [], 0
+    for i in range(first, last):
+        try:
+            texts.append(normalize_text(reader.pages[i].extract_text() or ""))
+        except Exception:
+            texts.append("")
+            failed += 1
+    return texts, failed
+
+
+def find_pdfs(inputs):
+    """PDF paths in the order given; a directory contributes its *.pdf files sorted by name"""
+    paths = []
+    for item in inputs:
+        if os.path.isdir(item):
+            paths.extend(os.path.join(item, name) for name in sorted(os.listdir(item))
+                         if name.lower().endswith(".pdf"))
+        else:
+            paths.append(item)
+    return paths
+
+
+def count_pages(paths):
+    """{path: page count} for the PDFs that open; unreadable ones are reported and skipped"""
+    counts = {}
+    for path in paths:
+        try:
+            counts[path] = len(pypdf.PdfReader(path).pages)
+        except Exception as e:
+            print(f"⚠️ Skipping {path}: cannot read PDF ({type(e).__name__}: {e})")
+            continue
+        print(f"📖 {path}: {counts[path]} pages")
+    return counts
+
+
+def ingest(counts, output: str, workers: int, chunk_pages: int):
+    """Extract all pages of {path: page count} into `output`; returns (pages, characters, failed pages)"""
+    chunks = []
+    for path, count in counts.items():
+        chunks.extend((path, first, min(first + chunk_pages, count)) for first in range(0, count, chunk_pages))
+
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    partial = f"{output}.partial"
+    pages = characters = failed = 0
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool, open(partial, "w", encoding="utf-8") as f:
+            # A bounded window of chunks in flight: workers stay busy, results are written in order
+            tasks, pending = iter(chunks), deque()
+            for chunk in tasks:
+                pending.append(pool.submit(extract_pages, *chunk))
+                if len(pending) >= workers * 2:
+                    break
+            while pending:
+                texts, chunk_failed = pending.popleft().result()
+                next_chunk = next(tasks, None)
+                if next_chunk:
+                    pending.append(pool.submit(extract_pages, *next_chunk))
+                for text in texts:
+                    pages += 1
+                    f.write(f"\n--- PAGE {pages} ---\n{text}\n")
+                    characters += len(text)
+                failed += chunk_failed
+                print(f"\r⏳ Extracted {pages} pages", end="", flush=True)
+        print()
+        os.replace(partial, output)
+    finally:
+        if os.path.exists(partial):  # Failed or interrupted - the old corpus stays as it was
+            os.remove(partial)
+    return pages, characters, failed
+
+
+def ingest_pdf():
+    parser = argparse.ArgumentParser(description="Extract PDFs into a knowledge base corpus")
+    parser.add_argument("inputs", nargs="+", help="PDF files and/or directories of PDFs")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS,
+                        help="Corpus to write: handbook, or a name for data/corpora/<name>.txt")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-pages", type=int, default=8, help="Pages per worker task")
+    parser.add_argument("--embed", action="store_true", help="Also build the corpus embeddings (needs Ollama)")
+    parser.add_argument("--model", default=settings.OLLAMA_EMBED_MODEL, help="Ollama embedding model for --embed")
+    parser.add_argument("--ollama-url", default=settings.OLLAMA_BASE_URL)
+    parser.add_argument("--dtype", choices=vector_index.DTYPES, default="float16")
+    args = parser.parse_args()
+
+    if pypdf is None:
+        print("❌ Neither pypdf nor PyPDF2 is installed.")
+        sys.exit(1)
+    if args.embed and not vector_index.available():
+        print("❌ --embed needs numpy (pip install numpy)")
+        sys.exit(1)
+    paths = find_pdfs(args.inputs)
+    missing = [path for path in paths if not os.path.isfile(path)]
+    if not paths or missing:
+        print(f"❌ No PDFs to ingest{': missing ' + ', '.join(missing) if missing else ''}")
+        sys.exit(1)
+
+    relative = HANDBOOK_PATH if args.corpus == DEFAULT_CORPUS else os.path.join(CORPUS_DIR, f"{args.corpus}.txt")
+    output = os.path.join(os.getcwd(), relative)
+    started = time.perf_counter()
+    counts = count_pages(paths)
+    if not counts:
+        print("❌ None of the PDFs could be read - corpus left unchanged")
+        sys.exit(1)
+    pages, characters, failed = ingest(counts, output, max(1, args.workers), max(1, args.chunk_pages))
+    elapsed = time.perf_counter() - started
+    print(f"✅ {pages} pages ({characters:,} characters) written to {output} "
+          f"in {elapsed:.1f}s ({pages / elapsed:.0f} pages/s, {args.workers} workers)")
+    if failed:
+        print(f"⚠️ {failed} pages could not be extracted and were left empty")
+    if len(counts) < len(paths):
+        print(f"⚠️ {len(paths) - len(counts)} of {len(paths)} PDFs could not be read and were skipped")
+
+    # Index the corpus the way the API will, so a bad extraction shows up here
+    kb = KnowledgeBaseRegistry().corpora[args.corpus]
+    kb.mode = "keyword"  # Chunk only - embeddings (if any) are rebuilt below
+    if not kb.load_data():
+        sys.exit(1)
+    if args.embed:
+        from tools.build_embeddings import build_index
+        index, path, rate = build_index(kb, args.model, args.ollama_url, args.dtype)
+        print(f"✅ {len(index)} x {index.dim} {args.dtype} embeddings written to {path}.npy ({rate:.0f} passages/s)")
+    elif os.path.exists(f"{kb.embeddings_path}.json"):
+        print(f"⚠️ Existing embeddings are now stale - rebuild with: python tools/build_embeddings.py --corpus {args.corpus}")
+
+
+if __name__ == "__main__":
+    ingest_pdf()
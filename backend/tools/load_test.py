@@ -0,0 +1,223 @@
+"""
+Offline load test for the whole API.
+
+Starts tools/fake_ollama.py and the FastAPI app (uvicorn) as subprocesses,
+points the app at the fake model with OLLAMA_BASE_URL, then drives
+concurrent mixed traffic over /api/chat, /api/analyze, /api/quick-check,
+/api/sia and /api/translate. Reports throughput, errors and p50/p95/p99
+latency per endpoint. Needs no model and no GPU.
+
+Usage:
+    python tools/load_test.py
+    python tools/load_test.py --concurrency 32 --duration 30 --latency-ms 500 --fault-rate 0.02 --faults error truncate
+    python tools/load_test.py --mix chat=1 quick-check=10 --json load.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+import httpx
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MESSAGES = [
+    "I feel so overwhelmed with exams, I can't sleep at night.",
+    "Honestly today was better, I went for a walk and felt calm.",
+    "My friends don't get it and I keep thinking I'm not good enough.",
+    "I'm fine, everything is fine, just tired I guess.",
+    "How do I stop procrastinating on my thesis?",
+]
+CHAT_MODES = ["compassionate_friend", "academic_coach", "best_friend", "mother", "carl_rogers"]
+LANGUAGES = ["Hindi", "Spanish", "French", "Tamil"]
+
+# Relative weights - typing feedback is far more frequent than full analyses
+DEFAULT_MIX = {"chat": 3, "analyze": 2, "quick-check": 8, "sia": 2, "translate": 1}
+
+
+def build_request(endpoint: str, rng: random.Random):
+    """(method, path, json body) for one synthetic request"""
+    message = rng.choice(MESSAGES)
+    if endpoint == "chat":
+        return "POST", "/api/chat", {"message": message, "mode": rng.choice(CHAT_MODES), "history": []}
+    if endpoint == "analyze":
+        return "POST", "/api/analyze", {"text": message}
+    if endpoint == "quick-check":
+        return "POST", "/api/quick-check", {"text": message}
+    if endpoint == "sia":
+        return "POST", "/api/sia", {"message": message, "context": "general", "history": []}
+    if endpoint == "translate":
+        return "POST", "/api/translate", {"text": message, "target_language": rng.choice(LANGUAGES)}
+    raise ValueError(f"Unknown endpoint: {endpoint}")
+
+
+def percentile(sorted_values, pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[rank]
+
+
+def summarize(samples, elapsed: float):
+    """samples: {endpoint: [(latency_s, ok)]} -> per-endpoint report rows"""
+    report = {}
+    for endpoint, entries in sorted(samples.items()):
+        latencies = sorted(latency for latency, _ in entries)
+        errors = sum(1 for _, ok in entries if not ok)
+        report[endpoint] = {
+            "requests": len(entries),
+            "errors": errors,
+            "throughput_rps": len(entries) / elapsed,
+            "p50_ms": percentile(latencies, 50) * 1000,
+            "p95_ms": percentile(latencies, 95) * 1000,
+            "p99_ms": percentile(latencies, 99) * 1000,
+        }
+    return report
+
+
+async def wait_until_ready(url: str, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get(url, timeout=2.0)).status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"Timed out waiting for {url}")
+
+
+async def run_load(base_url: str, mix, concurrency: int, duration: float, seed: int, timeout: float):
+    endpoints = list(mix)
+    weights = [mix[e] for e in endpoints]
+    samples = defaultdict(list)
+    deadline = time.monotonic() + duration
+
+    async def worker(worker_id: int, client: httpx.AsyncClient):
+        rng = random.Random(seed * 1000 + worker_id)
+        while time.monotonic() < deadline:
+            endpoint = rng.choices(endpoints, weights)[0]
+            method, path, body = build_request(endpoint, rng)
+            started = time.perf_counter()
+            try:
+                response = await client.request(method, path, json=body)
+                ok = response.status_code == 200
+            except httpx.HTTPError:
+                ok = False
+            samples[endpoint].append((time.perf_counter() - started, ok))
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(i, client) for i in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    return samples, elapsed
+
+
+def start_servers(args):
+    """Launch fake Ollama and the API; returns (processes, api base URL)"""
+    fake_cmd = [
+        sys.executable, os.path.join(BACKEND_DIR, "tools", "fake_ollama.py"),
+        "--port", str(args.ollama_port),
+        "--latency-ms", str(args.latency_ms),
+        "--latency-sigma", str(args.latency_sigma),
+        "--tokens-per-sec", str(args.tokens_per_sec),
+        "--fault-rate", str(args.fault_rate),
+        "--faults", *args.faults,
+        "--seed", str(args.seed),
+    ]
+    env = {**os.environ, "OLLAMA_BASE_URL": f"http://127.0.0.1:{args.ollama_port}", "DEBUG": "false"}
+    api_cmd = [
+        sys.executable, "-m", "uvicorn", "main:app",
+        "--host", "127.0.0.1", "--port", str(args.api_port),
+        "--workers", str(args.workers), "--log-level", "warning",
+    ]
+    output = None if args.verbose else subprocess.DEVNULL
+    processes = [
+        subprocess.Popen(fake_cmd, cwd=BACKEND_DIR, stdout=output, stderr=output),
+        subprocess.Popen(api_cmd, cwd=BACKEND_DIR, env=env, stdout=output, stderr=output),
+    ]
+    return processes, f"http://127.0.0.1:{args.api_port}"
+
+
+def parse_mix(items):
+    if not items:
+        return dict(DEFAULT_MIX)
+    mix = {}
+    for item in items:
+        name, _, weight = item.partition("=")
+        if name not in DEFAULT_MIX:
+            raise SystemExit(f"Unknown endpoint in --mix: {name} (choose from {', '.join(DEFAULT_MIX)})")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+async def load_test():
+    parser = argparse.ArgumentParser(description="Offline load test against a fake Ollama")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=15.0, help="Seconds of load")
+    parser.add_argument("--mix", nargs="+", help="endpoint=weight pairs, e.g. chat=3 quick-check=8")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Per-request client timeout")
+    parser.add_argument("--api-port", type=int, default=8765)
+    parser.add_argument("--ollama-port", type=int, default=11555)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--latency-ms", type=float, default=300.0, help="Fake model median prefill latency")
+    parser.add_argument("--latency-sigma", type=float, default=0.5, help="Fake model log-normal spread")
+    parser.add_argument("--tokens-per-sec", type=float, default=40.0, help="Fake model generation rate")
+    parser.add_argument("--fault-rate", type=float, default=0.0, help="Fraction of fake model calls that get a fault")
+    parser.add_argument("--faults", nargs="+", default=["error"], help="Fault modes (see tools/fake_ollama.py)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", dest="json_path", help="Write the report to this JSON file")
+    parser.add_argument("--verbose", action="store_true", help="Show server output")
+    args = parser.parse_args()
+    mix = parse_mix(args.mix)
+
+    processes, base_url = start_servers(args)
+    try:
+        print("⏳ Starting fake Ollama and API...")
+        await wait_until_ready(f"http://127.0.0.1:{args.ollama_port}/api/tags")
+        await wait_until_ready(f"{base_url}/health")
+
+        print(f"🚀 {args.concurrency} users for {args.duration:.0f}s, mix: "
+              + ", ".join(f"{e}={w:g}" for e, w in mix.items()))
+        samples, elapsed = await run_load(base_url, mix, args.concurrency, args.duration, args.seed, args.timeout)
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+    report = summarize(samples, elapsed)
+    total = sum(row["requests"] for row in report.values())
+    total_errors = sum(row["errors"] for row in report.values())
+
+    print(f"\n{'endpoint':<12} {'reqs':>6} {'errors':>6} {'req/s':>7} | {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for endpoint, row in report.items():
+        print(f"{endpoint:<12} {row['requests']:>6} {row['errors']:>6} {row['throughput_rps']:>7.1f} | "
+              f"{row['p50_ms']:>8.1f} {row['p95_ms']:>8.1f} {row['p99_ms']:>8.1f}")
+    print(f"\n📊 Total: {total} requests in {elapsed:.1f}s ({total / elapsed:.1f} req/s), {total_errors} errors")
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "config": {k: v for k, v in vars(args).items() if k != "json_path"},
+                "mix": mix,
+                "elapsed_s": elapsed,
+                "endpoints": report,
+            }, f, indent=2)
+        print(f"✅ Report written to: {args.json_path}")
+
+
+if __name__ == "__main__":
+    asyncio.run(load_test())
@@ -0,0 +1,197 @@
+"""
+Per-persona prompt size and prefill cost report.
+
+For every ChatMode, assembles the chat system prompt exactly as /api/chat
+does (HUMAN_REALITY_FILTER + persona, with and without a typical RAG block),
+counts its tokens and estimates prefill time. The typical message must clear
+the RAG relevance gate - exits 1 if it does not, since the +RAG columns
+would silently equal the base ones. Personas whose prompt is an
+outlier (outside 1.5x the interquartile range) are flagged.
+
+Token counts are a heuristic estimate by default. With --ollama-url every
+prompt is sent once with num_predict=1 and Ollama's own prompt_eval_count and
+prompt_eval_duration are used instead (exact tokens, measured prefill rate).
+
+Also checks prompts.py for duplicated dict keys (e.g. a second
+ChatMode.THE_PET entry silently replacing the first) - exits 1 if found.
+
+Usage:
+    python tools/prompt_cost_report.py
+    python tools/prompt_cost_report.py --prefill-tps 180 --json prompt_costs.json
+    python tools/prompt_cost_report.py --ollama-url http://localhost:11434
+"""
+
+import argparse
+import ast
+import contextlib
+import io
+import json
+import math
+import os
+import sys
+import uuid
+
+import httpx
+
+# Add backend directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.schemas import ChatMode
+from persona_registry import personas
+from prompts import HUMAN_REALITY_FILTER
+from routers.chat import build_system_prompt
+from services.knowledge_base import is_relevant, knowledge_bases
+from services.token_policy import estimate_tokens
+
+PROMPTS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "prompts.py")
+
+# A substantive message that triggers the RAG block, and a greeting that doesn't
+TYPICAL_MESSAGE = "I feel lonely at college and anxious about making friends"
+GREETING_MESSAGE = "hi"
+
+def find_duplicate_keys(path: str = PROMPTS_PATH):
+    """[(dict name, key source, first line, duplicate line)] for literal dicts in a module"""
+    with open(path, "r", encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=path)
+
+    duplicates = []
+    for node in ast.walk(tree):
+        if not isinstance(node, ast.Assign) or not isinstance(node.value, ast.Dict):
+            continue
+        name = ", ".join(ast.unparse(target) for target in node.targets)
+        seen = {}
+        for key in node.value.keys:
+            if key is None:  # **unpacking
+                continue
+            source = ast.unparse(key)
+            if source in seen:
+                duplicates.append((name, source, seen[source], key.lineno))
+            else:
+                seen[source] = key.lineno
+    return duplicates
+
+
+def assemble_prompts():
+    """{mode: {"persona": str, "base": str, "with_rag": str}} using the chat router's builder"""
+    knowledge_bases.load_all()
+    results = knowledge_bases.search(TYPICAL_MESSAGE, limit=1)
+    if not results or not is_relevant(results[0]):
+        score = f"bm25 {results[0]['bm25']:.3f}, {results[0]['matched']} terms" if results else "no match"
+        print(f"❌ TYPICAL_MESSAGE does not clear the RAG relevance gate ({score}) - pick one that does")
+        sys.exit(1)
+    prompts = {}
+    with contextlib.redirect_stdout(io.StringIO()):  # builder logs every call
+        for mode in ChatMode:
+            prompts[mode.value] = {
+                "persona": personas.get(mode, ""),
+                "base": build_system_prompt(mode, GREETING_MESSAGE),
+                "with_rag": build_system_prompt(mode, TYPICAL_MESSAGE),
+            }
+    return prompts
+
+
+def measure_with_ollama(url: str, model: str, system_prompt: str):
+    """(prompt tokens, prefill seconds) from a real prefill; a nonce defeats the prompt cache"""
+    response = httpx.post(f"{url}/api/chat", json={
+        "model": model,
+        "stream": False,
+        "messages": [
+            {"role": "system", "content": f"[{uuid.uuid4().hex[:8]}]\n{system_prompt}"},
+            {"role": "user", "content": GREETING_MESSAGE},
+        ],
+        "options": {"num_predict": 1},
+    }, timeout=300.0)
+    response.raise_for_status()
+    data = response.json()
+    return data.get("prompt_eval_count", 0), data.get("prompt_eval_duration", 0) / 1e9
+
+
+def quartiles(values):
+    ordered = sorted(values)
+
+    def at(fraction):
+        position = (len(ordered) - 1) * fraction
+        low, high = math.floor(position), math.ceil(position)
+        return ordered[low] + (ordered[high] - ordered[low]) * (position - low)
+
+    return at(0.25), at(0.5), at(0.75)
+
+
+def prompt_cost_report():
+    parser = argparse.ArgumentParser(description="Per-persona prompt size and prefill cost")
+    parser.add_argument("--prefill-tps", type=float, default=250.0,
+                        help="Prefill tokens/sec used for estimates (ignored with --ollama-url)")
+    parser.add_argument("--ollama-url", help="Measure exact tokens and prefill time on this Ollama")
+    parser.add_argument("--model", default=None, help="Model for --ollama-url (default: settings)")
+    parser.add_argument("--json", dest="json_path", help="Write the report to this JSON file")
+    args = parser.parse_args()
+
+    duplicates = find_duplicate_keys()
+    prompts = assemble_prompts()
+    rows = {}
+
+    if args.ollama_url:
+        from config import settings
+        model = args.model or settings.OLLAMA_MODEL
+        print(f"⏳ Measuring {len(prompts)} prompts on {args.ollama_url} ({model})...")
+        measured_tokens = measured_seconds = 0
+        for mode, parts in prompts.items():
+            base_tokens, base_seconds = measure_with_ollama(args.ollama_url, model, parts["base"])
+            rag_tokens, rag_seconds = measure_with_ollama(args.ollama_url, model, parts["with_rag"])
+            rows[mode] = {"base_tokens": base_tokens, "rag_tokens": rag_tokens,
+                          "base_prefill_s": base_seconds, "rag_prefill_s": rag_seconds}
+            measured_tokens += base_tokens + rag_tokens
+            measured_seconds += base_seconds + rag_seconds
+        prefill_tps = measured_tokens / measured_seconds if measured_seconds else 0
+        source = "measured"
+    else:
+        prefill_tps = args.prefill_tps
+        for mode, parts in prompts.items():
+            base_tokens, rag_tokens = estimate_tokens(parts["base"]), estimate_tokens(parts["with_rag"])
+            rows[mode] = {"base_tokens": base_tokens, "rag_tokens": rag_tokens,
+                          "base_prefill_s": base_tokens / prefill_tps, "rag_prefill_s": rag_tokens / prefill_tps}
+        source = "estimated"
+
+    filter_tokens = estimate_tokens(HUMAN_REALITY_FILTER)
+    for mode, parts in prompts.items():
+        rows[mode]["persona_tokens"] = estimate_tokens(parts["persona"])
+        rows[mode]["persona_lines"] = parts["persona"].count("\n") + 1
+
+    q1, median, q3 = quartiles([row["persona_tokens"] for row in rows.values()])
+    high, low = q3 + 1.5 * (q3 - q1), q1 - 1.5 * (q3 - q1)
+    for row in rows.values():
+        row["outlier"] = "high" if row["persona_tokens"] > high else "low" if row["persona_tokens"] < low else None
+
+    print(f"\n🧮 Prompt cost per persona ({source} tokens, prefill at {prefill_tps:.0f} tok/s)")
+    print(f"   HUMAN_REALITY_FILTER alone: ~{filter_tokens} tokens, "
+          f"~{filter_tokens / prefill_tps * 1000:.0f} ms on every chat turn\n")
+    print(f"{'persona':<24} {'lines':>5} {'persona tk':>10} | {'total tk':>8} {'+RAG tk':>8} | "
+          f"{'prefill ms':>10} {'+RAG ms':>8}")
+    for mode, row in sorted(rows.items(), key=lambda item: -item[1]["rag_tokens"]):
+        flag = f"  ⚠️ {row['outlier']} outlier" if row["outlier"] else ""
+        print(f"{mode:<24} {row['persona_lines']:>5} {row['persona_tokens']:>10} | "
+              f"{row['base_tokens']:>8} {row['rag_tokens']:>8} | "
+              f"{row['base_prefill_s'] * 1000:>10.0f} {row['rag_prefill_s'] * 1000:>8.0f}{flag}")
+    print(f"\n📊 Persona tokens: median {median:.0f}, IQR {q1:.0f}-{q3:.0f}, "
+          f"outliers outside {max(low, 0):.0f}-{high:.0f}")
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "token_source": source,
+                "prefill_tps": prefill_tps,
+                "filter_tokens": filter_tokens,
+                "personas": rows,
+                "duplicate_keys": [list(d) for d in duplicates],
+            }, f, indent=2)
+        print(f"✅ Report written to: {args.json_path}")
+
+    if duplicates:
+        print("\n❌ DUPLICATE KEYS in prompts.py (the later entry silently wins):")
+        for name, key, first, again in duplicates:
+            print(f"  - {name}[{key}] defined on line {first} and again on line {again}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    prompt_cost_report()
@@ -0,0 +1,100 @@
+"""
+Cancellation check for coalesced Ollama calls.
+
+Drives OllamaClient.generate against a scripted upstream (no network, no
+model) with ENABLE_COALESCING on and verifies that the upstream generation
+is cancelled as soon as its last caller goes away - a client disconnect
+must still free the Ollama slot - while a caller that leaves a shared call
+early does not cancel it for the others.
+
+Usage:
+    python tools/verify_coalescing.py
+"""
+
+import asyncio
+import os
+import sys
+
+# Add backend directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import settings
+from services.ollama_client import OllamaClient, single_flight
+
+GENERATION_SECONDS = 0.5
+CANCEL_AFTER = 0.05
+
+# (name, callers, callers cancelled early, expected upstream outcome)
+SCENARIOS = [
+    ("single caller cancelled", 1, 1, "cancelled"),
+    ("one of two callers cancelled", 2, 1, "finished"),
+    ("every caller cancelled", 3, 3, "cancelled"),
+    ("nobody cancelled", 2, 0, "finished"),
+]
+
+
+class ScriptedClient(OllamaClient):
+    """Upstream calls sleep for GENERATION_SECONDS and log whether they finished or were cancelled"""
+
+    def __init__(self):
+        super().__init__()
+        self.upstream = []
+
+    async def _post_chat(self, payload, timeout):
+        loop = asyncio.get_running_loop()
+        try:
+            await asyncio.sleep(GENERATION_SECONDS)
+            self.upstream.append(("finished", loop.time()))
+            return {"message": {"role": "assistant", "content": "ok"}, "done": True}
+        except asyncio.CancelledError:
+            self.upstream.append(("cancelled", loop.time()))
+            raise
+
+
+async def run(callers: int, cancelled: int):
+    client = ScriptedClient()
+    loop = asyncio.get_running_loop()
+    tasks = [asyncio.ensure_future(client.generate("same prompt", endpoint="verify")) for _ in range(callers)]
+    started = loop.time()
+    await asyncio.sleep(CANCEL_AFTER)
+    for task in tasks[:cancelled]:
+        task.cancel()
+    answers = await asyncio.gather(*tasks, return_exceptions=True)
+    # Outlast the generation, so an upstream call nobody cancelled shows up as finished
+    await asyncio.sleep(max(0.0, started + GENERATION_SECONDS + 0.1 - loop.time()))
+    survivors = answers[cancelled:]
+    return client.upstream, started, survivors
+
+
+def verify_coalescing():
+    settings.ENABLE_COALESCING = True
+    errors = []
+
+    for name, callers, cancelled, expected in SCENARIOS:
+        upstream, started, survivors = asyncio.run(run(callers, cancelled))
+        problems = []
+        if len(upstream) != 1:
+            problems.append(f"{len(upstream)} upstream calls, expected one shared call")
+        elif upstream[0][0] != expected:
+            problems.append(f"upstream {upstream[0][0]}, expected {expected}")
+        elif expected == "cancelled" and upstream[0][1] - started >= GENERATION_SECONDS:
+            problems.append("upstream cancelled only after the generation would have finished")
+        if any(answer != "ok" for answer in survivors):
+            problems.append(f"remaining callers got {survivors}")
+        if single_flight.stats()["in_flight"]:
+            problems.append("entry left in flight")
+        if problems:
+            errors.append(f"{name}: " + "; ".join(problems))
+        else:
+            print(f"✅ {name}: upstream {upstream[0][0]}, {len(survivors)} caller(s) answered")
+
+    if errors:
+        print(f"\n❌ {len(errors)} coalescing check(s) failed:")
+        for error in errors:
+            print(f"  - {error}")
+        sys.exit(1)
+    print(f"\n✅ Coalescing cancellation verified ({len(SCENARIOS)} scenarios)")
+
+
+if __name__ == "__main__":
+    verify_coalescing()
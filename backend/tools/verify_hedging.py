@@ -0,0 +1,101 @@
+"""
+Timing check for hedged chat requests.
+
+Drives OllamaClient._hedged_chat against scripted backends (first-token
+delay, total generation time - no network, no model) and verifies that the
+losing attempt is cancelled as soon as a winner produces its first token,
+i.e. before the winner finishes, and that the loser's late first token
+never reaches the hedge delay statistics.
+
+Usage:
+    python tools/verify_hedging.py
+"""
+
+import asyncio
+import os
+import sys
+
+# Add backend directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import settings
+from services.ollama_client import OllamaClient, hedge_policy
+
+HEDGE_DELAY = 0.05
+
+# (name, primary (first token s, total s), hedge (first token s, total s), expected winner)
+SCENARIOS = [
+    ("hedge wins", (1.0, 1.2), (0.1, 0.5), "hedge"),
+    ("primary wins after hedging", (0.1, 0.5), (1.0, 1.2), "primary"),
+    ("primary before hedge delay", (0.02, 0.3), (0.01, 0.1), "primary"),
+]
+
+
+class ScriptedClient(OllamaClient):
+    """Attempts play back a script in launch order and log when they finish or are cancelled"""
+
+    def __init__(self, script):
+        super().__init__()
+        self.script = list(script)
+        self.events = {}
+
+    async def _stream_chat(self, base_url, payload, timeout, first_token):
+        loop = asyncio.get_running_loop()
+        name, (first, total) = self.script.pop(0)
+        started = loop.time()
+        try:
+            await asyncio.sleep(first)
+            hedge_policy.record_first_token(loop.time() - started)
+            first_token.set()
+            await asyncio.sleep(total - first)
+            self.events[name] = ("finished", loop.time())
+            return {"message": {"role": "assistant", "content": name}, "done": True}
+        except asyncio.CancelledError:
+            self.events[name] = ("cancelled", loop.time())
+            raise
+
+
+async def run(primary, hedge):
+    client = ScriptedClient([("primary", primary), ("hedge", hedge)])
+    samples = len(hedge_policy._first_token_samples)
+    data = await client._hedged_chat({}, client.timeout)
+    await asyncio.sleep(0)  # Let the cancelled loser run its handler
+    recorded = list(hedge_policy._first_token_samples)[samples:]
+    return data["message"]["content"], client.events, recorded
+
+
+def verify_hedging():
+    settings.HEDGE_INITIAL_DELAY = HEDGE_DELAY
+    errors = []
+
+    for name, primary, hedge, expected in SCENARIOS:
+        winner, events, recorded = asyncio.run(run(primary, hedge))
+        loser = "hedge" if winner == "primary" else "primary"
+        problems = []
+        if winner != expected:
+            problems.append(f"{winner} won, expected {expected}")
+        if events.get(winner, ("",))[0] != "finished":
+            problems.append(f"winner did not finish: {events.get(winner)}")
+        if loser in events:
+            state, at = events[loser]
+            if state != "cancelled":
+                problems.append(f"loser was not cancelled ({state})")
+            elif at >= events[winner][1]:
+                problems.append(f"loser cancelled only after the winner finished ({at:.3f} >= {events[winner][1]:.3f}s)")
+        if len(recorded) != 1:
+            problems.append(f"{len(recorded)} first-token samples recorded, expected only the winner's")
+        if problems:
+            errors.append(f"{name}: " + "; ".join(problems))
+        else:
+            print(f"✅ {name}: {winner} won, {loser} {'cancelled early' if loser in events else 'never launched'}")
+
+    if errors:
+        print(f"\n❌ {len(errors)} hedging check(s) failed:")
+        for error in errors:
+            print(f"  - {error}")
+        sys.exit(1)
+    print(f"\n✅ Hedging verified ({len(SCENARIOS)} scenarios)")
+
+
+if __name__ == "__main__":
+    verify_hedging()
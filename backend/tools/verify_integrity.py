@@ -6,27 +6,43 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from models.schemas import ChatMode
-from prompts import MODE_PROMPTS, MODE_INFO
+from prompts import MODE_INFO
+from persona_registry import personas
+from prompt_cost_report import find_duplicate_keys
+from services.knowledge_base import knowledge_bases
 
 def verify_integrity():
     errors = []
+    warnings = []
     
-    # Check 1: Do all ChatMode enum values have a prompt?
-    for mode in ChatMode:
-        if mode not in MODE_PROMPTS:
-            errors.append(f"MISSING PROMPT: ChatMode.{mode.name} ({mode.value}) is not in MODE_PROMPTS")
+    # Check 1: Does every ChatMode have a prompt file, and every file a ChatMode?
+    errors.extend(personas.verify())
     
     # Check 2: Do all ChatMode enum values have info?
     for mode in ChatMode:
         if mode not in MODE_INFO:
             errors.append(f"MISSING INFO: ChatMode.{mode.name} ({mode.value}) is not in MODE_INFO")
     
-    # Check 3: Are there prompts for modes that don't exist in the Enum?
-    for mode in MODE_PROMPTS:
-        if mode not in ChatMode:
-            errors.append(f"ORPHAN PROMPT: Key '{mode}' in MODE_PROMPTS is not in ChatMode Enum")
-            
-    # Check 4: Check categories in MODE_INFO match PersonalityCategory Enum (if I could import it easily, but I'll visually check or skip strict check for now)
+    # Check 3: Duplicated keys in prompts.py - a later entry silently replaces an earlier one
+    for name, key, first, again in find_duplicate_keys():
+        errors.append(f"DUPLICATE KEY: {name}[{key}] on line {first} is overridden on line {again}")
+    
+    # Check 4: RAG corpora declared per persona - a list of names; missing data is only a warning
+    for mode, info in MODE_INFO.items():
+        corpora = info.get("corpora")
+        if corpora is None:
+            continue
+        if not isinstance(corpora, list) or not corpora:
+            errors.append(f"BAD CORPORA: MODE_INFO[{mode.name}]['corpora'] must be a non-empty list")
+            continue
+        for name in corpora:
+            if name not in knowledge_bases:
+                warnings.append(f"NO CORPUS DATA: {mode.name} searches '{name}' but data/corpora/{name}.txt does not exist")
+    
+    # Check 5: Check categories in MODE_INFO match PersonalityCategory Enum (if I could import it easily, but I'll visually check or skip strict check for now)
+    
+    for w in warnings:
+        print(f"⚠️ {w}")
     
     if errors:
         print("❌ INTEGRITY CHECK FAILED:")
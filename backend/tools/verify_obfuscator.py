@@ -0,0 +1,85 @@
+"""
+Golden check for the privacy obfuscator.
+
+TextObfuscator must produce exactly the output of the original multi-pass
+implementation (privacy/reference_obfuscator.py) for every case in
+data/obfuscator_golden.json - obfuscate(), detect_pii(), and the streaming
+obfuscate_chunks() with tiny chunks and windows to force cuts everywhere.
+
+Usage:
+    python tools/verify_obfuscator.py              # verify
+    python tools/verify_obfuscator.py --regenerate # rebuild expectations from the reference
+"""
+
+import json
+import os
+import sys
+
+# Add backend directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from privacy.text_obfuscator import TextObfuscator
+from privacy.reference_obfuscator import ReferenceTextObfuscator
+
+GOLDEN_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "data", "obfuscator_golden.json"
+)
+
+
+def load_golden():
+    with open(GOLDEN_PATH, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def regenerate():
+    reference = ReferenceTextObfuscator()
+    cases = [
+        {
+            "input": case["input"],
+            "obfuscated": reference.obfuscate(case["input"]),
+            "pii": [list(finding) for finding in reference.detect_pii(case["input"])]
+        }
+        for case in load_golden()
+    ]
+    with open(GOLDEN_PATH, "w", encoding="utf-8") as f:
+        json.dump(cases, f, indent=2, ensure_ascii=False)
+    print(f"✅ Regenerated {len(cases)} golden cases from the reference obfuscator.")
+
+
+def verify_obfuscator():
+    obfuscator = TextObfuscator()
+    cases = load_golden()
+    errors = []
+
+    for i, case in enumerate(cases):
+        text = case["input"]
+
+        output = obfuscator.obfuscate(text)
+        if output != case["obfuscated"]:
+            errors.append(f"Case {i} obfuscate():\n      expected {case['obfuscated']!r}\n      got      {output!r}")
+
+        for window in (1, 8, 64):
+            chunks = [text[j:j + 3] for j in range(0, len(text), 3)]
+            streamed = "".join(obfuscator.obfuscate_chunks(chunks, window=window))
+            if streamed != case["obfuscated"]:
+                errors.append(f"Case {i} obfuscate_chunks(window={window}):\n      expected {case['obfuscated']!r}\n      got      {streamed!r}")
+
+        findings = [list(finding) for finding in obfuscator.detect_pii(text)]
+        if findings != case["pii"]:
+            errors.append(f"Case {i} detect_pii():\n      expected {case['pii']!r}\n      got      {findings!r}")
+
+    if errors:
+        print("❌ OBFUSCATOR GOLDEN CHECK FAILED:")
+        for e in errors:
+            print(f"  - {e}")
+        sys.exit(1)
+    else:
+        print(f"✅ OBFUSCATOR GOLDEN CHECK PASSED: {len(cases)} cases identical to the reference.")
+
+
+if __name__ == "__main__":
+    if "--regenerate" in sys.argv:
+        regenerate()
+    else:
+        verify_obfuscator()
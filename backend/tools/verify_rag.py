@@ -1,8 +1,9 @@
 import asyncio
-from services.knowledge_base import kb
+from services.knowledge_base import knowledge_bases
 
 async def test_rag():
     print("⏳ Loading Knowledge Base...")
+    kb = knowledge_bases.default  # Looked up now - reloads swap the instance
     kb.load_data()
     
     query = "How do I handle a student who is resistant to talking?"